@@ -0,0 +1,154 @@
+# admission.py
+"""
+Controle de admissão por worker: quando a PokéAPI fica lenta, as rotas
+que dependem dela não podem ocupar todas as threads do worker.
+
+Cada rota cai num orçamento ("bulkhead"):
+- upstream: /pokemon/filter, /pokemon/search, /pokemon/<id>/similar e
+  /sprites (podem esperar a rede)
+- default: todo o resto (login, favoritos, equipe...)
+
+Cada orçamento tem um limite de requisições simultâneas e uma fila curta.
+Quem não consegue vaga espera na fila até ADMISSION_QUEUE_TIMEOUT; fila
+cheia ou prazo estourado → 503 com Retry-After na hora, sem segurar a
+thread. Limite 0 desliga o orçamento.
+
+Com gunicorn, limite + fila do upstream deve ficar abaixo de --threads:
+quem espera na fila também ocupa uma thread. O gunicorn.conf.py deriva
+--threads desses valores e recusa subir se a conta não fechar.
+
+Sob ASGI (uvicorn asgi:app) o orçamento upstream fica desligado
+(use_asgi): a espera pela PokéAPI acontece na pré-busca assíncrona, sem
+thread, e o Flask só roda nas ASGI_THREADS do pool — quem não tem thread
+espera no loop de eventos, não num worker. Com 4 + 2 vagas, tudo acima de
+6 filtros simultâneos viraria 503, justamente a carga que o ASGI atende.
+"""
+import threading
+import time
+
+from flask import current_app, g, jsonify, request
+
+import metrics
+
+# Rotas que esperam a PokéAPI (ou o host dos sprites) no pior caso
+UPSTREAM_ENDPOINTS = {
+    "api.filter_pokemon", "api.get_pokemon_data", "api.similar_pokemon", "sprites.get_sprite",
+}
+
+# Monitoramento precisa responder justamente quando o worker está cheio
+EXEMPT_ENDPOINTS = {"api.health", "api.health_pokeapi", "metrics.get_metrics"}
+
+
+class Bulkhead:
+    """Semáforo com fila limitada e prazo de espera."""
+
+    def __init__(self, name, limit, queue, timeout):
+        self.name = name
+        self.limit = limit
+        self.queue = queue
+        self.timeout = timeout
+        self.waiting = 0
+        self._slots = threading.BoundedSemaphore(limit) if limit > 0 else None
+        self._lock = threading.Lock()
+        self._counters = {"admitted": 0, "queued": 0, "queue_full": 0, "timeout": 0}
+
+    @property
+    def enabled(self):
+        return self._slots is not None
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def acquire(self):
+        """None se conseguiu vaga; senão o motivo ("queue_full" ou "timeout")."""
+        if self._slots.acquire(blocking=False):
+            self._count("admitted")
+            return None
+
+        with self._lock:
+            if self.waiting >= self.queue:
+                self._counters["queue_full"] += 1
+                return "queue_full"
+            self.waiting += 1
+            self._counters["queued"] += 1
+        try:
+            admitted = self._slots.acquire(timeout=self.timeout)
+        finally:
+            with self._lock:
+                self.waiting -= 1
+
+        self._count("admitted" if admitted else "timeout")
+        return None if admitted else "timeout"
+
+    def release(self):
+        self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+        counters.update(limit=self.limit, queue=self.queue, waiting=self.waiting)
+        return counters
+
+
+# ==========================================================
+# 🔌 Ganchos da requisição
+# ==========================================================
+def _pool_name():
+    return "upstream" if request.endpoint in UPSTREAM_ENDPOINTS else "default"
+
+
+def _before_request():
+    if request.method == "OPTIONS" or request.endpoint in EXEMPT_ENDPOINTS:
+        return None
+    pool = current_app.extensions["admission"][_pool_name()]
+    if not pool.enabled:
+        return None
+
+    started = time.perf_counter()
+    rejected = pool.acquire()
+    metrics.observe_admission(pool.name, rejected or "admitted", time.perf_counter() - started)
+    if rejected is None:
+        g._admission = pool
+        return None
+
+    response = jsonify({"msg": "Servidor ocupado. Tente novamente em instantes."})
+    response.status_code = 503
+    response.headers["Retry-After"] = str(current_app.config["ADMISSION_RETRY_AFTER"])
+    return response
+
+
+def _teardown_request(exc):
+    # Com streaming (ndjson) o teardown só roda ao fim da resposta:
+    # a vaga fica ocupada enquanto o corpo é gerado
+    pool = g.pop("_admission", None)
+    if pool is not None:
+        pool.release()
+
+
+def stats():
+    """Estado dos orçamentos deste worker."""
+    return {name: pool.stats() for name, pool in current_app.extensions["admission"].items()}
+
+
+def init_app(app):
+    timeout = app.config["ADMISSION_QUEUE_TIMEOUT"]
+    app.extensions["admission"] = {
+        "upstream": Bulkhead(
+            "upstream", app.config["ADMISSION_UPSTREAM_LIMIT"],
+            app.config["ADMISSION_UPSTREAM_QUEUE"], timeout,
+        ),
+        "default": Bulkhead(
+            "default", app.config["ADMISSION_DEFAULT_LIMIT"],
+            app.config["ADMISSION_DEFAULT_QUEUE"], timeout,
+        ),
+    }
+    app.before_request(_before_request)
+    app.teardown_request(_teardown_request)
+
+
+def use_asgi(app):
+    """Desliga o orçamento upstream (chamado pelo asgi.py; ver docstring do módulo)."""
+    app.extensions["admission"]["upstream"] = Bulkhead(
+        "upstream", 0, 0, app.config["ADMISSION_QUEUE_TIMEOUT"]
+    )
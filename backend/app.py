@@ -1,82 +1,49 @@
 # app.py
-from flask import Flask, request, jsonify, Blueprint
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
+from flask import (
+    Flask, Response, request, jsonify, Blueprint, current_app, stream_with_context
+)
 from flask_cors import CORS
 from flask_jwt_extended import (
-    JWTManager, create_access_token, jwt_required, get_jwt_identity
+    JWTManager, create_access_token, jwt_required
 )
 from werkzeug.security import generate_password_hash, check_password_hash
-from models import db, User
+from database import init_db
+from models import db, Pokemon, User
 from config import Config
+import admission
+import autocomplete
+import catalog
+import encoding
+import http_cache
+import identity
+import metrics
+import profiling
+from pokeapi_client import pokeapi
+from refresher import refresher
+from singleflight import SingleFlight
+import pokedex_index
+from bootstrap import bootstrap, bootstrap_command
+from ingest import ingest_command
+import base64
+import bisect
+import json
 import os
-import requests
 from datetime import timedelta
+from urllib.parse import urlencode
 
 # ==============================================
-# Inicialização do app
+# 1) Blueprint principal (registrado em create_app)
 # ==============================================
-app = Flask(__name__)
-app.config.from_object(Config)
-
-# 🔐 JWT (garante leitura via header Authorization: Bearer <token>)
-app.config.setdefault("JWT_TOKEN_LOCATION", ["headers"])
-app.config.setdefault("JWT_HEADER_NAME", "Authorization")
-app.config.setdefault("JWT_HEADER_TYPE", "Bearer")
-app.config.setdefault("JWT_ERROR_MESSAGE_KEY", "message")
-
-# 🌐 CORS — libera frontend local, GitHub Pages e domínio do Render
-CORS(
-    app,
-    resources={
-        r"/*": {
-            "origins": [
-                "http://localhost:4200",
-                "http://127.0.0.1:4200",
-                "https://adrianoads910-max.github.io",
-                "https://pokeapi-fullstack.onrender.com",
-            ],
-            "allow_headers": ["Content-Type", "Authorization"],
-            "methods": ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "HEAD"],
-            "supports_credentials": True,
-        }
-    },
-)
-
-# ==============================================
-# Banco de dados e JWT
-# ==============================================
-db.init_app(app)
-jwt = JWTManager(app)
-
-POKEAPI_BASE_URL = "https://pokeapi.co/api/v2/pokemon/"
-
-# ==============================================
-# 1) Setup inicial e criação de admin
-# ==============================================
-with app.app_context():
-    db.create_all()
-
-    try:
-        db_path = os.path.join(app.instance_path, 'db.sqlite3')
-        print(f"Banco de dados ativo em: {db_path}")
-    except Exception:
-        pass
-
-    if not User.query.filter_by(email="admin@teste.com").first():
-        admin = User(
-            name="Administrador",
-            nickname="admin",
-            email="admin@teste.com",
-            password=generate_password_hash("123456"),
-            is_admin=True
-        )
-        db.session.add(admin)
-        db.session.commit()
-        print("✅ Usuário admin criado: admin@teste.com / 123456")
+api_bp = Blueprint("api", __name__)
 
 # ==============================================
 # 2) Auth: registro / login / rota protegida
 # ==============================================
-@app.post("/register")
+@api_bp.post("/register")
 def register():
     data = request.get_json() or {}
 
@@ -109,7 +76,7 @@ def register():
     return jsonify({"msg": "Usuário registrado com sucesso!"}), 200
 
 
-@app.post("/login")
+@api_bp.post("/login")
 def login():
     data = request.get_json() or {}
     email = data.get("email")
@@ -119,8 +86,9 @@ def login():
     if not user or not check_password_hash(user.password, password):
         return jsonify({"msg": "Credenciais inválidas"}), 401
 
-    # ✅ subject/identity como string
-    token = create_access_token(identity=str(user.id))
+    # ✅ subject/identity como string; is_admin vai como claim (sem banco nas rotas)
+    token = create_access_token(identity=str(user.id), additional_claims=identity.claims_for(user))
+    identity.remember(user)
 
     return jsonify({
         "msg": "Login bem-sucedido!",
@@ -135,12 +103,11 @@ def login():
     }), 200
 
 
-@app.get("/protected")
+@api_bp.get("/protected")
 @jwt_required()
 def protected():
-    current_user_id = int(get_jwt_identity())
-    user = User.query.get(current_user_id)
-    email = user.email if user else "desconhecido"
+    user = identity.current_identity()
+    email = user["email"] if user else "desconhecido"
     return jsonify({"msg": f"Acesso autorizado para {email}"}), 200
 
 # ==============================================
@@ -152,25 +119,18 @@ profile_bp = Blueprint('profile', __name__, url_prefix="/api/profile")
 @profile_bp.route("/", methods=["GET"])
 @jwt_required()
 def get_profile():
-    current_user_id = int(get_jwt_identity())
-    user = User.query.get(current_user_id)
+    user = identity.current_identity()
     if not user:
         return jsonify({"msg": "Usuário não encontrado"}), 404
 
-    return jsonify({
-        "id": user.id,
-        "name": user.name,
-        "nickname": user.nickname,
-        "email": user.email,
-        "is_admin": user.is_admin
-    }), 200
+    return jsonify(user), 200
 
 
 @profile_bp.route("/", methods=["PUT"])
 @jwt_required()
 def update_profile():
-    current_user_id = int(get_jwt_identity())
-    user = User.query.get(current_user_id)
+    user_id = identity.current_user_id()
+    user = db.session.get(User, user_id) if user_id is not None else None
     if not user:
         return jsonify({"msg": "Usuário não encontrado"}), 404
 
@@ -184,6 +144,8 @@ def update_profile():
         user.password = generate_password_hash(data["password"])
 
     db.session.commit()
+    # ♻️ Cache de identidade com os dados novos
+    identity.remember(user)
 
     return jsonify({
         "msg": "Perfil atualizado com sucesso!",
@@ -197,22 +159,130 @@ def update_profile():
     }), 200
 
 
-app.register_blueprint(profile_bp)
-
 # ==============================================
 # 4) Rotas administrativas
 # ==============================================
-@app.route("/api/users", methods=["GET"])
+def _prefix_range(column, prefix):
+    """lower(col) começa com `prefix` → intervalo que usa o índice (lower(col), id)."""
+    prefix = prefix.lower()
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    expr = db.func.lower(column)
+    return (expr >= prefix) & (expr < upper)
+
+
+# Chave de ordenação de cada listagem = índice que ela percorre: a página
+# sai na ordem do índice, sem ordenar as linhas encontradas
+USER_SORT_KEYS = {
+    "id": User.id,
+    "email": db.func.lower(User.email),         # ix_users_email_lower_id
+    "nickname": db.func.lower(User.nickname),   # ix_users_nickname_lower_id
+}
+
+
+def _user_phases(email, nickname, q):
+    """
+    Trechos da listagem, cada um uma faixa de um índice: (chave, filtros).
+    ?q= vira dois trechos: quem bate pelo e-mail e depois quem bate só
+    pelo apelido (um OR entre as duas colunas não usa índice nenhum).
+    """
+    filters = []
+    if email:
+        filters.append(_prefix_range(User.email, email))
+    if nickname:
+        filters.append(_prefix_range(User.nickname, nickname))
+    if q:
+        by_email = _prefix_range(User.email, q)
+        return [
+            ("email", [by_email, *filters]),
+            ("nickname", [_prefix_range(User.nickname, q), ~by_email, *filters]),
+        ]
+    if email:
+        return [("email", filters)]
+    if nickname:
+        return [("nickname", filters)]
+    return [("id", [])]
+
+
+def _encode_user_cursor(phases, phase, key, user_id):
+    if phases[phase][0] == "id":
+        return str(user_id)
+    raw = json.dumps([phase, key, user_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_user_cursor(phases, raw):
+    """(trecho, chave, id) depois do qual a página começa; ValueError se inválido."""
+    if not raw:
+        return 0, None, 0
+    if phases[0][0] == "id":
+        return 0, None, int(raw)
+    try:
+        phase, key, user_id = json.loads(base64.urlsafe_b64decode(raw + "=" * (-len(raw) % 4)))
+    except Exception:
+        raise ValueError("cursor")
+    if not (isinstance(phase, int) and 0 <= phase < len(phases)) or not isinstance(key, str) \
+            or not isinstance(user_id, int):
+        raise ValueError("cursor")
+    return phase, key, user_id
+
+
+@api_bp.route("/api/users", methods=["GET"])
 @jwt_required()
 def get_users():
-    current_user_id = int(get_jwt_identity())
-    current_user = User.query.get(current_user_id)
-
-    if not current_user or not current_user.is_admin:
+    """
+    Lista de usuários (admin), paginada por cursor.
+
+    ?limit=100&cursor=<X-Next-Cursor>  página seguinte (header X-Next-Cursor / Link)
+    ?email=ana  ?nickname=ash          prefixo, sem diferenciar maiúsculas
+    ?q=ana                             prefixo de e-mail OU apelido
+    ?count=1                           X-Total-Count limitado a USERS_COUNT_CAP
+                                       (X-Total-Count-Exact: false = "pelo menos")
+
+    Sem filtro a ordem é por ID e o cursor é o último ID. Com filtro, a
+    ordem é a do índice (lower(email|apelido), id) e o cursor é opaco;
+    com ?q=, primeiro quem bate pelo e-mail, depois só pelo apelido.
+    O corpo continua sendo a lista de usuários da página.
+    """
+    if not identity.is_admin():
         return jsonify({"error": "Acesso negado"}), 403
 
-    users = User.query.all()
-    return jsonify([
+    phases = _user_phases(
+        request.args.get("email", "").strip(),
+        request.args.get("nickname", "").strip(),
+        request.args.get("q", "").strip(),
+    )
+    try:
+        limit = _int_arg(
+            "limit",
+            default=current_app.config["USERS_PAGE_SIZE"],
+            minimum=1,
+            maximum=current_app.config["USERS_MAX_LIMIT"],
+        )
+        start, after_key, after_id = _decode_user_cursor(phases, request.args.get("cursor", ""))
+    except ValueError:
+        return jsonify({"msg": "limit/cursor inválidos."}), 400
+
+    # Só as colunas públicas; no máximo limit + 1 linhas em memória, lidas
+    # em ordem de índice a partir do cursor
+    columns = (User.id, User.name, User.nickname, User.email, User.is_admin)
+    page = []
+    for phase in range(start, len(phases)):
+        name, filters = phases[phase]
+        key = USER_SORT_KEYS[name]
+        query = db.session.query(*columns, key.label("sort_key")).filter(*filters)
+        if phase == start and name == "id":
+            query = query.filter(User.id > after_id)
+        elif phase == start and after_key is not None:
+            query = query.filter(key >= after_key, (key > after_key) | (User.id > after_id))
+        order = (User.id,) if name == "id" else (key, User.id)
+        rows = query.order_by(*order).limit(limit + 1 - len(page)).all()
+        page.extend((phase, row) for row in rows)
+        if len(page) > limit:
+            break
+    has_more = len(page) > limit
+    page = page[:limit]
+
+    response = jsonify([
         {
             "id": u.id,
             "name": u.name,
@@ -220,156 +290,254 @@ def get_users():
             "email": u.email,
             "is_admin": u.is_admin
         }
-        for u in users
-    ]), 200
+        for _, u in page
+    ])
+
+    if has_more:
+        phase, last = page[-1]
+        next_cursor = _encode_user_cursor(phases, phase, last.sort_key, last.id)
+        args = request.args.to_dict()
+        args["cursor"] = next_cursor
+        response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Link"] = f'<{request.base_url}?{urlencode(args)}>; rel="next"'
+
+    if request.args.get("count", "").lower() in ("1", "true"):
+        # Contagem limitada, trecho a trecho: para de ler no cap + 1º
+        # usuário, nunca varre a tabela
+        cap = current_app.config["USERS_COUNT_CAP"]
+        total = 0
+        for _, filters in phases:
+            capped = db.session.query(User.id).filter(*filters).limit(cap + 1 - total).subquery()
+            total += db.session.query(db.func.count()).select_from(capped).scalar()
+            if total > cap:
+                break
+        response.headers["X-Total-Count"] = str(min(total, cap))
+        response.headers["X-Total-Count-Exact"] = "true" if total <= cap else "false"
+
+    return response, 200
+
+
+@api_bp.route("/api/catalog/invalidate", methods=["POST"])
+@jwt_required()
+def invalidate_catalog():
+    # Admin pela identidade em cache, não pela claim (ver identity.is_admin)
+    if not identity.is_admin():
+        return jsonify({"error": "Acesso negado"}), 403
+
+    data = request.get_json(silent=True) or {}
+    catalog.invalidate(data.get("pokemon"))
+    return jsonify({"msg": "Catálogo invalidado"}), 200
 
-## ==============================================
+# ==============================================
 # 5) Rotas PokéAPI
 # ==============================================
-@app.route("/pokemon/filter", methods=["GET"])
+_filter_flight = SingleFlight()
+_search_flight = SingleFlight()
+
+
+def _split_arg(name):
+    """?type=fire,water e ?type=fire&type=water → ["fire", "water"]"""
+    values = []
+    for raw in request.args.getlist(name):
+        values.extend(v.strip().lower() for v in raw.split(",") if v.strip())
+    return list(dict.fromkeys(values))
+
+
+def _int_arg(name, default=None, minimum=0, maximum=None):
+    """Lê um inteiro da query string; ValueError se for inválido."""
+    raw = request.args.get(name)
+    if raw is None or raw == "":
+        return default
+    value = int(raw)
+    if value < minimum or (maximum is not None and value > maximum):
+        raise ValueError(name)
+    return value
+
+
+def _wants_ndjson():
+    best = request.accept_mimetypes.best_match(["application/json", "application/x-ndjson"])
+    return best == "application/x-ndjson"
+
+
+@api_bp.route("/pokemon/filter", methods=["GET"])
 def filter_pokemon():
     """
     Filtra Pokémon por geração e/ou tipo.
     Agora com correção para:
     ✅ type="" ser ignorado
     ✅ resultados ordenados por ID da Pokédex
-    ✅ melhor desempenho com timeout
+    ✅ detalhes servidos pelo catálogo local (PokéAPI só em falta/vencido)
+    ✅ várias gerações/tipos: ?generation=1,2&type=fire,flying&type_mode=and
+    ✅ paginação por cursor: ?limit=50&cursor=<next_cursor anterior>
+    ✅ Accept: application/x-ndjson → um Pokémon por linha, em streaming
+    ✅ ?fields=id,name,types → só esses campos em cada resultado
     """
-    generation_id = request.args.get("generation")
-    type_name = request.args.get("type")
-
-    # 🔹 Se o type vier vazio ("") → tratar como None
-    if type_name == "":
-        type_name = None
-
-    results = []
+    import requests   # import tardio: o boot do worker não carrega o requests
+    try:
+        generations, types, type_mode, limit, cursor = filter_args()
+    except ValueError as e:
+        return jsonify({"msg": str(e)}), 400
+    metrics.tag_filter(generations, types, type_mode)
+    fields = encoding.requested_fields()
 
     try:
-        # ✅ Sem filtros → retorna primeiros 50 Pokémon (padrão para performance)
-        if not generation_id and not type_name:
-            base_url = "https://pokeapi.co/api/v2/pokemon?limit=50&offset=0"
-            data = requests.get(base_url, timeout=5).json()
-
-            for entry in data.get("results", []):
-                poke_response = requests.get(entry["url"], timeout=5)
-                if poke_response.ok:
-                    poke_data = poke_response.json()
-                    results.append({
-                        "id": poke_data.get("id"),
-                        "name": poke_data.get("name").capitalize(),
-                        "types": [t["type"]["name"].capitalize() for t in poke_data.get("types", [])],
-                        "sprite_url": poke_data["sprites"]["front_default"],
-                    })
-
-            # 🔹 Ordenar pelo ID da Pokédex
-            results.sort(key=lambda x: x["id"])
-            return jsonify({"results": results, "count": len(results)}), 200
-
-        # ✅ Apenas geração
-        if generation_id and not type_name:
-            gen_url = f"https://pokeapi.co/api/v2/generation/{generation_id}"
-            data = requests.get(gen_url, timeout=5).json()
-
-            for species in data.get("pokemon_species", []):
-                species_name = species["name"]
-                poke_response = requests.get(f"https://pokeapi.co/api/v2/pokemon/{species_name}", timeout=5)
-                if poke_response.ok:
-                    poke_data = poke_response.json()
-                    results.append({
-                        "id": poke_data.get("id"),
-                        "name": poke_data.get("name").capitalize(),
-                        "types": [t["type"]["name"].capitalize() for t in poke_data.get("types", [])],
-                        "sprite_url": poke_data["sprites"]["front_default"],
-                    })
-
-            results.sort(key=lambda x: x["id"])
-            return jsonify({"results": results, "count": len(results)}), 200
-
-        # ✅ Apenas tipo
-        if type_name and not generation_id:
-            type_url = f"https://pokeapi.co/api/v2/type/{type_name.lower()}"
-            data = requests.get(type_url, timeout=5).json()
-
-            for poke in data.get("pokemon", []):
-                poke_response = requests.get(poke["pokemon"]["url"], timeout=5)
-                if poke_response.ok:
-                    poke_data = poke_response.json()
-                    results.append({
-                        "id": poke_data.get("id"),
-                        "name": poke_data.get("name").capitalize(),
-                        "types": [t["type"]["name"].capitalize() for t in poke_data.get("types", [])],
-                        "sprite_url": poke_data["sprites"]["front_default"],
-                    })
-
-            results.sort(key=lambda x: x["id"])
-            return jsonify({"results": results, "count": len(results)}), 200
-
-        # ✅ Geração + Tipo
-        if generation_id and type_name:
-            gen_url = f"https://pokeapi.co/api/v2/generation/{generation_id}"
-            type_url = f"https://pokeapi.co/api/v2/type/{type_name.lower()}"
-
-            gen_data = requests.get(gen_url, timeout=5).json()
-            type_data = requests.get(type_url, timeout=5).json()
-
-            gen_species = {p["name"] for p in gen_data.get("pokemon_species", [])}
-            filtered = [
-                p["pokemon"] for p in type_data.get("pokemon", [])
-                if p["pokemon"]["name"] in gen_species
-            ]
-
-            for poke in filtered:
-                poke_response = requests.get(poke["url"], timeout=5)
-                if poke_response.ok:
-                    poke_data = poke_response.json()
-                    results.append({
-                        "id": poke_data.get("id"),
-                        "name": poke_data.get("name").capitalize(),
-                        "types": [t["type"]["name"].capitalize() for t in poke_data.get("types", [])],
-                        "sprite_url": poke_data["sprites"]["front_default"],
-                    })
-
-            results.sort(key=lambda x: x["id"])
-            return jsonify({"results": results, "count": len(results)}), 200
+        if _wants_ndjson():
+            ids, page, next_cursor = filter_page(generations, types, type_mode, limit, cursor)
+            response = _stream_page(ids, page, next_cursor, fields)
+            response.vary.add("Accept")
+            return response
+
+        key = (tuple(sorted(generations)), tuple(sorted(types)), type_mode, limit, cursor)
+
+        # 🏷️ ETag pela versão do catálogo → 304 sem tocar na PokéAPI
+        cache_control = http_cache.public_cache_control()
+        etag = http_cache.make_etag("filter", catalog.catalog_version(), *key, fields)
+        # Mesma URL, JSON ou NDJSON conforme o Accept: cache compartilhado
+        # precisa separar as duas (o Accept-Encoding vem da compressão)
+        response = http_cache.not_modified(etag, cache_control, vary="Accept")
+        if response is not None:
+            return response
+
+        # 🔁 Requisições idênticas simultâneas compartilham uma única execução
+        #    (a projeção vem depois: ?fields diferentes dividem a mesma busca)
+        payload = _filter_flight.do(
+            key, lambda: _filter_payload(generations, types, type_mode, limit, cursor)
+        )
+        payload = dict(payload, results=encoding.project_all(payload["results"], fields))
+        if payload["partial"]:
+            # Resposta incompleta não deve ficar em cache
+            response = jsonify(payload)
+            response.headers["Cache-Control"] = "no-store"
+            response.vary.add("Accept")
+            return response, 200
+
+        # A busca pode ter gravado no catálogo → versão nova
+        etag = http_cache.make_etag("filter", catalog.catalog_version(), *key, fields)
+        return http_cache.cached((jsonify(payload), 200), etag, cache_control, vary="Accept")
 
     except requests.exceptions.Timeout:
         return jsonify({"msg": "PokéAPI demorou demais para responder. Tente novamente."}), 504
 
+    except requests.exceptions.ConnectionError:
+        return jsonify({"msg": "Erro ao comunicar com o serviço de Pokémon externo."}), 503
+
     except Exception as e:
         print(f"Erro inesperado: {e}")
         return jsonify({"msg": "Erro interno ao processar o filtro."}), 500
 
 
+def filter_args():
+    """
+    Argumentos do /pokemon/filter: (gerações, tipos, type_mode, limit,
+    cursor). ValueError com a mensagem para o cliente se forem inválidos.
+    """
+    # 🔹 Valores vazios ("") são ignorados
+    generations = _split_arg("generation")
+    types = _split_arg("type")
+    type_mode = request.args.get("type_mode", "or").lower()
+
+    if type_mode not in ("and", "or"):
+        raise ValueError("type_mode deve ser 'and' ou 'or'.")
 
-@app.get("/pokemon/search/<name_or_id>")
+    # ✅ Sem filtros → 50 por página (padrão para performance);
+    #    com filtros → tudo, a menos que o cliente peça um limit
+    unfiltered = not generations and not types
+    try:
+        limit = _int_arg(
+            "limit",
+            default=50 if unfiltered else None,
+            minimum=1,
+            maximum=current_app.config["FILTER_MAX_LIMIT"],
+        )
+        cursor = _int_arg("cursor", default=0)
+    except ValueError:
+        raise ValueError("limit/cursor inválidos.")
+    return generations, types, type_mode, limit, cursor
+
+
+def filter_list_keys(generations, types):
+    """Listas do catálogo de que o filtro depende."""
+    if not generations and not types:
+        return [catalog.ALL_KEY]
+    return ([catalog.generation_key(g) for g in generations]
+            + [catalog.type_key(t) for t in types])
+
+
+def filter_page(generations, types, type_mode, limit, cursor):
+    """Resolve os IDs do filtro e recorta a página. Retorna (ids, página, next_cursor)."""
+    # ✅ Sem filtros → Pokédex inteira
+    if not generations and not types:
+        ids = catalog.all_members()
+
+    # ✅ Geração e/ou tipo → interseção no índice em memória
+    else:
+        ids = pokedex_index.select_ids(generations, types, type_mode)
+
+    # 🔹 O cursor é o último ID já entregue (as listas vêm ordenadas)
+    start = bisect.bisect_right(ids, cursor)
+    page = ids[start:start + limit] if limit else ids[start:]
+    has_more = start + len(page) < len(ids)
+    next_cursor = page[-1] if page and has_more else None
+    return ids, page, next_cursor
+
+
+def _filter_payload(generations, types, type_mode, limit, cursor):
+    ids, page, next_cursor = filter_page(generations, types, type_mode, limit, cursor)
+    rows, partial = catalog.get_many(page)
+    results = [p.to_summary() for p in rows]
+    return {
+        "results": results,
+        "count": len(results),
+        "total": len(ids),
+        "partial": partial,
+        "next_cursor": next_cursor,
+    }
+
+
+def _stream_page(ids, page, next_cursor, fields=None):
+    def generate():
+        count = 0
+        stream = catalog.iter_many(page)
+        while True:
+            try:
+                pokemon = next(stream)
+            except StopIteration as stop:
+                partial = bool(stop.value)
+                break
+            count += 1
+            yield encoding.dumps(encoding.project(pokemon.to_summary(), fields)) + "\n"
+        # Última linha: metadados da página
+        yield encoding.dumps({"meta": {
+            "count": count, "total": len(ids),
+            "partial": partial, "next_cursor": next_cursor,
+        }}) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
+@api_bp.get("/pokemon/search/<name_or_id>")
 def get_pokemon_data(name_or_id):
-    url = f"{POKEAPI_BASE_URL}{name_or_id.lower()}"
+    import requests   # import tardio (ver filter_pokemon)
 
     try:
-        response = requests.get(url, timeout=5)
+        key = name_or_id.lower()
+        fields = encoding.requested_fields()
 
-        if response.status_code == 404:
-            return jsonify({"msg": f"Pokémon '{name_or_id}' não encontrado."}), 404
+        cache_control = http_cache.public_cache_control()
+        etag = http_cache.make_etag("search", catalog.catalog_version(), key, fields)
+        response = http_cache.not_modified(etag, cache_control)
+        if response is not None:
+            return response
 
-        response.raise_for_status()
-
-        poke_data = response.json()
-
-        pokemon_info = {
-            "id": poke_data.get("id"),
-            "name": poke_data.get("name").capitalize(),
-            "types": [t["type"]["name"].capitalize() for t in poke_data.get("types", [])],
-            "height": poke_data.get("height") / 10,
-            "weight": poke_data.get("weight") / 10,
-            "sprite_url": poke_data["sprites"]["front_default"],
-            "abilities": [
-                {"name": a["ability"]["name"], "is_hidden": a["is_hidden"]}
-                for a in poke_data.get("abilities", [])
-            ],
-            "stats": {s["stat"]["name"]: s["base_stat"] for s in poke_data.get("stats", [])}
-        }
+        pokemon_info = _search_flight.do(key, lambda: _pokemon_detail(key))
 
-        return jsonify(pokemon_info), 200
+        if pokemon_info is None:
+            return jsonify({"msg": f"Pokémon '{name_or_id}' não encontrado."}), 404
+
+        etag = http_cache.make_etag("search", catalog.catalog_version(), key, fields)
+        return http_cache.cached(
+            (jsonify(encoding.project(pokemon_info, fields)), 200), etag, cache_control
+        )
 
     except requests.exceptions.Timeout:
         return jsonify({"msg": "PokéAPI demorou demais para responder. Tente novamente."}), 504
@@ -377,35 +545,221 @@ def get_pokemon_data(name_or_id):
     except requests.exceptions.RequestException:
         return jsonify({"msg": "Erro ao comunicar com o serviço de Pokémon externo."}), 503
 
-# ==============================================
-# 6) Blueprints de Favoritos e Equipe
-# ==============================================
-from favorites import favorites_bp
-from equip import equip_bp
+    except catalog.StoreError:
+        return jsonify({"msg": "Resposta da PokéAPI não pôde ser gravada no catálogo."}), 502
+
+
+def _pokemon_detail(name_or_id):
+    pokemon = catalog.get_pokemon(name_or_id)
+    return pokemon.to_detail() if pokemon is not None else None
+
+
+@api_bp.get("/pokemon/autocomplete")
+def autocomplete_pokemon():
+    """
+    Sugestões de nome enquanto o usuário digita: ?q=pika&limit=8.
+    Prefixo exato primeiro, depois nomes com poucos erros ("pikahcu" →
+    Pikachu). Só memória (nomes do catálogo local): nunca chama a PokéAPI.
+    """
+    query = autocomplete.normalize(request.args.get("q", ""))
+    try:
+        limit = _int_arg(
+            "limit", default=8, minimum=1, maximum=current_app.config["AUTOCOMPLETE_MAX_LIMIT"]
+        )
+    except ValueError:
+        return jsonify({"msg": "limit inválido."}), 400
+
+    found = autocomplete.get_index().search(query, limit) if query else []
+    response = jsonify({
+        "q": query,
+        "results": [
+            {"id": pokemon_id, "name": name.capitalize(), "sprite": f"/sprites/{pokemon_id}",
+             "distance": distance}
+            for pokemon_id, name, distance in found
+        ],
+    })
+    response.headers["Cache-Control"] = http_cache.public_cache_control()
+    return response, 200
+
+
+@api_bp.get("/pokemon/<int:pokemon_id>/similar")
+def similar_pokemon(pokemon_id):
+    """
+    Pokémon com stats base mais parecidos (vizinhos mais próximos).
+    ?k=10 · ?metric=euclidean|manhattan|cosine · ?type=fire · ?generation=1
+    """
+    import requests   # import tardio (ver filter_pokemon)
 
-app.register_blueprint(favorites_bp)
-app.register_blueprint(equip_bp)
+    generations = _split_arg("generation")
+    types = _split_arg("type")
+    type_mode = request.args.get("type_mode", "or").lower()
+    metric = request.args.get("metric", "euclidean").lower()
+    try:
+        k = _int_arg("k", default=10, minimum=1, maximum=current_app.config["SIMILAR_MAX_K"])
+    except ValueError:
+        return jsonify({"msg": "k inválido."}), 400
+    if type_mode not in ("and", "or"):
+        return jsonify({"msg": "type_mode deve ser 'and' ou 'or'."}), 400
+
+    import similarity   # import tardio: o NumPy fica fora do boot do worker
+
+    if metric not in similarity.METRICS:
+        return jsonify({"msg": f"metric deve ser uma de: {', '.join(similarity.METRICS)}."}), 400
+
+    try:
+        key = (pokemon_id, k, metric, tuple(sorted(generations)), tuple(sorted(types)), type_mode)
+        cache_control = http_cache.public_cache_control()
+        etag = http_cache.make_etag("similar", catalog.catalog_version(), *key)
+        response = http_cache.not_modified(etag, cache_control)
+        if response is not None:
+            return response
+
+        # Read-through: o Pokémon de referência precisa estar no catálogo
+        if catalog.get_pokemon(pokemon_id) is None:
+            return jsonify({"msg": f"Pokémon '{pokemon_id}' não encontrado."}), 404
+        allowed = (
+            pokedex_index.select_ids(generations, types, type_mode)
+            if generations or types else None
+        )
+
+        version = catalog.catalog_version()
+        found = similarity.nearest(similarity.get_matrix(version), pokemon_id, k, metric, allowed)
+        if found is None:
+            return jsonify({"msg": "Stats desse Pokémon ainda não estão no catálogo."}), 404
+
+        rows = {p.id: p for p in Pokemon.query.filter(Pokemon.id.in_([i for i, _ in found]))}
+        results = [
+            dict(rows[i].to_summary(), stats=rows[i].stats, distance=round(distance, 4))
+            for i, distance in found if i in rows
+        ]
+        payload = {"id": pokemon_id, "metric": metric, "results": results}
+
+        etag = http_cache.make_etag("similar", version, *key)
+        return http_cache.cached((jsonify(payload), 200), etag, cache_control)
+
+    except requests.exceptions.Timeout:
+        return jsonify({"msg": "PokéAPI demorou demais para responder. Tente novamente."}), 504
+
+    except requests.exceptions.RequestException:
+        return jsonify({"msg": "Erro ao comunicar com o serviço de Pokémon externo."}), 503
+
+    except catalog.StoreError:
+        return jsonify({"msg": "Resposta da PokéAPI não pôde ser gravada no catálogo."}), 502
 
 # ==============================================
-# 7) Healthcheck e erros padrão
+# 6) Healthcheck e erros padrão
 # ==============================================
-@app.get("/health")
+@api_bp.get("/health")
 def health():
-    return jsonify({"status": "ok"}), 200
+    return jsonify({"status": "ok", "boot": current_app.extensions.get("boot")}), 200
 
 
-@app.errorhandler(404)
+@api_bp.get("/health/pokeapi")
+def health_pokeapi():
+    """Contadores do cliente da PokéAPI, do controle de admissão e do refresher neste worker."""
+    return jsonify(dict(
+        pokeapi.stats(), admission=admission.stats(), refresher=refresher.stats()
+    )), 200
+
+
+@api_bp.app_errorhandler(404)
 def not_found(e):
     return jsonify({"error": "Rota não encontrada"}), 404
 
 
-@app.errorhandler(500)
+@api_bp.app_errorhandler(500)
 def internal_error(e):
     return jsonify({"error": "Erro interno do servidor"}), 500
 
 
+# ==============================================
+# 7) App factory
+# ==============================================
+def create_app(config=Config):
+    """
+    Monta o app sem tocar no banco: esquema, migrações e admin ficam no
+    `flask --app app bootstrap` (release/deploy), não no boot do worker.
+    """
+    started = time.perf_counter()
+
+    app = Flask(__name__)
+    app.config.from_object(config)
+
+    # 🔐 JWT (garante leitura via header Authorization: Bearer <token>)
+    app.config.setdefault("JWT_TOKEN_LOCATION", ["headers"])
+    app.config.setdefault("JWT_HEADER_NAME", "Authorization")
+    app.config.setdefault("JWT_HEADER_TYPE", "Bearer")
+    app.config.setdefault("JWT_ERROR_MESSAGE_KEY", "message")
+
+    # 🌐 CORS — libera frontend local, GitHub Pages e domínio do Render
+    CORS(
+        app,
+        resources={
+            r"/*": {
+                "origins": [
+                    "http://localhost:4200",
+                    "http://127.0.0.1:4200",
+                    "https://adrianoads910-max.github.io",
+                    "https://pokeapi-fullstack.onrender.com",
+                ],
+                "allow_headers": ["Content-Type", "Authorization", "X-Profile"],
+                "methods": ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "HEAD"],
+                "expose_headers": ["ETag", "Link", "X-Next-Cursor", "X-Total-Count", "X-Total-Count-Exact", "X-Profile-Id", "Retry-After"],
+                "supports_credentials": True,
+            }
+        },
+    )
+
+    # Banco de dados, JWT e cliente da PokéAPI (nenhuma conexão aberta aqui)
+    init_db(app)
+    JWTManager(app)
+    pokeapi.init_app(app)
+    # ♻️ Stale-while-revalidate: renovação do catálogo em segundo plano
+    refresher.init_app(app)
+    # 📈 /metrics (Prometheus) + latência/contadores de cada requisição
+    metrics.init_app(app)
+    # 🚦 Orçamento de requisições simultâneas: rotas da PokéAPI × o resto
+    #    (depois das métricas: o 503 também é contado)
+    admission.init_app(app)
+    # 🔬 Perfil sob demanda (X-Profile: 1 de admin ou amostragem)
+    profiling.init_app(app)
+    # 🗜️ JSON com orjson, ?fields= e gzip/brotli conforme o Accept-Encoding
+    encoding.init_app(app)
+
+    # 🚚 CLI: flask --app app bootstrap | ingest [--source DIR]
+    app.cli.add_command(bootstrap_command)
+    app.cli.add_command(ingest_command)
+
+    from favorites import favorites_bp
+    from equip import equip_bp
+    from sprites import sprites_bp
+
+    app.register_blueprint(api_bp)
+    app.register_blueprint(profile_bp)
+    app.register_blueprint(favorites_bp)
+    app.register_blueprint(equip_bp)
+    app.register_blueprint(sprites_bp)
+
+    # ⏱️ Tempo de boot (imports do módulo + factory), exposto em /health
+    now = time.perf_counter()
+    app.extensions["boot"] = {
+        "pid": os.getpid(),
+        "imports_ms": round((started - _IMPORT_STARTED) * 1000, 1),
+        "create_app_ms": round((now - started) * 1000, 1),
+        "total_ms": round((now - _IMPORT_STARTED) * 1000, 1),
+    }
+    print(f"⏱️ App pronto em {app.extensions['boot']['total_ms']} ms "
+          f"(imports {app.extensions['boot']['imports_ms']} ms) — pid {os.getpid()}")
+    return app
+
+
+app = create_app()
+
 # ==============================================
 # 8) Execução
 # ==============================================
 if __name__ == "__main__":
+    # Local: prepara o banco antes de subir (em produção: release/bootstrap)
+    with app.app_context():
+        bootstrap()
     app.run(debug=True, host="0.0.0.0", port=5000)
@@ -0,0 +1,251 @@
+# asgi.py
+"""
+Entrada ASGI, ao lado do app:app (WSGI):
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+
+/pokemon/filter e /pokemon/search/<nome|id> passam antes por uma
+pré-busca assíncrona: o que faltar (ou estiver vencido) no catálogo é
+baixado da PokéAPI com aiohttp no loop de eventos — centenas de
+requisições esperando a rede não ocupam nenhuma thread — e gravado no
+catálogo. Em seguida a requisição segue para o app Flask, que acha tudo
+fresco e responde sem rede: mesmas rotas, mesmo JSON, mesmos ETags,
+CORS e métricas. As demais rotas vão direto para o Flask.
+
+O Flask roda num pool de ASGI_THREADS threads (o WsgiToAsgi do asgiref
+serializaria tudo numa thread só). Se a pré-busca falhar
+(PokéAPI fora, prazo estourado), a rota Flask trata como sempre — com
+o circuit breaker compartilhado, já aberto, sem segurar a thread.
+
+O pool de threads é o limite de concorrência do Flask aqui: o orçamento
+upstream do controle de admissão (pensado para as threads do gunicorn)
+fica desligado — ver admission.use_asgi.
+"""
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import admission
+import catalog
+from app import app as flask_app, filter_args, filter_list_keys, filter_page
+from pokeapi_async import pokeapi_async
+
+SEARCH_PREFIX = "/pokemon/search/"
+
+pokeapi_async.init_app(flask_app)
+admission.use_asgi(flask_app)
+_executor = ThreadPoolExecutor(
+    max_workers=flask_app.config["ASGI_THREADS"], thread_name_prefix="asgi"
+)
+
+
+# ==========================================================
+# 🧵 Flask (WSGI) num pool de threads
+# ==========================================================
+def _environ(scope, body):
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope["query_string"].decode("latin-1"),
+        "SERVER_PROTOCOL": f"HTTP/{scope['http_version']}",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    server = scope.get("server") or ("localhost", 80)
+    environ["SERVER_NAME"], environ["SERVER_PORT"] = server[0], str(server[1])
+    if scope.get("client"):
+        environ["REMOTE_ADDR"], environ["REMOTE_PORT"] = scope["client"][0], str(scope["client"][1])
+
+    for raw_name, raw_value in scope["headers"]:
+        name = raw_name.decode("latin-1").upper().replace("-", "_")
+        value = raw_value.decode("latin-1")
+        if name not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            name = f"HTTP_{name}"
+        environ[name] = f"{environ[name]},{value}" if name in environ else value
+    return environ
+
+
+def _run_wsgi(environ, send, loop):
+    """Roda o Flask nesta thread, enviando o corpo em partes (streaming ndjson)."""
+    def emit(message):
+        asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+    state = {"start": None, "sent": False}
+
+    def start_response(status, headers, exc_info=None):
+        if exc_info and state["sent"]:
+            raise exc_info[1].with_traceback(exc_info[2])
+        state["start"] = {
+            "type": "http.response.start",
+            "status": int(status.split(" ", 1)[0]),
+            "headers": [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers],
+        }
+
+    def send_start():
+        if not state["sent"]:
+            emit(state["start"])
+            state["sent"] = True
+
+    iterable = flask_app(environ, start_response)
+    try:
+        for chunk in iterable:
+            if chunk:
+                send_start()
+                emit({"type": "http.response.body", "body": chunk, "more_body": True})
+        send_start()
+        emit({"type": "http.response.body", "body": b"", "more_body": False})
+    finally:
+        # Fecha o iterável na mesma thread (teardown do Flask, stream_with_context)
+        close = getattr(iterable, "close", None)
+        if close is not None:
+            close()
+
+
+async def call_flask(scope, receive, send):
+    body = bytearray()
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            break
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(_executor, _run_wsgi, _environ(scope, bytes(body)), send, loop)
+
+
+# ==========================================================
+# ⚡ Pré-busca assíncrona
+# ==========================================================
+async def _in_app(fn, *args):
+    """Função síncrona (banco) numa thread, com o contexto do app."""
+    def run():
+        with flask_app.app_context():
+            return fn(*args)
+    return await asyncio.get_running_loop().run_in_executor(_executor, run)
+
+
+async def _in_request(scope, fn):
+    """Como _in_app, com request.args da requisição ASGI."""
+    def run():
+        with flask_app.test_request_context(
+            scope["path"], query_string=scope["query_string"].decode("latin-1")
+        ):
+            return fn()
+    return await asyncio.get_running_loop().run_in_executor(_executor, run)
+
+
+async def _fetch(path):
+    status, body = await pokeapi_async.get(path)
+    if status == 404:
+        return None
+    if status >= 400:
+        raise ConnectionError(f"PokéAPI respondeu {status}")
+    return body
+
+
+async def fetch_all(paths):
+    """
+    {chave: caminho} → {chave: corpo cru, ou None se 404}, em paralelo e
+    dentro de POKEAPI_DEADLINE. Falhas ficam de fora do resultado.
+    """
+    tasks = {key: asyncio.ensure_future(_fetch(path)) for key, path in paths.items()}
+    done, pending = await asyncio.wait(
+        tasks.values(), timeout=flask_app.config["POKEAPI_DEADLINE"]
+    )
+    for task in pending:
+        task.cancel()
+    return {
+        key: task.result() for key, task in tasks.items()
+        if task in done and task.exception() is None
+    }
+
+
+def _store_lists(bodies):
+    for key, body in bodies.items():
+        if body is not None:
+            catalog.store_fetched_list(key, body)
+
+
+async def prefetch_filter(scope):
+    def plan():
+        try:
+            args = filter_args()
+        except ValueError:
+            return None   # o Flask responde o 400
+        return args, catalog.stale_list_keys(filter_list_keys(args[0], args[1]))
+
+    planned = await _in_request(scope, plan)
+    if planned is None:
+        return
+    args, keys = planned
+
+    if keys:
+        bodies = await fetch_all({key: catalog.list_source(key)[0] for key in keys})
+        await _in_app(_store_lists, bodies)
+        if any(bodies.get(key) is None for key in keys):
+            return   # lista inexistente ou PokéAPI fora: o Flask decide
+
+    ids = await _in_request(
+        scope, lambda: catalog.pending_ids(filter_page(*args)[1])
+    )
+    if ids:
+        bodies = await fetch_all({i: f"{catalog.POKEMON_PATH}{i}" for i in ids})
+        await _in_app(catalog.store_fetched_pokemon, bodies)
+
+
+async def prefetch_search(scope):
+    key = scope["path"][len(SEARCH_PREFIX):].strip("/").lower()
+    if not key or "/" in key:
+        return
+    # Vencido dentro da tolerância: o Flask serve e renova em segundo plano
+    if await _in_app(catalog.stale_names, [key], True):
+        bodies = await fetch_all({key: f"{catalog.POKEMON_PATH}{key}"})
+        await _in_app(catalog.store_fetched_pokemon, bodies)
+
+
+def _prefetcher(scope):
+    if scope["method"] != "GET":
+        return None
+    if scope["path"] == "/pokemon/filter":
+        return prefetch_filter
+    if scope["path"].startswith(SEARCH_PREFIX):
+        return prefetch_search
+    return None
+
+
+# ==========================================================
+# 🚪 App ASGI
+# ==========================================================
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await pokeapi_async.aclose()
+            _executor.shutdown(wait=False)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await _lifespan(receive, send)
+    if scope["type"] != "http":
+        return
+
+    prefetch = _prefetcher(scope)
+    if prefetch is not None:
+        try:
+            await prefetch(scope)
+        except Exception as e:
+            print(f"Pré-busca falhou ({scope['path']}): {e}")
+    await call_flask(scope, receive, send)
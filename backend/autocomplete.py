@@ -0,0 +1,162 @@
+# autocomplete.py
+"""
+Autocomplete de nomes de Pokémon em memória (um índice por processo).
+
+- prefixo: lista ordenada de nomes + bisect → O(log n) e fatia contígua
+- aproximado: trie com distância de edição limitada (Levenshtein), linha
+  a linha da programação dinâmica a cada nó — ramos que já passaram do
+  limite são cortados, então só uma fração da trie é visitada
+
+O índice vem dos nomes do catálogo local (nunca da PokéAPI) e é refeito
+a cada AUTOCOMPLETE_MAX_AGE segundos, para incluir Pokémon gravados
+depois. Como no pokedex_index, é montado na primeira consulta do worker,
+não no boot.
+"""
+import bisect
+import threading
+import time
+
+from flask import current_app
+
+from models import Pokemon
+
+# Marca do fim de um nome dentro da trie (nenhum nome tem esse caractere)
+_END = "\0"
+
+# Letras iniciais que precisam bater exatamente na busca aproximada (como o
+# prefix_length do fuzzy do Elasticsearch): erro na 1ª letra é raro, e sem
+# isso os primeiros níveis da trie passariam inteiros pelo limite de edições
+FIXED_PREFIX = 1
+
+
+def normalize(text):
+    """'Mr Mime ' → 'mr-mime' (formato dos nomes da PokéAPI)."""
+    return "-".join(text.strip().lower().split())
+
+
+def max_edits(query):
+    """Erros tolerados pelo tamanho do texto digitado (curto demais → nenhum)."""
+    if len(query) < 3:
+        return 0
+    return 1 if len(query) < 6 else 2
+
+
+class NameIndex:
+    def __init__(self, rows):
+        pairs = sorted((name, pokemon_id) for pokemon_id, name in rows)
+        self.names = [name for name, _ in pairs]
+        self.ids = [pokemon_id for _, pokemon_id in pairs]
+        self.by_id = {pokemon_id: name for name, pokemon_id in pairs}
+        self.trie = {}
+        for name, pokemon_id in pairs:
+            node = self.trie
+            for char in name:
+                node = node.setdefault(char, {})
+            node[_END] = pokemon_id
+        self.built_at = time.monotonic()
+
+    def prefix(self, query, limit):
+        """Nomes que começam com `query`, em ordem alfabética."""
+        start = bisect.bisect_left(self.names, query)
+        found = []
+        for i in range(start, min(start + limit, len(self.names))):
+            if not self.names[i].startswith(query):
+                break
+            found.append((self.ids[i], self.names[i], 0))
+        return found
+
+    def fuzzy(self, query, edits, limit):
+        """
+        Nomes cujo começo está a até `edits` edições de `query`
+        (distância de prefixo: "pikahc" acha "pikachu"), mais próximos
+        primeiro. As FIXED_PREFIX primeiras letras não entram nas edições.
+        """
+        found = []
+        # Desce direto pelas letras fixas; a DP roda só no resto
+        fixed, query = query[:FIXED_PREFIX], query[FIXED_PREFIX:]
+        start = self.trie
+        for char in fixed:
+            start = start.get(char)
+            if start is None:
+                return found
+        size = len(query)
+        over = edits + 1   # "passou do limite": o valor exato não importa
+        first_row = [min(col, over) for col in range(size + 1)]
+        # Pilha de (nó, caminho, linha da DP, melhor distância de prefixo no caminho)
+        stack = [(start, fixed, first_row, min(size, over))]
+        while stack:
+            node, path, row, best = stack.pop()
+            if _END in node and best <= edits:
+                found.append((node[_END], path, best))
+            depth = len(path) - len(fixed) + 1
+            # Só a faixa |coluna - profundidade| <= edits pode ficar dentro do limite
+            low, high = max(1, depth - edits), min(size, depth + edits)
+            for char, child in node.items():
+                if char == _END:
+                    continue
+                next_row = [over] * (size + 1)
+                if depth <= edits:
+                    next_row[0] = depth
+                for col in range(low, high + 1):
+                    cost = 0 if query[col - 1] == char else 1
+                    next_row[col] = min(
+                        next_row[col - 1] + 1,      # inserção
+                        row[col] + 1,               # remoção
+                        row[col - 1] + cost,        # troca
+                        over,
+                    )
+                child_best = min(best, next_row[-1])
+                lowest = min(next_row[low - 1:high + 1])
+                if lowest <= edits and lowest < child_best:
+                    # Ainda dá para casar melhor mais abaixo
+                    stack.append((child, path + char, next_row, child_best))
+                elif child_best <= edits:
+                    # Não melhora mais: todo nome abaixo serve com essa distância
+                    self._collect(child, path + char, child_best, found)
+
+        found.sort(key=lambda item: (item[2], len(item[1]), item[1]))
+        return found[:limit]
+
+    def _collect(self, node, path, distance, found):
+        stack = [(node, path)]
+        while stack:
+            node, path = stack.pop()
+            for char, child in node.items():
+                if char == _END:
+                    found.append((child, path, distance))
+                else:
+                    stack.append((child, path + char))
+
+    def search(self, query, limit):
+        """[(id, nome, distância)]: prefixo exato primeiro, completado pelo aproximado."""
+        if query.isdigit():
+            name = self.by_id.get(int(query))
+            return [(int(query), name, 0)] if name else []
+
+        found = self.prefix(query, limit)
+        edits = max_edits(query)
+        if len(found) < limit and edits:
+            seen = {pokemon_id for pokemon_id, _, _ in found}
+            for item in self.fuzzy(query, edits, limit + len(found)):
+                if item[0] not in seen and item[2] > 0:
+                    found.append(item)
+                    if len(found) == limit:
+                        break
+        return found
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_index():
+    """Índice atual; refeito do catálogo quando passa de AUTOCOMPLETE_MAX_AGE."""
+    global _index
+    index = _index
+    max_age = current_app.config["AUTOCOMPLETE_MAX_AGE"]
+    if index is None or time.monotonic() - index.built_at > max_age:
+        with _lock:
+            if _index is index:
+                _index = NameIndex(Pokemon.query.with_entities(Pokemon.id, Pokemon.name).all())
+            index = _index
+    return index
@@ -0,0 +1 @@
+# benchmarks — scripts de medição (rodar a partir de backend/)
@@ -0,0 +1,63 @@
+# benchmarks/boot_time.py
+"""
+Tempo de boot de um worker: N interpretadores novos importando `app`
+(o que o gunicorn faz em cada worker), sem tocar no banco.
+
+    cd backend
+    python -m benchmarks.boot_time --runs 10
+    python -m benchmarks.boot_time --max-ms 800    # falha (exit 1) acima disso
+
+Imprime uma linha JSON (mediana/p95 de imports, create_app e total, e o
+tempo de parede do processo), para acompanhar regressões de cold start.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.common import percentile
+
+PROBE = "import json, app; print(json.dumps(app.app.extensions['boot']))"
+
+
+def measure(runs):
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE], cwd=backend,
+            capture_output=True, text=True, check=True,
+        ).stdout
+        wall_ms = (time.perf_counter() - started) * 1000
+        boot = json.loads(out.strip().splitlines()[-1])
+        boot["process_ms"] = wall_ms
+        samples.append(boot)
+
+    report = {"runs": runs}
+    for field in ("imports_ms", "create_app_ms", "total_ms", "process_ms"):
+        values = [s[field] for s in samples]
+        report[field] = {
+            "p50": round(statistics.median(values), 1),
+            "p95": round(percentile(values, 95), 1),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, help="limite para a mediana de total_ms")
+    args = parser.parse_args()
+
+    report = measure(args.runs)
+    print(json.dumps(report))
+    if args.max_ms is not None and report["total_ms"]["p50"] > args.max_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# benchmarks/common.py
+"""Funções compartilhadas pelos benchmarks (percentis, metadados)."""
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+
+def percentile(values, pct):
+    """Percentil por posição (nearest-rank); None se não houver valores."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def latency_summary(seconds):
+    """Latências (segundos) → p50/p95/p99/média/máx em ms."""
+    ms = lambda v: round(v * 1000, 2) if v is not None else None
+    return {
+        "p50_ms": ms(percentile(seconds, 50)),
+        "p95_ms": ms(percentile(seconds, 95)),
+        "p99_ms": ms(percentile(seconds, 99)),
+        "mean_ms": ms(statistics.fmean(seconds) if seconds else None),
+        "max_ms": ms(max(seconds) if seconds else None),
+    }
+
+
+def run_meta():
+    """Commit e ambiente, para comparar resultados entre commits."""
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=backend,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=backend,
+            capture_output=True, text=True,
+        ).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        commit, dirty = None, None
+    return {
+        "commit": commit,
+        "dirty": dirty,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "argv": sys.argv[1:],
+    }
@@ -0,0 +1,160 @@
+# benchmarks/db_writes.py
+"""
+Escritas concorrentes no SQLite: padrão (journal DELETE, synchronous FULL)
+× ajustado (WAL, synchronous NORMAL, busy_timeout, mmap).
+
+Cada processo imita um worker do gunicorn fazendo o que POST/DELETE de
+/api/favorites fazem (insert/delete + ListVersion.bump + commit).
+
+    cd backend
+    python -m benchmarks.db_writes --workers 8 --ops 200
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+
+from flask import Flask
+from sqlalchemy.exc import OperationalError
+
+from config import Config
+from benchmarks.common import latency_summary
+
+PROFILES = {
+    # O que o pysqlite faz sem PRAGMAs (timeout padrão de 5 s)
+    "default": {
+        "SQLITE_JOURNAL_MODE": "DELETE",
+        "SQLITE_SYNCHRONOUS": "FULL",
+        "SQLITE_BUSY_TIMEOUT_MS": 5000,
+        "SQLITE_MMAP_SIZE": 0,
+    },
+    "tuned": {
+        "SQLITE_JOURNAL_MODE": Config.SQLITE_JOURNAL_MODE,
+        "SQLITE_SYNCHRONOUS": Config.SQLITE_SYNCHRONOUS,
+        "SQLITE_BUSY_TIMEOUT_MS": Config.SQLITE_BUSY_TIMEOUT_MS,
+        "SQLITE_MMAP_SIZE": Config.SQLITE_MMAP_SIZE,
+    },
+}
+
+USERS = 50
+POKEMON = 151
+
+
+def make_app(path, profile):
+    from database import init_db
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config.update(PROFILES[profile])
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{path}"
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {}
+    init_db(app)
+    return app
+
+
+def setup(path, profile):
+    from models import db, User, Pokemon
+
+    app = make_app(path, profile)
+    with app.app_context():
+        db.create_all()
+        db.session.add_all(
+            User(id=i, name=f"u{i}", nickname=f"u{i}", email=f"u{i}@bench", password="x")
+            for i in range(1, USERS + 1)
+        )
+        db.session.add_all(Pokemon(id=i, name=f"p{i}") for i in range(1, POKEMON + 1))
+        db.session.commit()
+
+
+def worker(path, profile, seed, ops, start, queue):
+    import random
+    from models import db, Favorites, ListVersion
+
+    rng = random.Random(seed)
+    app = make_app(path, profile)
+    latencies, errors = [], {"locked": 0, "other": 0}
+
+    with app.app_context():
+        db.session.execute(db.select(1))   # conecta (e aplica PRAGMAs) antes de medir
+        start.wait()
+        for _ in range(ops):
+            user_id = rng.randint(1, USERS)
+            pokemon_id = rng.randint(1, POKEMON)
+            started = time.perf_counter()
+            try:
+                row = Favorites.query.filter_by(user_id=user_id, pokemon_id=pokemon_id).first()
+                if row is None:
+                    db.session.add(Favorites(user_id=user_id, pokemon_id=pokemon_id))
+                else:
+                    db.session.delete(row)
+                ListVersion.bump(user_id, "favorites")
+                db.session.commit()
+                latencies.append(time.perf_counter() - started)
+            except OperationalError:
+                # "database is locked": a requisição teria virado erro 500
+                db.session.rollback()
+                errors["locked"] += 1
+            except Exception:
+                # ex.: IntegrityError de dois processos favoritando o mesmo par
+                db.session.rollback()
+                errors["other"] += 1
+
+    queue.put((latencies, errors))
+
+
+def run(profile, workers, ops, directory=None):
+    folder = tempfile.mkdtemp(prefix="bench-db-", dir=directory)
+    path = os.path.join(folder, "bench.sqlite3")
+    setup(path, profile)
+
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    start = ctx.Barrier(workers + 1)
+    procs = [
+        ctx.Process(target=worker, args=(path, profile, seed, ops, start, queue))
+        for seed in range(workers)
+    ]
+    for proc in procs:
+        proc.start()
+
+    # Mede só as escritas (sem o tempo de subir os processos)
+    start.wait()
+    started = time.perf_counter()
+    results = [queue.get() for _ in procs]
+    for proc in procs:
+        proc.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = [lat for lats, _ in results for lat in lats]
+    locked = sum(err["locked"] for _, err in results)
+    other = sum(err["other"] for _, err in results)
+    return {
+        "profile": profile,
+        "workers": workers,
+        "ops": workers * ops,
+        "ok": len(latencies),
+        "locked_errors": locked,
+        "other_errors": other,
+        "seconds": round(elapsed, 2),
+        "writes_per_s": round(len(latencies) / elapsed, 1),
+        **latency_summary(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, default=8, help="processos escrevendo ao mesmo tempo")
+    parser.add_argument("--ops", type=int, default=200, help="escritas por processo")
+    parser.add_argument("--profile", choices=[*PROFILES, "both"], default="both")
+    parser.add_argument("--dir", help="onde criar o banco (use um disco real: /tmp pode ser tmpfs)")
+    args = parser.parse_args()
+
+    profiles = list(PROFILES) if args.profile == "both" else [args.profile]
+    for profile in profiles:
+        print(json.dumps(run(profile, args.workers, args.ops, args.dir)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# benchmarks/encoding.py
+"""
+Bytes e CPU para codificar as respostas de lista: JSON padrão do Flask ×
+orjson × ?fields= × gzip/brotli, em páginas do tamanho de uma geração,
+de um tipo e da Pokédex inteira.
+
+    cd backend
+    python -m benchmarks.encoding
+    python -m benchmarks.encoding --repeat 200 --out encoding.json
+
+Roda em processo (sem servidor): mede só serialização e compressão, com
+os mesmos providers e níveis que o app usa (encoding.py).
+"""
+import argparse
+import gzip
+import json
+import time
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+import encoding
+from benchmarks.common import run_meta
+from benchmarks.fixtures import synthesize
+from config import Config
+
+LIST_FIELDS = ("id", "name", "types", "sprite_url", "sprite")
+
+
+def summaries(dataset, ids):
+    """Mesmo formato de Pokemon.to_summary()/to_detail() (favoritos e equipe)."""
+    items = []
+    for i in ids:
+        data = dataset.pokemon[i]
+        items.append({
+            "id": i,
+            "name": data["name"].capitalize(),
+            "types": [t["type"]["name"].capitalize() for t in data["types"]],
+            "height": data["height"],
+            "weight": data["weight"],
+            "sprite_url": data["sprites"]["front_default"],
+            "sprite": f"/sprites/{i}",
+            "stats": {s["stat"]["name"]: s["base_stat"] for s in data["stats"]},
+            "abilities": [
+                {"name": a["ability"]["name"], "is_hidden": a["is_hidden"]} for a in data["abilities"]
+            ],
+        })
+    return items
+
+
+def timed(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - started) / repeat * 1e6
+
+
+def measure(app, providers, payload, repeat):
+    rows = []
+    for name, provider in providers.items():
+        app.json = provider
+        for fields in (None, LIST_FIELDS):
+            data = {"results": encoding.project_all(payload, fields), "count": len(payload)}
+            body, encode_us = timed(lambda: provider.response(data).get_data(), repeat)
+            row = {
+                "encoder": name, "fields": ",".join(fields) if fields else "*",
+                "bytes": len(body), "encode_us": round(encode_us, 1),
+            }
+            gz, gz_us = timed(
+                lambda: gzip.compress(body, compresslevel=Config.COMPRESS_LEVEL, mtime=0), repeat
+            )
+            row.update(gzip_bytes=len(gz), gzip_us=round(gz_us, 1))
+            if encoding.brotli is not None:
+                br, br_us = timed(
+                    lambda: encoding.brotli.compress(body, quality=Config.COMPRESS_BR_QUALITY), repeat
+                )
+                row.update(br_bytes=len(br), br_us=round(br_us, 1))
+            rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--out")
+    args = parser.parse_args()
+
+    dataset = synthesize(payload_kb=0)
+    fire = sorted(
+        int(p["pokemon"]["url"].rstrip("/").rsplit("/", 1)[1])
+        for p in dataset.types["fire"]["pokemon"]
+    )
+    pages = {
+        "generation-1": dataset.ids()[:151],
+        "type-fire": fire,
+        "all": dataset.ids(),
+    }
+
+    app = Flask(__name__)
+    providers = {"flask": DefaultJSONProvider(app)}
+    if encoding.orjson is not None:
+        providers["orjson"] = encoding.OrjsonProvider(app)
+
+    results = []
+    with app.app_context():
+        for page, ids in pages.items():
+            for row in measure(app, providers, summaries(dataset, ids), args.repeat):
+                results.append({"page": page, "items": len(ids), **row})
+                print(f"{page:>12} {row['encoder']:>6} fields={row['fields'][:8]:<8} "
+                      f"{row['bytes']:>8} B {row['encode_us']:>9} µs  "
+                      f"gzip {row['gzip_bytes']:>7} B  br {row.get('br_bytes', '-'):>7} B")
+
+    report = {"meta": dict(run_meta(), repeat=args.repeat), "results": results}
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fp:
+            fp.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
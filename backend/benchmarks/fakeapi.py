@@ -0,0 +1,194 @@
+# benchmarks/fakeapi.py
+"""
+PokéAPI falsa local, para medir o backend sem depender de pokeapi.co.
+
+    cd backend
+    python -m benchmarks.fakeapi --port 8900 --latency-ms 40 --jitter-ms 20 --error-rate 0.01
+    POKEAPI_URL=http://127.0.0.1:8900/api/v2/ python app.py
+
+Serve /api/v2/pokemon[/<id|nome>], /generation[/<id>], /type[/<nome>] a
+partir de um dump (--fixtures, ver benchmarks/fixtures.py) ou de dados
+sintéticos determinísticos, e /sprites/<id>.png. Cada resposta espera
+latency ± jitter; uma fração (--error-rate) vira 503. GET /__stats traz
+os contadores (requisições por recurso e por caminho, erros injetados).
+"""
+import argparse
+import json
+import random
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks import fixtures
+
+API_PREFIX = "/api/v2/"
+
+
+def _png(size=96):
+    """PNG RGBA liso (sprite falso)."""
+    raw = b"".join(b"\x00" + b"\xcc\x33\x33\xff" * size for _ in range(size))
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", size, size, 8, 6, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b""))
+
+
+class FakePokeAPI(ThreadingHTTPServer):
+    daemon_threads = True
+    # Muitas conexões simultâneas no benchmark: fila de accept maior que o padrão (5)
+    request_queue_size = 1024
+
+    def __init__(self, address, dataset, latency_ms=0, jitter_ms=0, error_rate=0.0, seed=1):
+        super().__init__(address, Handler)
+        self.dataset = dataset
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.sprite = _png()
+        self._rng = random.Random(seed)
+        self._encoded = {}
+        self._lock = threading.Lock()
+        self.counters = {
+            "requests": 0, "errors_injected": 0, "not_found": 0, "by_resource": {}, "by_path": {},
+        }
+
+    def draw(self):
+        """(atraso, injetar erro?) — sorteados sob lock para serem reprodutíveis."""
+        with self._lock:
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            fail = self._rng.random() < self.error_rate
+        return delay, fail
+
+    def count(self, resource, status, path):
+        with self._lock:
+            self.counters["requests"] += 1
+            by = self.counters["by_resource"]
+            by[resource] = by.get(resource, 0) + 1
+            by = self.counters["by_path"]
+            by[path] = by.get(path, 0) + 1
+            if status == 503:
+                self.counters["errors_injected"] += 1
+            elif status == 404:
+                self.counters["not_found"] += 1
+
+    def encoded(self, key, build):
+        body = self._encoded.get(key)
+        if body is None:
+            data = build()
+            if data is None:
+                return None
+            body = self._encoded[key] = json.dumps(data).encode()
+        return body
+
+    def route(self, path, query):
+        """Caminho da API → (recurso, corpo JSON em bytes ou None)."""
+        ds = self.dataset
+        parts = path[len(API_PREFIX):].strip("/").split("/")
+        resource, key = parts[0], (parts[1] if len(parts) > 1 else None)
+
+        if resource == "pokemon" and key is None:
+            limit = int(query.get("limit", ["20"])[0])
+            offset = int(query.get("offset", ["0"])[0])
+            return resource, self.encoded(("page", limit, offset), lambda: ds.page(limit, offset))
+        if resource == "pokemon":
+            found = ds.pokemon.get(int(key)) if key.isdigit() else ds.by_name.get(key.lower())
+            return resource, self.encoded(("pokemon", key.lower()), lambda: found)
+        if resource in ("generation", "type") and key is None:
+            return resource, self.encoded(("index", resource), lambda: ds.index(resource))
+        if resource == "generation":
+            found = ds.generations.get(int(key)) if key.isdigit() else None
+            return resource, self.encoded(("generation", key), lambda: found)
+        if resource == "type":
+            return resource, self.encoded(("type", key.lower()), lambda: ds.types.get(key.lower()))
+        return resource, None
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, como a PokéAPI real
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, content_type="application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+
+        if url.path == "/__stats":
+            with server._lock:
+                body = json.dumps(server.counters).encode()
+            return self._send(200, body)
+
+        delay, fail = server.draw()
+        if delay:
+            time.sleep(delay)
+
+        if url.path.startswith("/sprites/"):
+            resource, body, content_type = "sprites", server.sprite, "image/png"
+        elif url.path.startswith(API_PREFIX):
+            resource, body = server.route(url.path, parse_qs(url.query))
+            content_type = "application/json"
+        else:
+            resource, body, content_type = "other", None, "application/json"
+
+        if fail:
+            server.count(resource, 503, url.path)
+            return self._send(503, b'{"detail": "falha injetada"}')
+        if body is None:
+            server.count(resource, 404, url.path)
+            return self._send(404, b"Not Found", "text/plain")
+        server.count(resource, 200, url.path)
+        self._send(200, body, content_type)
+
+
+def make_server(host="127.0.0.1", port=0, fixtures_dir=None, count=1025, payload_kb=64,
+                latency_ms=0, jitter_ms=0, error_rate=0.0, seed=1):
+    server = FakePokeAPI((host, port), None, latency_ms, jitter_ms, error_rate, seed)
+    base_url = f"http://{host}:{server.server_address[1]}{API_PREFIX}"
+    server.dataset = (
+        fixtures.load(fixtures_dir, base_url) if fixtures_dir
+        else fixtures.synthesize(count, base_url, payload_kb, seed)
+    )
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PokéAPI falsa para benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--fixtures", help="dump gravado (senão, dados sintéticos)")
+    parser.add_argument("--count", type=int, default=1025, help="Pokémon sintéticos")
+    parser.add_argument("--payload-kb", type=int, default=64, help="tamanho de /pokemon/<id>")
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    server = make_server(
+        args.host, args.port, args.fixtures, args.count, args.payload_kb,
+        args.latency_ms, args.jitter_ms, args.error_rate, args.seed,
+    )
+    host, port = server.server_address[:2]
+    print(f"🧪 PokéAPI falsa em http://{host}:{port}{API_PREFIX} "
+          f"({len(server.dataset.pokemon)} Pokémon)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+# benchmarks/fixtures.py
+"""
+Dados da PokéAPI para o servidor falso (benchmarks/fakeapi.py).
+
+Dois jeitos de obter os fixtures, ambos no layout de dump do `ingest`
+(pokemon/<id>.json, generation/<id>.json, type/<nome>.json):
+
+    python -m benchmarks.fixtures record ./fixtures --limit 151   # grava da PokéAPI real
+    python -m benchmarks.fixtures synth ./fixtures --count 1025    # gera (determinístico)
+
+Sem diretório, o fakeapi sintetiza os dados em memória (mesma semente →
+mesmos dados), o que basta para comparar commits.
+"""
+import argparse
+import json
+import os
+import random
+
+TYPES = [
+    "normal", "fire", "water", "grass", "electric", "ice", "fighting", "poison",
+    "ground", "flying", "psychic", "bug", "rock", "ghost", "dragon", "dark",
+    "steel", "fairy",
+]
+
+# Último ID de cada geração (como na Pokédex nacional)
+GENERATION_ENDS = [151, 251, 386, 493, 649, 721, 809, 905, 1025]
+
+STATS = ["hp", "attack", "defense", "special-attack", "special-defense", "speed"]
+
+
+class Dataset:
+    """Respostas da PokéAPI já montadas (dict de caminho → JSON)."""
+
+    def __init__(self, pokemon, generations, types, base_url):
+        self.pokemon = pokemon            # id → JSON de /pokemon/<id>
+        self.generations = generations    # id → JSON de /generation/<id>
+        self.types = types                # nome → JSON de /type/<nome>
+        self.base_url = base_url.rstrip("/") + "/"
+        self.by_name = {p["name"]: p for p in pokemon.values()}
+
+    def ids(self):
+        return sorted(self.pokemon)
+
+    def names(self):
+        return [self.pokemon[i]["name"] for i in self.ids()]
+
+    def page(self, limit, offset):
+        ids = self.ids()[offset:offset + limit]
+        return {
+            "count": len(self.pokemon),
+            "results": [
+                {"name": self.pokemon[i]["name"], "url": f"{self.base_url}pokemon/{i}/"}
+                for i in ids
+            ],
+        }
+
+    def index(self, resource):
+        keys = sorted(self.generations) if resource == "generation" else sorted(self.types)
+        return {
+            "count": len(keys),
+            "results": [{"name": str(k), "url": f"{self.base_url}{resource}/{k}/"} for k in keys],
+        }
+
+
+def _pokemon_json(pokemon_id, rng, base_url, payload_kb):
+    first = TYPES[(pokemon_id * 7) % len(TYPES)]
+    second = TYPES[(pokemon_id * 11 + 3) % len(TYPES)]
+    types = [first] if pokemon_id % 3 or second == first else [first, second]
+    data = {
+        "id": pokemon_id,
+        "name": f"mon-{pokemon_id}",
+        "height": rng.randint(3, 40),
+        "weight": rng.randint(10, 2000),
+        "sprites": {"front_default": f"{base_url}sprites/{pokemon_id}.png"},
+        "types": [
+            {"slot": slot, "type": {"name": name, "url": f"{base_url}type/{name}/"}}
+            for slot, name in enumerate(types, start=1)
+        ],
+        "stats": [
+            {"base_stat": rng.randint(20, 160), "effort": 0, "stat": {"name": name}}
+            for name in STATS
+        ],
+        "abilities": [
+            {"slot": 1, "is_hidden": False, "ability": {"name": f"ability-{pokemon_id % 97}"}},
+            {"slot": 3, "is_hidden": True, "ability": {"name": f"hidden-{pokemon_id % 31}"}},
+        ],
+    }
+    # A resposta real tem dezenas/centenas de KB (moves, game_indices...):
+    # o tamanho pesa no parse, então o fixture imita isso
+    move = {"move": {"name": "tackle", "url": f"{base_url}move/33/"}, "version_group_details": []}
+    per_move = len(json.dumps(move))
+    data["moves"] = [move] * max(0, payload_kb * 1024 // per_move)
+    return data
+
+
+def synthesize(count=1025, base_url="http://127.0.0.1/api/v2/", payload_kb=64, seed=1):
+    rng = random.Random(seed)
+    base_url = base_url.rstrip("/") + "/"
+    pokemon = {i: _pokemon_json(i, rng, base_url, payload_kb) for i in range(1, count + 1)}
+
+    generations = {}
+    start = 1
+    for number, end in enumerate(GENERATION_ENDS, start=1):
+        species = [i for i in range(start, min(end, count) + 1)]
+        generations[number] = {
+            "id": number,
+            "name": f"generation-{number}",
+            "pokemon_species": [
+                {"name": pokemon[i]["name"], "url": f"{base_url}pokemon-species/{i}/"} for i in species
+            ],
+        }
+        start = end + 1
+
+    types = {name: {"name": name, "pokemon": []} for name in TYPES}
+    for i, data in pokemon.items():
+        for t in data["types"]:
+            types[t["type"]["name"]]["pokemon"].append({
+                "slot": t["slot"],
+                "pokemon": {"name": data["name"], "url": f"{base_url}pokemon/{i}/"},
+            })
+
+    return Dataset(pokemon, generations, types, base_url)
+
+
+# ==========================================================
+# 📁 Dump em disco (mesmo layout do ingest --source)
+# ==========================================================
+def _read_dir(root, resource):
+    folder = os.path.join(root, resource)
+    items = {}
+    if not os.path.isdir(folder):
+        return items
+    for entry in os.listdir(folder):
+        if entry.endswith(".json"):
+            key, path = entry[:-len(".json")], os.path.join(folder, entry)
+        elif os.path.isfile(os.path.join(folder, entry, "index.json")):
+            key, path = entry, os.path.join(folder, entry, "index.json")
+        else:
+            continue
+        with open(path, encoding="utf-8") as fp:
+            items[key] = json.load(fp)
+    return items
+
+
+def load(root, base_url):
+    """Lê um dump gravado (record/synth); as URLs internas são reescritas."""
+    def rebase(data):
+        # Os dumps trazem URLs de https://pokeapi.co/api/v2/ → aponta para o fake
+        raw = json.dumps(data).replace("https://pokeapi.co/api/v2/", base_url.rstrip("/") + "/")
+        return json.loads(raw)
+
+    pokemon = {int(d["id"]): rebase(d) for d in _read_dir(root, "pokemon").values()}
+    generations = {int(d["id"]): rebase(d) for d in _read_dir(root, "generation").values()}
+    types = {d["name"]: rebase(d) for d in _read_dir(root, "type").values()}
+    return Dataset(pokemon, generations, types, base_url)
+
+
+def dump(dataset, root):
+    for resource, items in (
+        ("pokemon", dataset.pokemon), ("generation", dataset.generations), ("type", dataset.types),
+    ):
+        os.makedirs(os.path.join(root, resource), exist_ok=True)
+        for key, data in items.items():
+            with open(os.path.join(root, resource, f"{key}.json"), "w", encoding="utf-8") as fp:
+                json.dump(data, fp)
+
+
+def record(root, limit=151, base_url="https://pokeapi.co/api/v2/"):
+    """Grava respostas reais da PokéAPI (Pokémon 1..limit, gerações e tipos)."""
+    import requests
+
+    session = requests.Session()
+    get = lambda path: session.get(f"{base_url}{path}", timeout=30).json()
+
+    pokemon = {i: get(f"pokemon/{i}") for i in range(1, limit + 1)}
+    generations = {
+        int(e["url"].rstrip("/").rsplit("/", 1)[-1]): get(f"generation/{e['name']}")
+        for e in get("generation?limit=100")["results"]
+    }
+    types = {e["name"]: get(f"type/{e['name']}") for e in get("type?limit=100")["results"]}
+    dump(Dataset(pokemon, generations, types, base_url), root)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fixtures da PokéAPI para os benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="grava da PokéAPI real")
+    rec.add_argument("out")
+    rec.add_argument("--limit", type=int, default=151)
+
+    syn = sub.add_parser("synth", help="gera dados sintéticos")
+    syn.add_argument("out")
+    syn.add_argument("--count", type=int, default=1025)
+    syn.add_argument("--payload-kb", type=int, default=64)
+    syn.add_argument("--seed", type=int, default=1)
+
+    args = parser.parse_args()
+    if args.command == "record":
+        record(args.out, args.limit)
+    else:
+        dump(synthesize(args.count, "https://pokeapi.co/api/v2/", args.payload_kb, args.seed), args.out)
+    print(f"✅ Fixtures gravados em {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+# benchmarks/load.py
+"""
+Carga no backend (Flask) contra a PokéAPI falsa, com resultado em JSON.
+
+    cd backend
+    python -m benchmarks.load                                  # padrão: gunicorn, 1/8/32 clientes
+    python -m benchmarks.load --concurrency 1,16 --requests 300 --latency-ms 40 --out bench.json
+    python -m benchmarks.load --scenarios search,generation --server werkzeug
+    python -m benchmarks.load --server uvicorn          # entrada ASGI (asgi.py)
+
+Sobe a PokéAPI falsa e o app (banco temporário + bootstrap) em
+subprocessos, aquece o catálogo e mede cada cenário em cada nível de
+concorrência: p50/p95/p99, vazão e erros. As requisições de cada cenário
+são sorteadas com semente fixa, então duas execuções no mesmo commit
+fazem exatamente o mesmo trabalho — compare os JSONs entre commits.
+
+Cenários: unfiltered, generation, type, combined, search, favorites,
+team, team_batch, mix (todos misturados).
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks import fixtures
+from benchmarks.common import latency_summary, run_meta
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = [
+    "unfiltered", "generation", "type", "combined", "search",
+    "favorites", "team", "team_batch", "mix",
+]
+MIX = {
+    "unfiltered": 20, "generation": 20, "type": 15, "combined": 15,
+    "search": 20, "favorites": 5, "team": 5,
+}
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_http(url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(url, timeout=1).status_code < 500:
+                return
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"{url} não respondeu em {timeout}s")
+
+
+# ==========================================================
+# 🧾 Requisições de cada cenário (sorteio com semente fixa)
+# ==========================================================
+def _payload(pokemon_id):
+    return {"id": pokemon_id, "name": f"mon-{pokemon_id}", "types": ["normal"]}
+
+
+def make_jobs(scenario, count, dataset, seed):
+    """Lista de jobs; cada job é uma sequência de (método, caminho, json)."""
+    rng = random.Random(f"{scenario}:{seed}")
+    ids = dataset.ids()
+    generations = sorted(dataset.generations)
+    types = sorted(dataset.types)
+    jobs = []
+
+    for _ in range(count):
+        kind = scenario
+        if scenario == "mix":
+            kind = rng.choices(list(MIX), weights=list(MIX.values()))[0]
+
+        if kind == "unfiltered":
+            cursor = rng.randrange(0, max(1, len(ids) - 50), 50)
+            job = [("GET", f"/pokemon/filter?limit=50&cursor={cursor}", None)]
+        elif kind == "generation":
+            job = [("GET", f"/pokemon/filter?generation={rng.choice(generations)}", None)]
+        elif kind == "type":
+            job = [("GET", f"/pokemon/filter?type={rng.choice(types)}", None)]
+        elif kind == "combined":
+            a, b = rng.sample(types, 2)
+            job = [("GET", f"/pokemon/filter?generation={rng.choice(generations)}&type={a},{b}", None)]
+        elif kind == "search":
+            pokemon_id = rng.choice(ids)
+            key = pokemon_id if rng.random() < 0.5 else dataset.pokemon[pokemon_id]["name"]
+            job = [("GET", f"/pokemon/search/{key}", None)]
+        elif kind in ("favorites", "team"):
+            base = "/api/favorites/" if kind == "favorites" else "/api/equipe/"
+            pokemon_id = rng.choice(ids)
+            job = [
+                ("POST", base, _payload(pokemon_id)),
+                ("GET", base, None),
+                ("DELETE", f"{base}{pokemon_id}", None),
+            ]
+        elif kind == "team_batch":
+            team = rng.sample(ids, 6)
+            job = [
+                ("POST", "/api/equipe/batch", {"ops": [dict(_payload(i), op="add") for i in team]}),
+                ("GET", "/api/equipe/", None),
+                ("POST", "/api/equipe/batch", {"ops": [{"op": "remove", "pokemon_id": i} for i in team]}),
+            ]
+        else:
+            raise ValueError(scenario)
+        jobs.append(job)
+    return jobs
+
+
+# ==========================================================
+# 🚀 Execução
+# ==========================================================
+class Client:
+    """Um cliente por thread: sessão keep-alive própria e usuário próprio."""
+
+    def __init__(self, base_url, token=None):
+        self.base_url = base_url
+        self.session = requests.Session()
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+    def call(self, method, path, body):
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, self.base_url + path, json=body, timeout=60)
+            status = response.status_code
+            response.content   # lê o corpo inteiro (conta no tempo)
+        except requests.exceptions.RequestException:
+            status = 0
+        return time.perf_counter() - started, status
+
+
+def run_level(clients, jobs, concurrency):
+    samples, statuses = [], {}
+    lock = threading.Lock()
+    next_job = iter(jobs)
+    job_lock = threading.Lock()
+
+    def worker(client):
+        while True:
+            with job_lock:
+                job = next(next_job, None)
+            if job is None:
+                return
+            for method, path, body in job:
+                elapsed, status = client.call(method, path, body)
+                with lock:
+                    samples.append(elapsed)
+                    statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(worker, clients[i]) for i in range(concurrency)]:
+            future.result()
+    elapsed = time.perf_counter() - started
+
+    errors = sum(n for status, n in statuses.items() if status == 0 or status >= 500)
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "status": {str(k): v for k, v in sorted(statuses.items())},
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(samples) / elapsed, 1) if elapsed else None,
+        **latency_summary(samples),
+    }
+
+
+def _login_clients(base_url, count):
+    clients = []
+    for i in range(count):
+        user = {
+            "name": f"Bench {i}", "nickname": f"bench{i}", "email": f"bench{i}@bench.local",
+            "password": "bench", "confirmPassword": "bench",
+        }
+        requests.post(f"{base_url}/register", json=user, timeout=30)
+        token = requests.post(
+            f"{base_url}/login", json={"email": user["email"], "password": "bench"}, timeout=30
+        ).json()["access_token"]
+        clients.append(Client(base_url, token))
+    return clients
+
+
+def start_stack(args, workdir):
+    """Sobe a PokéAPI falsa e o app; retorna (url do app, url da fake, processos)."""
+    fake_port, app_port = _free_port(), _free_port()
+    fake = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.fakeapi", "--port", str(fake_port),
+         "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+         "--error-rate", str(args.error_rate), "--count", str(args.count),
+         "--payload-kb", str(args.payload_kb), "--seed", str(args.seed)]
+        + (["--fixtures", args.fixtures] if args.fixtures else []),
+        cwd=BACKEND, stdout=subprocess.DEVNULL,
+    )
+    fake_url = f"http://127.0.0.1:{fake_port}"
+    _wait_http(f"{fake_url}/__stats")
+
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'bench.sqlite3')}",
+        POKEAPI_URL=f"{fake_url}/api/v2/",
+        SPRITE_CACHE_DIR=os.path.join(workdir, "sprites"),
+        # Mede vazão, não descarte: controle de admissão desligado salvo pedido
+        ADMISSION_UPSTREAM_LIMIT=os.environ.get("ADMISSION_UPSTREAM_LIMIT", "0"),
+    )
+    subprocess.run(
+        [sys.executable, "-m", "flask", "--app", "app", "bootstrap"],
+        cwd=BACKEND, env=env, check=True, stdout=subprocess.DEVNULL,
+    )
+
+    if args.server == "gunicorn":
+        cmd = ["gunicorn", "-b", f"127.0.0.1:{app_port}", "-w", str(args.workers),
+               "--threads", str(args.threads), "--backlog", "2048", "app:app"]
+    elif args.server == "uvicorn":
+        cmd = ["uvicorn", "asgi:app", "--port", str(app_port), "--workers", str(args.workers),
+               "--backlog", "2048", "--log-level", "warning"]
+    else:
+        cmd = [sys.executable, "-m", "flask", "--app", "app", "run",
+               "--port", str(app_port), "--with-threads", "--no-reload", "--no-debugger"]
+    app = subprocess.Popen(cmd, cwd=BACKEND, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    app_url = f"http://127.0.0.1:{app_port}"
+    _wait_http(f"{app_url}/health")
+    return app_url, fake_url, [app, fake]
+
+
+def stop_stack(procs):
+    for proc in procs:
+        proc.terminate()
+    for proc in procs:
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()   # gunicorn espera as conexões keep-alive no shutdown gracioso
+            proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--concurrency", default="1,8,32", help="níveis, separados por vírgula")
+    parser.add_argument("--requests", type=int, default=200, help="jobs por cenário e nível")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--cold", action="store_true", help="sem aquecimento do catálogo")
+    parser.add_argument("--server", choices=["gunicorn", "uvicorn", "werkzeug"], default="gunicorn")
+    parser.add_argument("--workers", type=int, default=2, help="workers do gunicorn/uvicorn")
+    parser.add_argument("--threads", type=int, default=8, help="threads por worker do gunicorn")
+    parser.add_argument("--fixtures", help="dump gravado (benchmarks/fixtures.py)")
+    parser.add_argument("--count", type=int, default=1025, help="Pokémon sintéticos")
+    parser.add_argument("--payload-kb", type=int, default=64)
+    parser.add_argument("--latency-ms", type=float, default=30)
+    parser.add_argument("--jitter-ms", type=float, default=10)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--out", help="grava o JSON também neste arquivo")
+    args = parser.parse_args()
+
+    scenarios = [s for s in args.scenarios.split(",") if s]
+    levels = [int(c) for c in args.concurrency.split(",") if c]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"cenários desconhecidos: {', '.join(sorted(unknown))}")
+
+    dataset = (
+        fixtures.load(args.fixtures, "http://fake/api/v2/") if args.fixtures
+        else fixtures.synthesize(args.count, "http://fake/api/v2/", payload_kb=0, seed=args.seed)
+    )
+
+    workdir = tempfile.mkdtemp(prefix="bench-load-")
+    procs = []
+    try:
+        app_url, fake_url, procs = start_stack(args, workdir)
+        clients = _login_clients(app_url, max(levels))
+
+        if not args.cold:
+            # Aquece o catálogo: cada cenário uma vez, sem medir
+            for scenario in scenarios:
+                run_level(clients, make_jobs(scenario, args.requests, dataset, args.seed), max(levels))
+
+        results = []
+        for scenario in scenarios:
+            jobs = make_jobs(scenario, args.requests, dataset, args.seed)
+            for level in levels:
+                result = run_level(clients, jobs, level)
+                results.append({"scenario": scenario, "concurrency": level, **result})
+                print(f"{scenario:>11} c={level:<3} {result['throughput_rps']:>8} req/s  "
+                      f"p50 {result['p50_ms']} ms  p99 {result['p99_ms']} ms  "
+                      f"erros {result['errors']}", file=sys.stderr)
+
+        report = {
+            "meta": dict(run_meta(), **{
+                k: getattr(args, k) for k in (
+                    "server", "workers", "threads", "requests", "seed", "cold", "count",
+                    "payload_kb", "latency_ms", "jitter_ms", "error_rate", "fixtures",
+                )
+            }),
+            "fakeapi": requests.get(f"{fake_url}/__stats", timeout=5).json(),
+            "results": results,
+        }
+        output = json.dumps(report, indent=2)
+        print(output)
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as fp:
+                fp.write(output + "\n")
+    finally:
+        stop_stack(procs)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
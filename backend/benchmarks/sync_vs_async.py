@@ -0,0 +1,105 @@
+# benchmarks/sync_vs_async.py
+"""
+Caminho síncrono (gunicorn, app:app) × assíncrono (uvicorn, asgi:app)
+nas rotas que esperam a PokéAPI, lado a lado, em JSON.
+
+    cd backend
+    python -m benchmarks.sync_vs_async
+    python -m benchmarks.sync_vs_async --concurrency 32,128,512 --latency-ms 100
+
+Um processo de cada lado (gunicorn: 1 worker × --threads; uvicorn: 1
+worker). Cada requisição pede Pokémon que ainda não estão no catálogo
+(páginas e IDs nunca repetidos), então todas esperam a PokéAPI falsa —
+é o cenário em que os workers síncronos se esgotam.
+"""
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import time
+
+import requests
+
+from benchmarks import load
+from benchmarks.common import run_meta
+
+
+def cold_jobs(scenario, level_index, requests_per_level, page_size):
+    """Jobs sem repetição entre níveis: cada nível usa uma faixa própria de IDs."""
+    first = level_index * requests_per_level * page_size
+    jobs = []
+    for n in range(requests_per_level):
+        start = first + n * page_size
+        if scenario == "filter":
+            jobs.append([("GET", f"/pokemon/filter?limit={page_size}&cursor={start}", None)])
+        else:
+            jobs.append([("GET", f"/pokemon/search/{start + 1}", None)])
+    return jobs
+
+
+def run_side(server, args, levels):
+    stack_args = argparse.Namespace(
+        server=server, workers=1, threads=args.threads, fixtures=None, seed=args.seed,
+        count=args.count, payload_kb=args.payload_kb, latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms, error_rate=0.0,
+    )
+    workdir = tempfile.mkdtemp(prefix=f"bench-{server}-")
+    procs = []
+    results = []
+    try:
+        app_url, fake_url, procs = load.start_stack(stack_args, workdir)
+        clients = [load.Client(app_url) for _ in range(max(levels))]
+        # Lista completa da Pokédex (um GET) fora da medição
+        requests.get(f"{app_url}/pokemon/filter?limit=1&cursor={args.count}", timeout=60)
+
+        for scenario in args.scenarios.split(","):
+            for index, level in enumerate(levels):
+                # Faixas diferentes por cenário também (search pula as do filter)
+                offset = index + (len(levels) if scenario == "search" else 0)
+                jobs = cold_jobs(scenario, offset, args.requests, args.page_size)
+                result = load.run_level(clients, jobs, level)
+                results.append({"server": server, "scenario": scenario, "concurrency": level, **result})
+                print(f"{server:>8} {scenario:>6} c={level:<4} {result['throughput_rps']:>8} req/s  "
+                      f"p50 {result['p50_ms']} ms  p99 {result['p99_ms']} ms  "
+                      f"erros {result['errors']}", file=sys.stderr)
+    finally:
+        load.stop_stack(procs)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--concurrency", default="16,64,256")
+    parser.add_argument("--requests", type=int, default=200, help="requisições por nível")
+    parser.add_argument("--scenarios", default="filter,search")
+    parser.add_argument("--page-size", type=int, default=10, help="limit do /pokemon/filter")
+    parser.add_argument("--threads", type=int, default=8, help="threads do worker gunicorn")
+    parser.add_argument("--latency-ms", type=float, default=150)
+    parser.add_argument("--jitter-ms", type=float, default=30)
+    parser.add_argument("--payload-kb", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out")
+    args = parser.parse_args()
+
+    levels = [int(c) for c in args.concurrency.split(",") if c]
+    # IDs suficientes para nenhum nível/cenário repetir Pokémon
+    args.count = 2 * len(levels) * args.requests * args.page_size + args.page_size
+
+    started = time.perf_counter()
+    results = run_side("gunicorn", args, levels) + run_side("uvicorn", args, levels)
+    report = {
+        "meta": dict(run_meta(), **{k: v for k, v in vars(args).items() if k != "out"},
+                     seconds=round(time.perf_counter() - started, 1)),
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fp:
+            fp.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# bootstrap.py
+"""
+Preparação do banco, fora do boot dos workers:
+
+    flask --app app bootstrap
+
+Cria as tabelas que faltam, aplica as migrações pendentes e garante o
+usuário admin. Pode rodar quantas vezes for preciso (deploy, release
+phase, ambiente local); os workers do gunicorn só atendem requisições.
+"""
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from werkzeug.security import generate_password_hash
+
+import migrations
+from models import db, User
+
+ADMIN_EMAIL = "admin@teste.com"
+
+
+def bootstrap(echo=print):
+    db.create_all()
+
+    applied = migrations.upgrade()
+    if applied:
+        echo(f"🛠️ Migrações aplicadas: {', '.join(applied)}")
+
+    echo(f"Banco de dados ativo em: {db.engine.url.render_as_string(hide_password=True)}"
+         f" (instance: {current_app.instance_path})")
+
+    if not User.query.filter_by(email=ADMIN_EMAIL).first():
+        admin = User(
+            name="Administrador",
+            nickname="admin",
+            email=ADMIN_EMAIL,
+            password=generate_password_hash("123456"),
+            is_admin=True
+        )
+        db.session.add(admin)
+        db.session.commit()
+        echo(f"✅ Usuário admin criado: {ADMIN_EMAIL} / 123456")
+
+
+@click.command("bootstrap")
+@with_appcontext
+def bootstrap_command():
+    """Cria/migra o esquema e garante o usuário admin (idempotente)."""
+    bootstrap(echo=click.echo)
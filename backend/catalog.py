@@ -0,0 +1,583 @@
+# catalog.py
+import json
+import time
+
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+
+import metrics
+from models import db, CatalogVersion, Pokemon, PokemonList
+from fetcher import FAILED, iter_fetch_all
+from pokeapi_client import pokeapi
+from refresher import refresher
+
+# Caminho relativo à POKEAPI_URL (ver pokeapi_client)
+POKEMON_PATH = "pokemon/"
+
+# Chave da lista com todos os Pokémon (as demais: generation/<id>, type/<nome>)
+ALL_KEY = "pokemon"
+
+# Nome do stat na PokéAPI -> coluna em Pokemon
+STAT_COLUMNS = {
+    "hp": "hp",
+    "attack": "attack",
+    "defense": "defense",
+    "special-attack": "special_attack",
+    "special-defense": "special_defense",
+    "speed": "speed",
+}
+
+# 🚫 Cache negativo (nomes que a PokéAPI respondeu 404) — por processo
+_missing = {}
+
+# 🔢 Incrementado a cada gravação/invalidação de listas (ver pokedex_index)
+_lists_version = 0
+
+
+class StoreError(RuntimeError):
+    """O Pokémon veio da PokéAPI mas não pôde ser gravado nem relido do catálogo."""
+
+
+# ==========================================================
+# 🧩 Normalização do JSON da PokéAPI
+# ==========================================================
+def normalize_pokemon(poke_data):
+    """Converte o JSON de /pokemon/<id> nas colunas de Pokemon."""
+    types = [
+        t["type"]["name"]
+        for t in sorted(poke_data.get("types", []), key=lambda t: t.get("slot", 0))
+    ]
+    stats = {s["stat"]["name"]: s["base_stat"] for s in poke_data.get("stats", [])}
+
+    record = {
+        "id": poke_data.get("id"),
+        "name": poke_data.get("name").lower(),
+        "sprite_url": poke_data["sprites"]["front_default"],
+        "height": (poke_data.get("height") or 0) / 10,
+        "weight": (poke_data.get("weight") or 0) / 10,
+        "type1": types[0] if types else None,
+        "type2": types[1] if len(types) > 1 else None,
+        "abilities": [
+            {"name": a["ability"]["name"], "is_hidden": a["is_hidden"]}
+            for a in sorted(poke_data.get("abilities", []), key=lambda a: a.get("slot", 0))
+        ],
+    }
+    for stat_name, column in STAT_COLUMNS.items():
+        record[column] = stats.get(stat_name)
+    return record
+
+
+def _id_from_url(url):
+    """".../pokemon-species/25/" → 25"""
+    return int(url.rstrip("/").rsplit("/", 1)[-1])
+
+
+def page_ids(page_data):
+    """Pokémon de /pokemon?limit=&offset=."""
+    return sorted(_id_from_url(e["url"]) for e in page_data.get("results", []))
+
+
+def generation_ids(gen_data):
+    """
+    Espécies de /generation/<id>. O ID da espécie é o mesmo do Pokémon
+    padrão dela (ex.: espécie 386 → deoxys-normal).
+    """
+    return sorted(_id_from_url(s["url"]) for s in gen_data.get("pokemon_species", []))
+
+
+def type_ids(type_data):
+    """Pokémon (incluindo formas alternativas) de /type/<nome>."""
+    return sorted(_id_from_url(p["pokemon"]["url"]) for p in type_data.get("pokemon", []))
+
+
+# ==========================================================
+# ⏱️ TTL e cache negativo
+# ==========================================================
+def is_fresh(row):
+    return row.fetched_at + current_app.config["CATALOG_TTL"] > time.time()
+
+
+def is_servable(row):
+    """
+    Fresco ou vencido há menos de CATALOG_STALE_GRACE: pode ser servido
+    na hora enquanto o refresher busca a versão nova em segundo plano
+    (stale-while-revalidate). invalidate() zera fetched_at → fora da
+    tolerância, a próxima leitura busca na hora.
+    """
+    config = current_app.config
+    return row.fetched_at + config["CATALOG_TTL"] + config["CATALOG_STALE_GRACE"] > time.time()
+
+
+def refresh_stale(rows):
+    """
+    Agenda a renovação das linhas vencidas, sem esperar a PokéAPI. Para
+    leituras que servem o que há no banco (favoritos/equipe): as linhas
+    da migração (fetched_at=0, sem stats nem habilidades) são completadas
+    em segundo plano e a próxima leitura já vem com os dados novos.
+    """
+    for row in rows:
+        if not is_fresh(row):
+            refresher.schedule("pokemon", row.id)
+
+
+def _is_missing(key):
+    expires_at = _missing.get(key)
+    if expires_at is None:
+        return False
+    if expires_at <= time.time():
+        _missing.pop(key, None)
+        return False
+    return True
+
+
+def _mark_missing(key):
+    _missing[key] = time.time() + current_app.config["CATALOG_MISS_TTL"]
+
+
+# ==========================================================
+# 💾 Gravação (upsert) no catálogo
+# ==========================================================
+def store_pokemon(records):
+    """Insere/atualiza registros normalizados e devolve as linhas."""
+    if not records:
+        return []
+
+    now = time.time()
+    ids = [r["id"] for r in records]
+    existing = {p.id: p for p in Pokemon.query.filter(Pokemon.id.in_(ids))}
+
+    # A PokéAPI manda: um nome preso a outro ID (dado legado inconsistente)
+    # é liberado e essa linha vence, para ser buscada de novo
+    names = [r["name"] for r in records]
+    taken = Pokemon.query.filter(Pokemon.name.in_(names), Pokemon.id.notin_(ids)).all()
+    for row in taken:
+        row.name = f"{row.name}-{row.id}"
+        row.fetched_at = 0
+    if taken:
+        db.session.flush()
+
+    try:
+        # apply() carrega as habilidades (lazy load): sem no_autoflush as
+        # linhas novas iriam ao banco ali, fora do tratamento do conflito
+        with db.session.no_autoflush:
+            for record in records:
+                row = existing.get(record["id"])
+                if row is None:
+                    row = Pokemon()
+                    db.session.add(row)
+                    existing[record["id"]] = row
+                row.apply(record)
+                row.fetched_at = now
+        CatalogVersion.bump()
+        db.session.commit()
+    except IntegrityError:
+        # Outro worker gravou o mesmo Pokémon ao mesmo tempo
+        db.session.rollback()
+        return Pokemon.query.filter(Pokemon.id.in_(ids)).all()
+
+    return [existing[i] for i in ids]
+
+
+def record_from_payload(data):
+    """
+    Registro normalizado a partir da cópia do Pokémon que os favoritos/
+    equipe antigos guardavam (o formato de /pokemon/search). Só para a
+    migração. None se faltar ID ou nome.
+    """
+    pokemon_id = data.get("pokemon_id") or data.get("id")
+    name = data.get("pokemon_name") or data.get("name")
+    if not pokemon_id or not name:
+        return None
+    try:
+        pokemon_id = int(pokemon_id)
+    except (TypeError, ValueError):
+        return None
+
+    types = [str(t).lower() for t in (data.get("types") or [])]
+    stats = data.get("stats") or {}
+    record = {
+        "id": pokemon_id,
+        "name": str(name).lower(),
+        "sprite_url": data.get("sprite_url") or data.get("pokemon_image"),
+        "height": data.get("height"),
+        "weight": data.get("weight"),
+        "type1": types[0] if types else None,
+        "type2": types[1] if len(types) > 1 else None,
+        "abilities": [
+            {"name": a.get("name"), "is_hidden": bool(a.get("is_hidden"))}
+            for a in (data.get("abilities") or []) if isinstance(a, dict) and a.get("name")
+        ],
+    }
+    for stat_name, column in STAT_COLUMNS.items():
+        record[column] = stats.get(stat_name)
+    return record
+
+
+def ensure_pokemon(record):
+    """
+    Garante que o Pokémon exista no catálogo (sem commit). Só para a
+    migração dos favoritos/equipe antigos, que guardavam uma cópia do
+    Pokémon: esses dados entram já vencidos, para a PokéAPI confirmar
+    depois; um Pokémon que já está no catálogo não é sobrescrito.
+    As rotas nunca gravam dados do cliente: resolvem o ID com get_pokemon.
+    """
+    row = db.session.get(Pokemon, record["id"])
+    if row is None:
+        # Nome já usado por outro ID (dado do cliente inconsistente)
+        if Pokemon.query.filter_by(name=record["name"]).first() is not None:
+            record = dict(record, name=f"{record['name']}-{record['id']}")
+        row = Pokemon.from_record(record)
+        row.fetched_at = 0
+        db.session.add(row)
+        CatalogVersion.bump()
+    return row
+
+
+def store_list(key, ids, row=None):
+    """Grava a lista de IDs de uma geração/tipo/página."""
+    if row is None:
+        row = db.session.get(PokemonList, key)
+    if row is None:
+        row = PokemonList(key=key)
+        db.session.add(row)
+    row.ids = json.dumps(ids)
+    row.fetched_at = time.time()
+
+    try:
+        CatalogVersion.bump()
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+    _bump_lists_version()
+
+
+def _bump_lists_version():
+    global _lists_version
+    _lists_version += 1
+
+
+def lists_version():
+    return _lists_version
+
+
+def generation_key(generation_id):
+    return f"generation/{generation_id}"
+
+
+def type_key(type_name):
+    return f"type/{type_name.lower()}"
+
+
+def is_list_fresh(key):
+    row = db.session.get(PokemonList, key)
+    return row is not None and is_fresh(row)
+
+
+def stale_names(keys, grace=False):
+    """
+    Nomes (ou IDs) que ainda não estão no catálogo ou já venceram
+    (com grace=True, só os vencidos além da tolerância do stale-while-revalidate).
+    """
+    keys = list(dict.fromkeys(str(k).lower() for k in keys))
+    ids = [int(k) for k in keys if k.isdigit()]
+    names = [k for k in keys if not k.isdigit()]
+
+    usable = is_servable if grace else is_fresh
+    fresh = set()
+    for p in Pokemon.query.filter(db.or_(Pokemon.id.in_(ids), Pokemon.name.in_(names))):
+        if usable(p):
+            fresh.update((str(p.id), p.name))
+    return [k for k in keys if k not in fresh]
+
+
+# ==========================================================
+# 🔍 Leitura com read-through
+# ==========================================================
+def get_pokemon(name_or_id):
+    """
+    Retorna o Pokemon do catálogo, buscando na PokéAPI se faltar ou
+    estiver vencido além da tolerância (vencido dentro dela: servido na
+    hora e renovado em segundo plano). Retorna None quando a PokéAPI
+    responde 404; StoreError se a resposta não pôde ser gravada.
+    """
+    key = str(name_or_id).lower()
+    if key.isdigit():
+        row = db.session.get(Pokemon, int(key))
+    else:
+        row = Pokemon.query.filter_by(name=key).first()
+
+    if row is not None and is_fresh(row):
+        metrics.catalog_lookup("pokemon", "hit")
+        return row
+    if row is not None and is_servable(row):
+        metrics.catalog_lookup("pokemon", "stale")
+        refresher.schedule("pokemon", row.id)
+        return row
+    if row is None and _is_missing(key):
+        metrics.catalog_lookup("pokemon", "negative")
+        return None
+    metrics.catalog_lookup("pokemon", "miss" if row is None else "expired")
+
+    import requests   # import tardio: só quando a PokéAPI é chamada
+
+    try:
+        response = pokeapi.get(f"{POKEMON_PATH}{key}", timeout=5)
+        if response.status_code == 404:
+            _mark_missing(key)
+            return None
+        response.raise_for_status()
+    except requests.exceptions.RequestException:
+        # PokéAPI fora do ar → serve o dado vencido, se houver
+        if row is not None:
+            return row
+        raise
+
+    record = normalize_pokemon(response.json())
+    rows = store_pokemon([record])
+    if rows:
+        return rows[0]
+    # Gravação perdeu para outro worker (ou falhou): vale o que está no banco
+    row = db.session.get(Pokemon, record["id"])
+    if row is None:
+        raise StoreError(f"Pokémon {record['id']} não pôde ser gravado no catálogo")
+    return row
+
+
+def iter_many(ids):
+    """
+    Gera as linhas de Pokemon dos IDs pedidos, sempre em ordem de ID:
+    cada Pokémon sai assim que ele e todos os anteriores estão prontos
+    (os do catálogo saem na hora). Só os IDs ausentes ou vencidos além
+    da tolerância vão para a PokéAPI, em paralelo; os vencidos dentro
+    dela saem do catálogo e são renovados em segundo plano. O valor de
+    retorno do gerador é `partial`.
+    """
+    ids = sorted({int(i) for i in ids})
+    if not ids:
+        return False
+
+    by_id = {p.id: p for p in Pokemon.query.filter(Pokemon.id.in_(ids))}
+    pending = {
+        i for i in ids
+        if (i not in by_id or not is_servable(by_id[i])) and not _is_missing(str(i))
+    }
+    stale = [i for i in ids if i in by_id and i not in pending and not is_fresh(by_id[i])]
+    expired = sum(1 for i in pending if i in by_id)
+    metrics.catalog_lookup("pokemon", "miss", len(pending) - expired)
+    metrics.catalog_lookup("pokemon", "expired", expired)
+    metrics.catalog_lookup("pokemon", "stale", len(stale))
+    metrics.catalog_lookup(
+        "pokemon", "hit", sum(1 for i in ids if i in by_id and i not in pending) - len(stale)
+    )
+    for i in stale:
+        refresher.schedule("pokemon", i)
+
+    position = 0
+    partial = False
+    records = []
+
+    def ready():
+        nonlocal position
+        while position < len(ids) and ids[position] not in pending:
+            row = by_id.get(ids[position])
+            position += 1
+            if row is not None:
+                yield row
+
+    try:
+        yield from ready()
+        if pending:
+            for path, record in iter_fetch_all(
+                [f"{POKEMON_PATH}{i}" for i in sorted(pending)],
+                normalize_pokemon,
+                max_workers=current_app.config["POKEAPI_MAX_WORKERS"],
+                deadline=current_app.config["POKEAPI_DEADLINE"],
+            ):
+                key = path[len(POKEMON_PATH):]
+                pending.discard(int(key))
+                if record is FAILED:
+                    # Sem PokéAPI → fica o dado vencido, se houver
+                    partial = True
+                elif record is None:
+                    _mark_missing(key)
+                else:
+                    records.append(record)
+                    by_id[record["id"]] = Pokemon.from_record(record)
+                yield from ready()
+    finally:
+        # Grava mesmo se o cliente do streaming desconectar no meio
+        store_pokemon(records)
+
+    return partial
+
+
+def get_many(ids):
+    """Versão em lista de iter_many. Retorna (linhas, partial)."""
+    rows = []
+    stream = iter_many(ids)
+    while True:
+        try:
+            rows.append(next(stream))
+        except StopIteration as stop:
+            return rows, bool(stop.value)
+
+
+def _get_list(key, path, extract):
+    """Lista de IDs (geração/tipo/página) com o mesmo TTL do catálogo."""
+    row = db.session.get(PokemonList, key)
+    if row is not None and is_fresh(row):
+        metrics.catalog_lookup("list", "hit")
+        return json.loads(row.ids)
+    if row is not None and is_servable(row):
+        metrics.catalog_lookup("list", "stale")
+        refresher.schedule("list", key)
+        return json.loads(row.ids)
+    metrics.catalog_lookup("list", "miss" if row is None else "expired")
+
+    import requests   # import tardio (ver get_pokemon)
+
+    try:
+        response = pokeapi.get(path, timeout=5)
+        response.raise_for_status()
+    except requests.exceptions.RequestException:
+        if row is not None:
+            return json.loads(row.ids)
+        raise
+
+    ids = extract(response.json())
+    store_list(key, ids, row)
+    return ids
+
+
+def list_source(key):
+    """(caminho na PokéAPI, extrator de IDs) de uma lista do catálogo."""
+    if key == ALL_KEY:
+        return "pokemon?limit=100000&offset=0", page_ids
+    kind, _, name = key.partition("/")
+    if kind == "generation":
+        return f"generation/{name}", generation_ids
+    return f"type/{name}", type_ids
+
+
+def all_members():
+    """Todos os Pokémon da PokéAPI (um único GET, em cache como os demais)."""
+    return _get_list(ALL_KEY, *list_source(ALL_KEY))
+
+
+def generation_members(generation_id):
+    key = generation_key(generation_id)
+    return _get_list(key, *list_source(key))
+
+
+def type_members(type_name):
+    key = type_key(type_name)
+    return _get_list(key, *list_source(key))
+
+
+# ==========================================================
+# ♻️ Renovação em segundo plano (jobs do refresher)
+# ==========================================================
+def refresh_pokemon(pokemon_id):
+    """Busca e grava um Pokémon. Devolve o resultado do job (ok/not_found/skipped)."""
+    row = db.session.get(Pokemon, pokemon_id)
+    if row is not None and is_fresh(row):
+        return "skipped"   # outro worker já renovou
+    response = pokeapi.get(f"{POKEMON_PATH}{pokemon_id}", timeout=5)
+    if response.status_code == 404:
+        _mark_missing(str(pokemon_id))
+        return "not_found"
+    response.raise_for_status()
+    store_pokemon([normalize_pokemon(response.json())])
+    return "ok"
+
+
+def refresh_list(key):
+    """Busca e grava uma lista (geração/tipo/todos)."""
+    row = db.session.get(PokemonList, key)
+    if row is not None and is_fresh(row):
+        return "skipped"
+    path, extract = list_source(key)
+    response = pokeapi.get(path, timeout=5)
+    if response.status_code == 404:
+        return "not_found"
+    response.raise_for_status()
+    store_list(key, extract(response.json()), row)
+    return "ok"
+
+
+# ==========================================================
+# ⚡ Pré-busca (caminho assíncrono, asgi.py)
+# ==========================================================
+# O asgi.py busca na PokéAPI fora das threads e grava aqui; depois a rota
+# Flask encontra tudo fresco no catálogo e não faz nenhuma chamada de rede.
+def stale_list_keys(keys):
+    """Chaves de lista que o read-through buscaria na hora (sem linha servível)."""
+    keys = list(dict.fromkeys(keys))
+    fresh = {
+        row.key for row in PokemonList.query.filter(PokemonList.key.in_(keys))
+        if is_servable(row)
+    }
+    return [k for k in keys if k not in fresh]
+
+
+def pending_ids(ids):
+    """IDs que o read-through buscaria na hora na PokéAPI (ausentes ou vencidos além da tolerância)."""
+    ids = sorted({int(i) for i in ids})
+    fresh = {p.id for p in Pokemon.query.filter(Pokemon.id.in_(ids)) if is_servable(p)}
+    return [i for i in ids if i not in fresh and not _is_missing(str(i))]
+
+
+def store_fetched_list(key, body):
+    """Grava uma lista baixada (corpo JSON cru da PokéAPI)."""
+    _, extract = list_source(key)
+    store_list(key, extract(json.loads(body)))
+
+
+def store_fetched_pokemon(bodies):
+    """
+    Grava Pokémon baixados: {chave: corpo JSON cru, ou None se 404}.
+    O parse acontece aqui (thread), não no loop de eventos.
+    """
+    records = []
+    for key, body in bodies.items():
+        if body is None:
+            _mark_missing(str(key).lower())
+        else:
+            records.append(normalize_pokemon(json.loads(body)))
+    store_pokemon(records)
+
+
+# ==========================================================
+# ♻️ Invalidação explícita
+# ==========================================================
+def invalidate(name_or_id=None):
+    """
+    Marca entradas como vencidas (sem apagar: continuam servindo de
+    reserva se a PokéAPI cair). Sem argumento, invalida tudo.
+    """
+    if name_or_id is None:
+        Pokemon.query.update({Pokemon.fetched_at: 0})
+        PokemonList.query.update({PokemonList.fetched_at: 0})
+        _missing.clear()
+        _bump_lists_version()
+    else:
+        key = str(name_or_id).lower()
+        column = Pokemon.id if key.isdigit() else Pokemon.name
+        value = int(key) if key.isdigit() else key
+        Pokemon.query.filter(column == value).update({Pokemon.fetched_at: 0})
+        _missing.pop(key, None)
+    CatalogVersion.bump()
+    db.session.commit()
+
+
+# ==========================================================
+# 🏷️ Versão do catálogo (base dos ETags)
+# ==========================================================
+def catalog_version():
+    """
+    Muda sempre que algum Pokémon/lista é gravado ou invalidado (o
+    contador sobe na mesma transação, inclusive ao invalidar um só).
+    Vale entre workers: vem do banco, não da memória do processo, e custa
+    uma leitura pela chave primária.
+    """
+    return CatalogVersion.current()
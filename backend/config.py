@@ -1,11 +1,130 @@
 import os
 from datetime import timedelta
 
+
+def _database_url():
+    # Render/Heroku ainda entregam "postgres://", que o SQLAlchemy 2 recusa
+    url = os.environ.get("DATABASE_URL") or "sqlite:///db.sqlite3"
+    if url.startswith("postgres://"):
+        url = "postgresql://" + url[len("postgres://"):]
+    return url
+
+
+def _engine_options(url):
+    if url.startswith("sqlite"):
+        # PRAGMAs (WAL, busy_timeout...) são aplicados por conexão em database.init_db
+        return {}
+    return {
+        "pool_size": int(os.environ.get("DB_POOL_SIZE", 10)),
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", 20)),
+        "pool_timeout": int(os.environ.get("DB_POOL_TIMEOUT", 10)),
+        "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", 1800)),
+        "pool_pre_ping": True,
+    }
+
+
 class Config:
     SECRET_KEY = os.environ.get("SECRET_KEY") or "chave-secreta-teste"
-    SQLALCHEMY_DATABASE_URI = 'sqlite:///db.sqlite3'
+    # 🗄️ Banco: DATABASE_URL (Postgres etc.) ou o SQLite local
+    SQLALCHEMY_DATABASE_URI = _database_url()
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options(SQLALCHEMY_DATABASE_URI)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # ⚡ SQLite: WAL + synchronous=NORMAL, espera por lock e mmap
+    SQLITE_JOURNAL_MODE = os.environ.get("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", 5000))
+    SQLITE_MMAP_SIZE = int(os.environ.get("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
     JWT_SECRET_KEY = "chave-jwt-super-secreta"
     
     # ✅ Adicione esta linha:
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=2)
+
+    # 👤 Cache de identidade (campos públicos do usuário, por processo)
+    IDENTITY_CACHE_TTL = float(os.environ.get("IDENTITY_CACHE_TTL", 60))
+    IDENTITY_CACHE_SIZE = int(os.environ.get("IDENTITY_CACHE_SIZE", 4096))
+
+    # 🌐 Cliente da PokéAPI (pool, retentativas, circuit breaker)
+    POKEAPI_URL = os.environ.get("POKEAPI_URL", "https://pokeapi.co/api/v2/")
+    POKEAPI_POOL_SIZE = int(os.environ.get("POKEAPI_POOL_SIZE", 32))
+    POKEAPI_RETRIES = int(os.environ.get("POKEAPI_RETRIES", 2))
+    POKEAPI_RETRY_BACKOFF = float(os.environ.get("POKEAPI_RETRY_BACKOFF", 0.2))
+    POKEAPI_BREAKER_THRESHOLD = int(os.environ.get("POKEAPI_BREAKER_THRESHOLD", 5))
+    POKEAPI_BREAKER_COOLDOWN = float(os.environ.get("POKEAPI_BREAKER_COOLDOWN", 30))
+    # Teto de requisições/s à PokéAPI (por processo; 0 = sem teto). Quem
+    # precisaria esperar mais que POKEAPI_RATE_MAX_WAIT falha na hora
+    POKEAPI_RATE_LIMIT = float(os.environ.get("POKEAPI_RATE_LIMIT", 0))
+    POKEAPI_RATE_BURST = int(os.environ.get("POKEAPI_RATE_BURST", 20))
+    POKEAPI_RATE_MAX_WAIT = float(os.environ.get("POKEAPI_RATE_MAX_WAIT", 2))
+
+    # 🚀 Busca paralela na PokéAPI (/pokemon/filter)
+    POKEAPI_MAX_WORKERS = int(os.environ.get("POKEAPI_MAX_WORKERS", 16))
+    POKEAPI_DEADLINE = float(os.environ.get("POKEAPI_DEADLINE", 20))
+
+    # 📚 Catálogo local (segundos)
+    CATALOG_TTL = int(os.environ.get("CATALOG_TTL", 7 * 24 * 3600))
+    CATALOG_MISS_TTL = int(os.environ.get("CATALOG_MISS_TTL", 3600))
+    # Vencido há menos que isso: servido na hora e renovado em segundo plano
+    CATALOG_STALE_GRACE = int(os.environ.get("CATALOG_STALE_GRACE", 24 * 3600))
+    # Refresher: threads por processo, fila máxima e requisições/s à PokéAPI
+    REFRESH_WORKERS = int(os.environ.get("REFRESH_WORKERS", 2))
+    REFRESH_QUEUE_MAX = int(os.environ.get("REFRESH_QUEUE_MAX", 1000))
+    REFRESH_RATE_LIMIT = float(os.environ.get("REFRESH_RATE_LIMIT", 5))
+    POKEDEX_INDEX_MAX_AGE = int(os.environ.get("POKEDEX_INDEX_MAX_AGE", 60))
+    FILTER_MAX_LIMIT = int(os.environ.get("FILTER_MAX_LIMIT", 500))
+    SIMILAR_MAX_K = int(os.environ.get("SIMILAR_MAX_K", 50))
+    # Autocomplete: idade máxima do índice de nomes (s) e máximo de sugestões
+    AUTOCOMPLETE_MAX_AGE = int(os.environ.get("AUTOCOMPLETE_MAX_AGE", 60))
+    AUTOCOMPLETE_MAX_LIMIT = int(os.environ.get("AUTOCOMPLETE_MAX_LIMIT", 20))
+
+    # 🏷️ Cache HTTP das rotas da Pokédex (segundos)
+    POKEDEX_CACHE_MAX_AGE = int(os.environ.get("POKEDEX_CACHE_MAX_AGE", 300))
+
+    # 📦 Lote de operações em favoritos/equipe (/batch)
+    LIST_BATCH_MAX_OPS = int(os.environ.get("LIST_BATCH_MAX_OPS", 100))
+    # Máximo de sugestões em /api/equipe/analysis?suggest=N
+    TEAM_SUGGEST_MAX = int(os.environ.get("TEAM_SUGGEST_MAX", 20))
+
+    # 👥 Listagem de usuários (admin): tamanho de página
+    USERS_PAGE_SIZE = int(os.environ.get("USERS_PAGE_SIZE", 100))
+    USERS_MAX_LIMIT = int(os.environ.get("USERS_MAX_LIMIT", 500))
+    # ?count=1 conta no máximo isso (acima: X-Total-Count-Exact: false)
+    USERS_COUNT_CAP = int(os.environ.get("USERS_COUNT_CAP", 10000))
+
+    # 🖼️ Proxy de sprites (cache em disco; padrão: <instance>/sprites)
+    SPRITE_CACHE_DIR = os.environ.get("SPRITE_CACHE_DIR")
+    SPRITE_CACHE_MAX_BYTES = int(os.environ.get("SPRITE_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+    SPRITE_SIZES = tuple(int(s) for s in os.environ.get("SPRITE_SIZES", "48,96").split(",") if s)
+    # Curto: a URL /sprites/<id> é fixa; depois disso o navegador revalida pelo ETag
+    SPRITE_MAX_AGE = int(os.environ.get("SPRITE_MAX_AGE", 24 * 3600))
+    SPRITE_SOURCE_HOSTS = tuple(os.environ.get("SPRITE_SOURCE_HOSTS", "raw.githubusercontent.com").split(","))
+    SPRITE_MAX_SOURCE_BYTES = int(os.environ.get("SPRITE_MAX_SOURCE_BYTES", 2 * 1024 * 1024))
+
+    # 📈 /metrics (Prometheus): se definido, exige "Authorization: Bearer <token>"
+    METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+
+    # 🔬 Perfil de requisições (X-Profile: 1 de admin; amostragem opcional)
+    PROFILE_DIR = os.environ.get("PROFILE_DIR")
+    PROFILE_RING_SIZE = int(os.environ.get("PROFILE_RING_SIZE", 50))
+    PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", 0))
+    PROFILE_INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL_MS", 5))
+    PROFILE_MAX_SECONDS = float(os.environ.get("PROFILE_MAX_SECONDS", 30))
+
+    # ⚡ Entrada ASGI (uvicorn asgi:app): threads do Flask e conexões do aiohttp
+    ASGI_THREADS = int(os.environ.get("ASGI_THREADS", 32))
+    POKEAPI_ASYNC_POOL_SIZE = int(os.environ.get("POKEAPI_ASYNC_POOL_SIZE", 100))
+
+    # 🗜️ Compressão das respostas JSON (gzip/brotli) acima deste tamanho
+    COMPRESS_MIN_BYTES = int(os.environ.get("COMPRESS_MIN_BYTES", 1024))
+    COMPRESS_LEVEL = int(os.environ.get("COMPRESS_LEVEL", 6))
+    COMPRESS_BR_QUALITY = int(os.environ.get("COMPRESS_BR_QUALITY", 4))
+
+    # 🚦 Controle de admissão (por worker): rotas da PokéAPI × o resto.
+    #    Limite 0 = sem limite. Com gunicorn: upstream limite + fila < --threads.
+    #    Sob asgi:app o orçamento upstream fica desligado (admission.use_asgi)
+    ADMISSION_UPSTREAM_LIMIT = int(os.environ.get("ADMISSION_UPSTREAM_LIMIT", 4))
+    ADMISSION_UPSTREAM_QUEUE = int(os.environ.get("ADMISSION_UPSTREAM_QUEUE", 2))
+    ADMISSION_DEFAULT_LIMIT = int(os.environ.get("ADMISSION_DEFAULT_LIMIT", 0))
+    ADMISSION_DEFAULT_QUEUE = int(os.environ.get("ADMISSION_DEFAULT_QUEUE", 0))
+    ADMISSION_QUEUE_TIMEOUT = float(os.environ.get("ADMISSION_QUEUE_TIMEOUT", 1))
+    ADMISSION_RETRY_AFTER = int(os.environ.get("ADMISSION_RETRY_AFTER", 2))
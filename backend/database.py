@@ -1,3 +1,41 @@
+# database.py
+"""
+Instância do SQLAlchemy e ajuste do engine.
+
+No SQLite, cada conexão nova recebe os PRAGMAs de produção:
+- journal_mode=WAL: leitores não bloqueiam o escritor (e vice-versa)
+- synchronous=NORMAL: fsync só no checkpoint (seguro com WAL)
+- busy_timeout: espera o lock em vez de falhar com "database is locked"
+- mmap_size: leituras direto do page cache do SO
+"""
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
 
 db = SQLAlchemy()
+
+
+def sqlite_pragmas(config):
+    return [
+        f"PRAGMA journal_mode={config['SQLITE_JOURNAL_MODE']}",
+        f"PRAGMA synchronous={config['SQLITE_SYNCHRONOUS']}",
+        f"PRAGMA busy_timeout={int(config['SQLITE_BUSY_TIMEOUT_MS'])}",
+        f"PRAGMA mmap_size={int(config['SQLITE_MMAP_SIZE'])}",
+    ]
+
+
+def init_db(app):
+    db.init_app(app)
+
+    with app.app_context():
+        engine = db.engine
+        if engine.dialect.name != "sqlite":
+            return
+
+        pragmas = sqlite_pragmas(app.config)
+
+        @event.listens_for(engine, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            cursor.close()
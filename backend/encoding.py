@@ -0,0 +1,133 @@
+# encoding.py
+"""
+Codificação das respostas: JSON rápido, projeção de campos e compressão.
+
+- JSON com orjson (opcional; sem ele, o provider padrão do Flask)
+- ?fields=id,name,types → só esses campos em cada item (listas e detalhe)
+- gzip/brotli conforme o Accept-Encoding, acima de COMPRESS_MIN_BYTES;
+  o ETag vira fraco (W/"...") na resposta comprimida, como no nginx
+"""
+import gzip
+import json
+
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:   # orjson é opcional: sem ele, o json da stdlib
+    orjson = None
+
+try:
+    import brotli
+except ImportError:   # brotli é opcional: sem ele, só gzip
+    brotli = None
+
+COMPRESSIBLE = {"application/json", "text/plain", "text/html", "text/csv", "application/xml"}
+
+
+# ==========================================================
+# ⚡ JSON (orjson)
+# ==========================================================
+class OrjsonProvider(DefaultJSONProvider):
+    """Mesma interface do provider do Flask, serializando com orjson."""
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # Opções da stdlib (indent, sort_keys...) → caminho padrão
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        # Bytes direto do orjson, sem passar por str
+        body = orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def dumps(obj):
+    """JSON em str (linhas do ndjson), com orjson quando disponível."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj)
+
+
+# ==========================================================
+# ✂️ Projeção (?fields=)
+# ==========================================================
+def requested_fields():
+    """Campos pedidos em ?fields=a,b (tupla, na ordem pedida) ou None = todos."""
+    raw = request.args.get("fields", "")
+    fields = tuple(dict.fromkeys(f.strip() for f in raw.split(",") if f.strip()))
+    return fields or None
+
+
+def project(item, fields):
+    if fields is None:
+        return item
+    return {key: item[key] for key in fields if key in item}
+
+
+def project_all(items, fields):
+    if fields is None:
+        return items
+    return [project(item, fields) for item in items]
+
+
+# ==========================================================
+# 🗜️ Compressão
+# ==========================================================
+def _choose_encoding():
+    offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return request.accept_encodings.best_match(offered)
+
+
+def compress(response, config):
+    if response.status_code == 304 and response.mimetype in COMPRESSIBLE:
+        # O 304 repete o Vary que o 200 teria (RFC 9110 §15.4.5)
+        response.vary.add("Accept-Encoding")
+        return response
+    if (
+        response.direct_passthrough          # send_file (sprites)
+        or response.is_streamed              # ndjson: sai em partes
+        or response.status_code < 200
+        or response.status_code in (204, 304)
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    data = response.get_data()
+    if len(data) < config["COMPRESS_MIN_BYTES"]:
+        return response
+
+    encoding = _choose_encoding()
+    if encoding == "br":
+        data = brotli.compress(data, quality=config["COMPRESS_BR_QUALITY"])
+    elif encoding == "gzip":
+        data = gzip.compress(data, compresslevel=config["COMPRESS_LEVEL"], mtime=0)
+    else:
+        return response
+
+    response.set_data(data)
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        # Outros bytes, mesmo conteúdo → validador fraco
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_app(app):
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
+
+    @app.after_request
+    def _compress(response):
+        return compress(response, app.config)
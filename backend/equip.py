@@ -1,20 +1,27 @@
 # equip.py
-from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import db, Equip, User
-import json
+from flask import Blueprint, current_app, jsonify, request
+from flask_jwt_extended import jwt_required
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from models import db, Equip, ListVersion, Pokemon
+import catalog
+import encoding
+import http_cache
+import identity
+import user_lists
 
 equip_bp = Blueprint('equip', __name__, url_prefix="/api/equipe")
 
+MAX_EQUIPE = 6
+LIMIT_MSG = "Você já possui 6 Pokémon na sua equipe. Remova um antes de adicionar outro."
+
 # ==========================================================
 # 🔐 Helper — obtém usuário autenticado
 # ==========================================================
-def get_user():
-    try:
-        current_user_id = int(get_jwt_identity())
-        return User.query.get(current_user_id)
-    except Exception:
-        return None
+def get_user_id():
+    # Cache de identidade: sem consulta à tabela users no caminho quente
+    found = identity.current_identity()
+    return found["id"] if found else None
 
 # ==========================================================
 # ⚙️ GET /api/equipe/
@@ -26,26 +33,96 @@ def get_equipe():
     if request.method == "OPTIONS":
         return jsonify({"msg": "ok"}), 200
 
-    user = get_user()
-    if not user:
+    user_id = get_user_id()
+    if user_id is None:
         return jsonify({"msg": "Usuário não encontrado"}), 404
 
-    equipe = Equip.query.filter_by(user_id=user.id).all()
+    # ?fields=id,name,types,sprite → só o que a tela usa
+    fields = encoding.requested_fields()
+    with_abilities = fields is None or "abilities" in fields
+
+    # 🏷️ ETag pela versão da lista (+ catálogo) → 304 sem ler/serializar as linhas
+    etag = http_cache.make_etag(
+        "equipe", user_id, ListVersion.current(user_id, "equipe"), catalog.catalog_version(), fields
+    )
+    response = http_cache.not_modified(etag, http_cache.PRIVATE_CACHE_CONTROL, vary="Authorization")
+    if response is not None:
+        return response
+
+    # Um único JOIN pelo índice (user_id, pokemon_id) + habilidades em lote
+    # (só se foram pedidas)
+    query = (
+        Pokemon.query
+        .join(Equip, Equip.pokemon_id == Pokemon.id)
+        .filter(Equip.user_id == user_id)
+        .order_by(Equip.position, Equip.id)
+    )
+    if with_abilities:
+        query = query.options(selectinload(Pokemon.ability_rows))
+
+    rows = query.all()
+    # Linhas vencidas (ou só com o nome, vindas da migração) → renovadas
+    # em segundo plano; a resposta não espera a PokéAPI
+    catalog.refresh_stale(rows)
 
     results = []
-    for e in equipe:
-        results.append({
-            "id": e.pokemon_id,
-            "name": e.pokemon_name,
-            "sprite_url": e.pokemon_image or "",
-            "height": e.height or 0,
-            "weight": e.weight or 0,
-            "abilities": json.loads(e.abilities or "[]"),
-            "stats": json.loads(e.stats or "{}"),
-            "types": json.loads(e.types or "[]"),
-        })
-
-    return jsonify(results), 200
+    for p in rows:
+        item = p.to_detail(abilities=with_abilities)
+        item.update(sprite_url=p.sprite_url or "", height=p.height or 0, weight=p.weight or 0)
+        results.append(encoding.project(item, fields))
+
+    return http_cache.cached(
+        (jsonify(results), 200), etag, http_cache.PRIVATE_CACHE_CONTROL, vary="Authorization"
+    )
+
+# ==========================================================
+# 📊 GET /api/equipe/analysis
+# Fraquezas/resistências, cobertura ofensiva, stats da equipe e
+# os melhores candidatos do catálogo para a próxima vaga (?suggest=N)
+# ==========================================================
+@equip_bp.route("/analysis", methods=["GET", "OPTIONS"])
+@jwt_required()
+def get_equipe_analysis():
+    if request.method == "OPTIONS":
+        return jsonify({"msg": "ok"}), 200
+
+    user_id = get_user_id()
+    if user_id is None:
+        return jsonify({"msg": "Usuário não encontrado"}), 404
+
+    try:
+        suggest = int(request.args.get("suggest", 5))
+    except ValueError:
+        return jsonify({"msg": "suggest inválido"}), 400
+    suggest = max(0, min(suggest, current_app.config["TEAM_SUGGEST_MAX"]))
+
+    version = catalog.catalog_version()
+    etag = http_cache.make_etag(
+        "equipe-analysis", user_id, ListVersion.current(user_id, "equipe"), version, suggest
+    )
+    response = http_cache.not_modified(etag, http_cache.PRIVATE_CACHE_CONTROL, vary="Authorization")
+    if response is not None:
+        return response
+
+    import team_analysis   # import tardio: o NumPy fica fora do boot do worker
+
+    ids = [
+        pokemon_id for (pokemon_id,) in
+        Equip.query.filter_by(user_id=user_id)
+        .order_by(Equip.position, Equip.id)
+        .with_entities(Equip.pokemon_id)
+    ]
+    team = team_analysis.team_matrices(ids)
+    result = team_analysis.analyse(team)
+    # Equipe cheia: não há vaga para sugerir
+    result["suggestions"] = (
+        team_analysis.suggest(team, team_analysis.catalog_matrices(version), suggest)
+        if len(ids) < MAX_EQUIPE else []
+    )
+
+    return http_cache.cached(
+        (jsonify(result), 200), etag, http_cache.PRIVATE_CACHE_CONTROL, vary="Authorization"
+    )
 
 # ==========================================================
 # ➕ POST /api/equipe/
@@ -57,53 +134,44 @@ def add_to_equipe():
     if request.method == "OPTIONS":
         return jsonify({"msg": "ok"}), 200
 
-    user = get_user()
-    if not user:
+    user_id = get_user_id()
+    if user_id is None:
         return jsonify({"msg": "Usuário não encontrado"}), 404
 
     data = request.get_json(silent=True) or {}
 
-    pokemon_id = data.get("pokemon_id") or data.get("id")
-    pokemon_name = data.get("pokemon_name") or data.get("name")
-    pokemon_image = data.get("sprite_url") or data.get("pokemon_image")
-    height = data.get("height")
-    weight = data.get("weight")
-    abilities = data.get("abilities") or []
-    stats = data.get("stats") or {}
-    types = data.get("types") or []
-
-    if not pokemon_id or not pokemon_name:
-        return jsonify({"msg": "Nome e ID do Pokémon são obrigatórios"}), 400
-
-    # ✅ verifica se já tem 6 Pokémon
-    equipe_atual = Equip.query.filter_by(user_id=user.id).count()
-    if equipe_atual >= 6:
-    # Limite de 6
-        if Equip.query.filter_by(user_id=user.id).count() >= 6:
-         return jsonify({"msg": "Você já possui 6 Pokémon na sua equipe. Remova um antes de adicionar outro."}), 400
+    pokemon_id = user_lists.payload_id(data)
+    if pokemon_id is None:
+        return jsonify({"msg": "ID do Pokémon é obrigatório"}), 400
+
+    # ✅ Limite de 6 (contagem pelo índice user_id + pokemon_id)
+    if Equip.query.filter_by(user_id=user_id).count() >= MAX_EQUIPE:
+        return jsonify({"msg": LIMIT_MSG}), 400
     # Evita duplicidade
-    if Equip.query.filter_by(user_id=user.id, pokemon_id=pokemon_id).first():
+    if Equip.query.filter_by(user_id=user_id, pokemon_id=pokemon_id).first():
         return jsonify({"msg": "Pokémon já está na equipe"}), 400
-    
+
+    # Só o ID vale: o Pokémon vem do catálogo (PokéAPI), nunca do corpo
+    pokemon, error = user_lists.lookup_pokemon(pokemon_id)
+    if error is not None:
+        return error
+
     try:
-        equip = Equip(
-            user_id=user.id,
-            pokemon_id=pokemon_id,
-            pokemon_name=pokemon_name,
-            pokemon_image=pokemon_image,
-            height=height,
-            weight=weight,
-            abilities=json.dumps(abilities),
-            stats=json.dumps(stats),
-            types=json.dumps(types),
-        )
-        db.session.add(equip)
+        db.session.add(Equip(
+            user_id=user_id, pokemon_id=pokemon_id,
+            position=user_lists.next_position(Equip, user_id),
+        ))
+        ListVersion.bump(user_id, "equipe")
         db.session.commit()
+    except IntegrityError:
+        # Requisição simultânea já gravou o mesmo Pokémon
+        db.session.rollback()
+        return jsonify({"msg": "Pokémon já está na equipe"}), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({"msg": f"Erro ao salvar na equipe: {str(e)}"}), 400
 
-    return jsonify({"msg": f"{pokemon_name} adicionado à equipe!"}), 201
+    return jsonify({"msg": f"{pokemon.name.capitalize()} adicionado à equipe!"}), 201
 
 # ==========================================================
 # 🗑️ DELETE /api/equipe/<id>
@@ -115,14 +183,55 @@ def remove_from_equipe(pokemon_id):
     if request.method == "OPTIONS":
         return jsonify({"msg": "ok"}), 200
 
-    user = get_user()
-    if not user:
+    user_id = get_user_id()
+    if user_id is None:
         return jsonify({"msg": "Usuário não encontrado"}), 404
 
-    equipe_item = Equip.query.filter_by(user_id=user.id, pokemon_id=pokemon_id).first()
+    equipe_item = Equip.query.filter_by(user_id=user_id, pokemon_id=pokemon_id).first()
     if not equipe_item:
         return jsonify({"msg": "Pokémon não encontrado na equipe"}), 404
 
     db.session.delete(equipe_item)
+    ListVersion.bump(user_id, "equipe")
     db.session.commit()
     return jsonify({"msg": "Pokémon removido da equipe!"}), 200
+
+
+# ==========================================================
+# 🧢 POST /api/equipe/batch
+# Aplica várias operações na equipe numa única transação
+# (add / remove / reorder; tudo ou nada, com resultado por item)
+# ==========================================================
+@equip_bp.route("/batch", methods=["POST", "OPTIONS"])
+@jwt_required()
+def batch_equipe():
+    if request.method == "OPTIONS":
+        return jsonify({"msg": "ok"}), 200
+
+    user_id = get_user_id()
+    if user_id is None:
+        return jsonify({"msg": "Usuário não encontrado"}), 404
+
+    data = request.get_json(silent=True) or {}
+    ops = data.get("ops") if isinstance(data, dict) else None
+    if not isinstance(ops, list) or not ops:
+        return jsonify({"msg": "Envie 'ops' com ao menos uma operação"}), 400
+    max_ops = current_app.config["LIST_BATCH_MAX_OPS"]
+    if len(ops) > max_ops:
+        return jsonify({"msg": f"Máximo de {max_ops} operações por lote"}), 400
+
+    try:
+        results, applied = user_lists.apply_batch(
+            Equip, user_id, "equipe", ops, "na equipe", limit=MAX_EQUIPE, limit_msg=LIMIT_MSG
+        )
+    except IntegrityError:
+        # Requisição simultânea alterou a mesma lista
+        db.session.rollback()
+        return jsonify({"msg": "A lista mudou durante o lote, tente novamente"}), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"msg": f"Erro ao aplicar o lote: {str(e)}"}), 400
+
+    if not applied:
+        return jsonify({"msg": "Nenhuma alteração aplicada", "applied": False, "results": results}), 400
+    return jsonify({"msg": "Lote aplicado!", "applied": True, "results": results}), 200
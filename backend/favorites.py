@@ -1,8 +1,14 @@
 # favorites.py
-from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import db, Favorites, User
-import json
+from flask import Blueprint, current_app, jsonify, request
+from flask_jwt_extended import jwt_required
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from models import db, Favorites, ListVersion, Pokemon
+import catalog
+import encoding
+import http_cache
+import identity
+import user_lists
 
 favorites_bp = Blueprint("favorites", __name__, url_prefix="/api/favorites")
 
@@ -10,12 +16,10 @@ favorites_bp = Blueprint("favorites", __name__, url_prefix="/api/favorites")
 # ==========================================================
 # 🔐 Helper — obtém usuário autenticado
 # ==========================================================
-def get_user():
-    try:
-        current_user_id = int(get_jwt_identity())
-        return User.query.get(current_user_id)
-    except Exception:
-        return None
+def get_user_id():
+    # Cache de identidade: sem consulta à tabela users no caminho quente
+    found = identity.current_identity()
+    return found["id"] if found else None
 
 
 # ==========================================================
@@ -28,26 +32,47 @@ def get_favorites():
     if request.method == "OPTIONS":
         return jsonify({"msg": "ok"}), 200
 
-    user = get_user()
-    if not user:
+    user_id = get_user_id()
+    if user_id is None:
         return jsonify({"msg": "Usuário não encontrado"}), 404
 
-    favorites = Favorites.query.filter_by(user_id=user.id).all()
+    # ?fields=id,name,types,sprite → só o que a tela usa
+    fields = encoding.requested_fields()
+    with_abilities = fields is None or "abilities" in fields
+
+    # 🏷️ ETag pela versão da lista (+ catálogo) → 304 sem ler/serializar as linhas
+    etag = http_cache.make_etag(
+        "favorites", user_id, ListVersion.current(user_id, "favorites"), catalog.catalog_version(), fields
+    )
+    response = http_cache.not_modified(etag, http_cache.PRIVATE_CACHE_CONTROL, vary="Authorization")
+    if response is not None:
+        return response
+
+    # Um único JOIN pelo índice (user_id, pokemon_id) + habilidades em lote
+    # (só se foram pedidas)
+    query = (
+        Pokemon.query
+        .join(Favorites, Favorites.pokemon_id == Pokemon.id)
+        .filter(Favorites.user_id == user_id)
+        .order_by(Favorites.position, Favorites.id)
+    )
+    if with_abilities:
+        query = query.options(selectinload(Pokemon.ability_rows))
+
+    rows = query.all()
+    # Linhas vencidas (ou só com o nome, vindas da migração) → renovadas
+    # em segundo plano; a resposta não espera a PokéAPI
+    catalog.refresh_stale(rows)
 
     results = []
-    for f in favorites:
-        results.append({
-            "id": f.pokemon_id,
-            "name": f.pokemon_name,
-            "sprite_url": f.pokemon_image or "",
-            "height": f.height or 0,
-            "weight": f.weight or 0,
-            "abilities": json.loads(f.abilities or "[]"),
-            "stats": json.loads(f.stats or "{}"),
-            "types": json.loads(f.types or "[]"),
-        })
+    for p in rows:
+        item = p.to_detail(abilities=with_abilities)
+        item.update(sprite_url=p.sprite_url or "", height=p.height or 0, weight=p.weight or 0)
+        results.append(encoding.project(item, fields))
 
-    return jsonify(results), 200
+    return http_cache.cached(
+        (jsonify(results), 200), etag, http_cache.PRIVATE_CACHE_CONTROL, vary="Authorization"
+    )
 
 
 # ==========================================================
@@ -60,47 +85,41 @@ def add_favorite():
     if request.method == "OPTIONS":
         return jsonify({"msg": "ok"}), 200
 
-    user = get_user()
-    if not user:
+    user_id = get_user_id()
+    if user_id is None:
         return jsonify({"msg": "Usuário não encontrado"}), 404
 
     data = request.get_json(silent=True) or {}
 
-    pokemon_id = data.get("pokemon_id") or data.get("id")
-    pokemon_name = data.get("pokemon_name") or data.get("name")
-    pokemon_image = data.get("sprite_url") or data.get("pokemon_image")
-    height = data.get("height")
-    weight = data.get("weight")
-    abilities = data.get("abilities") or []
-    stats = data.get("stats") or {}
-    types = data.get("types") or []
-
-    if not pokemon_id or not pokemon_name:
-        return jsonify({"msg": "Nome e ID do Pokémon são obrigatórios"}), 400
+    pokemon_id = user_lists.payload_id(data)
+    if pokemon_id is None:
+        return jsonify({"msg": "ID do Pokémon é obrigatório"}), 400
 
-    # Evita duplicidade
-    if Favorites.query.filter_by(user_id=user.id, pokemon_id=pokemon_id).first():
+    # Evita duplicidade (consulta pelo índice único)
+    if Favorites.query.filter_by(user_id=user_id, pokemon_id=pokemon_id).first():
         return jsonify({"msg": "Pokémon já está nos favoritos"}), 400
 
+    # Só o ID vale: o Pokémon vem do catálogo (PokéAPI), nunca do corpo
+    pokemon, error = user_lists.lookup_pokemon(pokemon_id)
+    if error is not None:
+        return error
+
     try:
-        fav = Favorites(
-            user_id=user.id,
-            pokemon_id=pokemon_id,
-            pokemon_name=pokemon_name,
-            pokemon_image=pokemon_image,
-            height=height,
-            weight=weight,
-            abilities=json.dumps(abilities),
-            stats=json.dumps(stats),
-            types=json.dumps(types),
-        )
-        db.session.add(fav)
+        db.session.add(Favorites(
+            user_id=user_id, pokemon_id=pokemon_id,
+            position=user_lists.next_position(Favorites, user_id),
+        ))
+        ListVersion.bump(user_id, "favorites")
         db.session.commit()
+    except IntegrityError:
+        # Requisição simultânea já gravou o mesmo favorito
+        db.session.rollback()
+        return jsonify({"msg": "Pokémon já está nos favoritos"}), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({"msg": f"Erro ao salvar favorito: {str(e)}"}), 400
 
-    return jsonify({"msg": f"{pokemon_name} adicionado aos favoritos!"}), 201
+    return jsonify({"msg": f"{pokemon.name.capitalize()} adicionado aos favoritos!"}), 201
 
 
 # ==========================================================
@@ -113,14 +132,55 @@ def remove_favorite(pokemon_id):
     if request.method == "OPTIONS":
         return jsonify({"msg": "ok"}), 200
 
-    user = get_user()
-    if not user:
+    user_id = get_user_id()
+    if user_id is None:
         return jsonify({"msg": "Usuário não encontrado"}), 404
 
-    fav = Favorites.query.filter_by(user_id=user.id, pokemon_id=pokemon_id).first()
+    fav = Favorites.query.filter_by(user_id=user_id, pokemon_id=pokemon_id).first()
     if not fav:
         return jsonify({"msg": "Pokémon não encontrado nos favoritos"}), 404
 
     db.session.delete(fav)
+    ListVersion.bump(user_id, "favorites")
     db.session.commit()
     return jsonify({"msg": "Pokémon removido dos favoritos!"}), 200
+
+
+# ==========================================================
+# 📦 POST /api/favoritos/batch
+# Aplica várias operações nos favoritos numa única transação
+# (add / remove / reorder; tudo ou nada, com resultado por item)
+# ==========================================================
+@favorites_bp.route("/batch", methods=["POST", "OPTIONS"])
+@jwt_required()
+def batch_favorites():
+    if request.method == "OPTIONS":
+        return jsonify({"msg": "ok"}), 200
+
+    user_id = get_user_id()
+    if user_id is None:
+        return jsonify({"msg": "Usuário não encontrado"}), 404
+
+    data = request.get_json(silent=True) or {}
+    ops = data.get("ops") if isinstance(data, dict) else None
+    if not isinstance(ops, list) or not ops:
+        return jsonify({"msg": "Envie 'ops' com ao menos uma operação"}), 400
+    max_ops = current_app.config["LIST_BATCH_MAX_OPS"]
+    if len(ops) > max_ops:
+        return jsonify({"msg": f"Máximo de {max_ops} operações por lote"}), 400
+
+    try:
+        results, applied = user_lists.apply_batch(
+            Favorites, user_id, "favorites", ops, "nos favoritos"
+        )
+    except IntegrityError:
+        # Requisição simultânea alterou a mesma lista
+        db.session.rollback()
+        return jsonify({"msg": "A lista mudou durante o lote, tente novamente"}), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"msg": f"Erro ao aplicar o lote: {str(e)}"}), 400
+
+    if not applied:
+        return jsonify({"msg": "Nenhuma alteração aplicada", "applied": False, "results": results}), 400
+    return jsonify({"msg": "Lote aplicado!", "applied": True, "results": results}), 200
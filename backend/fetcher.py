@@ -0,0 +1,82 @@
+# fetcher.py
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import profiling
+from pokeapi_client import pokeapi
+
+# Marca os caminhos que falharam (rede, erro HTTP ou prazo estourado)
+FAILED = object()
+
+
+# ==========================================================
+# 🚀 Busca concorrente com limite de paralelismo e prazo
+# ==========================================================
+def _fetch_one(path, parse, timeout):
+    response = pokeapi.get(path, timeout=timeout)
+    if response.status_code == 404:
+        return path, None
+    response.raise_for_status()
+    return path, parse(response.json())
+
+
+def iter_fetch_all(paths, parse, max_workers=16, deadline=20.0, timeout=5):
+    """
+    Busca vários caminhos da PokéAPI em paralelo (ex.: "pokemon/25"),
+    gerando (caminho, resultado) na ordem em que cada um termina.
+
+    - no máximo `max_workers` requisições simultâneas
+    - `deadline` (segundos) limita o tempo total da chamada
+    - `parse` transforma o JSON de cada resposta (roda na thread)
+
+    Respostas 404 geram resultado None; falhas de rede/HTTP e os caminhos
+    que não terminaram dentro do prazo geram FAILED.
+    """
+    import requests   # import tardio: só carrega quando a PokéAPI é chamada
+
+    paths = list(dict.fromkeys(paths))
+    if not paths:
+        return
+
+    expires_at = time.monotonic() + deadline
+
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(paths))),
+        thread_name_prefix=profiling.fetch_thread_prefix(),
+    )
+    try:
+        pending = {executor.submit(_fetch_one, path, parse, timeout): path for path in paths}
+
+        while pending:
+            remaining = expires_at - time.monotonic()
+            if remaining <= 0:
+                for path in pending.values():
+                    yield path, FAILED
+                return
+
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                try:
+                    yield future.result()
+                except requests.exceptions.RequestException:
+                    yield path, FAILED
+    finally:
+        # ⏱️ Não espera as requisições atrasadas: elas terminam sozinhas
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def fetch_all(paths, parse, max_workers=16, deadline=20.0, timeout=5):
+    """
+    Versão "tudo de uma vez" de iter_fetch_all.
+    Retorna ({caminho: resultado}, partial); `partial` é True quando algum
+    caminho falhou ou ficou de fora pelo prazo.
+    """
+    results = {}
+    partial = False
+    for path, value in iter_fetch_all(paths, parse, max_workers, deadline, timeout):
+        if value is FAILED:
+            partial = True
+        else:
+            results[path] = value
+    return results, partial
@@ -0,0 +1,54 @@
+# gunicorn.conf.py
+"""
+Configuração do gunicorn (lida automaticamente de backend/).
+
+As métricas do Prometheus são por processo: cada worker grava em
+arquivos de PROMETHEUS_MULTIPROC_DIR e o /metrics soma todos. O
+diretório precisa existir (e estar limpo) antes dos workers importarem
+o app, por isso é preparado aqui, no master.
+
+Workers gthread: o controle de admissão (admission.py) só funciona com
+várias threads por worker. As rotas da PokéAPI ocupam no máximo
+ADMISSION_UPSTREAM_LIMIT + ADMISSION_UPSTREAM_QUEUE threads; as demais
+(GUNICORN_DEFAULT_THREADS) ficam livres para login, favoritos e equipe.
+"""
+import os
+import shutil
+import tempfile
+
+from config import Config
+
+worker_class = "gthread"
+_upstream_threads = (
+    Config.ADMISSION_UPSTREAM_LIMIT + Config.ADMISSION_UPSTREAM_QUEUE
+    if Config.ADMISSION_UPSTREAM_LIMIT > 0 else 0
+)
+threads = int(os.environ.get("GUNICORN_THREADS", 0)) or (
+    _upstream_threads + int(os.environ.get("GUNICORN_DEFAULT_THREADS", 4))
+)
+
+_multiproc_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "pokeapi-metrics")
+)
+
+
+def on_starting(server):
+    # --threads na linha de comando passa por cima do valor acima: confere
+    # o que vai valer de fato
+    if _upstream_threads and _upstream_threads >= server.cfg.threads:
+        raise RuntimeError(
+            f"--threads ({server.cfg.threads}) precisa ser maior que "
+            f"ADMISSION_UPSTREAM_LIMIT + ADMISSION_UPSTREAM_QUEUE ({_upstream_threads}): "
+            f"senão as rotas da PokéAPI ocupam todas as threads do worker"
+        )
+
+    # Valores de uma execução anterior não podem entrar na soma
+    shutil.rmtree(_multiproc_dir, ignore_errors=True)
+    os.makedirs(_multiproc_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    # Gauges "live*" do worker morto deixam de contar
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
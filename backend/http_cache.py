@@ -0,0 +1,48 @@
+# http_cache.py
+"""
+Validadores HTTP (ETag) e Cache-Control.
+
+Os ETags são calculados a partir de versões (catálogo / listas do
+usuário), então um If-None-Match que bate devolve 304 sem consultar a
+PokéAPI nem serializar nada.
+"""
+import hashlib
+
+from flask import Response, current_app, request
+
+
+def make_etag(*parts):
+    raw = "|".join(str(p) for p in parts)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def public_cache_control():
+    """Dados da Pokédex: iguais para todos, podem ficar em CDN."""
+    return f"public, max-age={current_app.config['POKEDEX_CACHE_MAX_AGE']}"
+
+
+# Listas do usuário: só o navegador guarda, e sempre revalida
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def _apply(response, etag, cache_control, vary=None):
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = cache_control
+    if vary:
+        response.vary.add(vary)
+    return response
+
+
+def not_modified(etag, cache_control, vary=None):
+    """Resposta 304 se o If-None-Match do cliente bate com o ETag; senão None."""
+    # Comparação fraca (RFC 9110): a versão comprimida tem ETag W/"..."
+    if request.if_none_match.contains_weak(etag):
+        # Tipo do 200 correspondente: a compressão repete o Vary dele
+        return _apply(Response(status=304, mimetype="application/json"), etag, cache_control, vary)
+    return None
+
+
+def cached(response, etag, cache_control, vary=None):
+    """Anexa ETag/Cache-Control a uma resposta (Response ou tupla)."""
+    response = current_app.make_response(response)
+    return _apply(response, etag, cache_control, vary)
@@ -0,0 +1,147 @@
+# identity.py
+"""
+Identidade do usuário autenticado sem ir ao banco a cada requisição.
+
+- o ID vem do `sub` do JWT
+- os campos públicos (nome, apelido, e-mail, is_admin) ficam num cache
+  LRU com TTL, por processo, invalidado quando o perfil muda
+
+    from identity import current_user_id, current_identity, is_admin
+    user = current_identity()      # dict ou None (usuário removido)
+
+Com vários workers, cada um tem o seu cache: uma alteração feita em
+outro processo aparece aqui em no máximo IDENTITY_CACHE_TTL segundos.
+Isso vale também para is_admin(): um admin rebaixado perde o acesso em
+até IDENTITY_CACHE_TTL, não quando o token (JWT_ACCESS_TOKEN_EXPIRES)
+vence.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, g
+from flask_jwt_extended import get_jwt, get_jwt_identity
+
+from models import db, User
+
+FIELDS = ("id", "name", "nickname", "email", "is_admin")
+
+
+class TTLCache:
+    """LRU limitado a `maxsize` entradas, cada uma válida por `ttl` segundos."""
+
+    def __init__(self, maxsize=1024, ttl=60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._data.pop(key, None)
+                self._counters["misses"] += 1
+                return None
+            self._data.move_to_end(key)
+            self._counters["hits"] += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters, size=len(self._data))
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def _get_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TTLCache(
+                    maxsize=current_app.config["IDENTITY_CACHE_SIZE"],
+                    ttl=current_app.config["IDENTITY_CACHE_TTL"],
+                )
+    return _cache
+
+
+def to_identity(user):
+    """User → dict só com os campos públicos (o que vai para o cache)."""
+    return {field: getattr(user, field) for field in FIELDS}
+
+
+def claims_for(user):
+    """Claims extras do access token (is_admin só recusa: ver is_admin)."""
+    return {"is_admin": bool(user.is_admin)}
+
+
+def remember(user):
+    """Guarda/atualiza o usuário no cache (login, alteração de perfil)."""
+    _get_cache().set(user.id, to_identity(user))
+
+
+def invalidate(user_id):
+    _get_cache().pop(user_id)
+
+
+def current_user_id():
+    """ID do usuário do JWT atual (None se o `sub` não for um inteiro)."""
+    try:
+        return int(get_jwt_identity())
+    except (TypeError, ValueError):
+        return None
+
+
+def current_identity():
+    """
+    Campos públicos do usuário atual: cache da requisição → cache do
+    processo → banco. None se o usuário não existe mais.
+    """
+    if "identity" in g:
+        return g.identity
+
+    user_id = current_user_id()
+    found = None
+    if user_id is not None:
+        cache = _get_cache()
+        found = cache.get(user_id)
+        if found is None:
+            user = db.session.get(User, user_id)
+            if user is not None:
+                found = to_identity(user)
+                cache.set(user_id, found)
+
+    g.identity = found
+    return found
+
+
+def is_admin():
+    """
+    Admin de acordo com a identidade em cache (no máximo
+    IDENTITY_CACHE_TTL segundos atrás), não com o token: a claim vale por
+    todo o JWT_ACCESS_TOKEN_EXPIRES. Ela só serve para recusar sem
+    consulta quem já não era admin no login.
+    """
+    if get_jwt().get("is_admin") is False:
+        return False
+    found = current_identity()
+    return bool(found and found["is_admin"])
+
+
+def stats():
+    return _get_cache().stats()
@@ -0,0 +1,224 @@
+# ingest.py
+"""
+Carga em lote do catálogo (Pokémon, gerações e tipos).
+
+    flask --app app ingest                      # baixa da PokéAPI
+    flask --app app ingest --source ./dump      # offline, a partir de JSONs
+
+O diretório de dump segue os caminhos da API: pokemon/<id>.json,
+generation/<id>.json, type/<nome>.json (ou <caminho>/index.json, como no
+repositório pokeapi/api-data). A lista completa (/pokemon/filter sem
+filtros) vem de pokemon/index.json, se houver, ou dos próprios arquivos
+de pokemon/, então a carga offline não deixa nada para a PokéAPI. Cada
+lote é gravado ao terminar, então uma carga interrompida pode ser
+retomada: só o que falta ou venceu é buscado de novo.
+"""
+import json
+import os
+import time
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+import catalog
+from fetcher import fetch_all
+from pokeapi_client import pokeapi
+
+
+def _chunks(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ==========================================================
+# 🌐 Fonte online (PokéAPI)
+# ==========================================================
+class HttpSource:
+    def _get(self, path):
+        response = pokeapi.get(path, timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    def pokemon_keys(self):
+        # Também aquece a lista completa usada pelo /pokemon/filter sem filtros
+        return catalog.all_members()
+
+    def all_ids(self):
+        # Já gravada por pokemon_keys() (read-through do catálogo)
+        return None
+
+    def generation_keys(self):
+        # "generation-iii" → 3 (a URL termina com o ID)
+        data = self._get("generation?limit=100&offset=0")
+        return [entry["url"].rstrip("/").rsplit("/", 1)[-1] for entry in data.get("results", [])]
+
+    def type_keys(self):
+        data = self._get("type?limit=100&offset=0")
+        return [entry["name"] for entry in data.get("results", [])]
+
+    def load_generation(self, key):
+        return self._get(f"generation/{key}")
+
+    def load_type(self, key):
+        return self._get(f"type/{key}")
+
+    def load_pokemon(self, keys):
+        """Retorna (registros normalizados, quantidade que falhou)."""
+        fetched, _ = fetch_all(
+            [f"{catalog.POKEMON_PATH}{k}" for k in keys],
+            catalog.normalize_pokemon,
+            max_workers=current_app.config["POKEAPI_MAX_WORKERS"],
+            deadline=max(60.0, current_app.config["POKEAPI_DEADLINE"]),
+            timeout=10,
+        )
+        records = [r for r in fetched.values() if r is not None]
+        return records, len(keys) - len(fetched)
+
+
+# ==========================================================
+# 📁 Fonte offline (diretório de dumps JSON)
+# ==========================================================
+class DumpSource:
+    def __init__(self, root):
+        self.root = root
+
+    def _keys(self, resource):
+        folder = os.path.join(self.root, resource)
+        if not os.path.isdir(folder):
+            return []
+        keys = []
+        for entry in sorted(os.listdir(folder)):
+            if entry == "index.json":
+                continue   # listagem do recurso (api-data), não um item
+            if entry.endswith(".json"):
+                keys.append(entry[:-len(".json")])
+            elif os.path.isfile(os.path.join(folder, entry, "index.json")):
+                keys.append(entry)
+        return keys
+
+    def _load(self, resource, key):
+        folder = os.path.join(self.root, resource)
+        path = os.path.join(folder, f"{key}.json")
+        if not os.path.isfile(path):
+            path = os.path.join(folder, key, "index.json")
+        with open(path, encoding="utf-8") as fp:
+            return json.load(fp)
+
+    def pokemon_keys(self):
+        return self._keys("pokemon")
+
+    def all_ids(self):
+        """IDs da lista completa: pokemon/index.json ou os arquivos do dump."""
+        index = os.path.join(self.root, "pokemon", "index.json")
+        if os.path.isfile(index):
+            with open(index, encoding="utf-8") as fp:
+                return catalog.page_ids(json.load(fp))
+        ids = set()
+        for key in self.pokemon_keys():
+            if key.isdigit():
+                ids.add(int(key))
+            else:
+                try:
+                    ids.add(int(self._load("pokemon", key)["id"]))
+                except (OSError, ValueError, KeyError, TypeError):
+                    continue   # arquivo ruim: load_pokemon conta a falha
+        return sorted(ids)
+
+    def generation_keys(self):
+        return self._keys("generation")
+
+    def type_keys(self):
+        return self._keys("type")
+
+    def load_generation(self, key):
+        return self._load("generation", key)
+
+    def load_type(self, key):
+        return self._load("type", key)
+
+    def load_pokemon(self, keys):
+        records, failed = [], 0
+        for key in keys:
+            try:
+                records.append(catalog.normalize_pokemon(self._load("pokemon", key)))
+            except (OSError, ValueError, KeyError):
+                failed += 1
+        return records, failed
+
+
+# ==========================================================
+# 🚚 Carga
+# ==========================================================
+def _ingest_lists(source, force):
+    """Gerações, tipos e a lista completa → PokemonList. Retorna quantas listas gravou."""
+    stored = 0
+    jobs = [
+        (source.generation_keys, source.load_generation, catalog.generation_key, catalog.generation_ids),
+        (source.type_keys, source.load_type, catalog.type_key, catalog.type_ids),
+    ]
+    for list_keys, load, make_key, extract in jobs:
+        for key in list_keys():
+            list_key = make_key(key)
+            if not force and catalog.is_list_fresh(list_key):
+                continue
+            catalog.store_list(list_key, extract(load(key)))
+            stored += 1
+
+    if force or not catalog.is_list_fresh(catalog.ALL_KEY):
+        all_ids = source.all_ids()
+        if all_ids is not None:
+            catalog.store_list(catalog.ALL_KEY, all_ids)
+            stored += 1
+    return stored
+
+
+def ingest(source, batch_size=100, force=False, echo=print):
+    started = time.perf_counter()
+    totals = {"seen": 0, "stored": 0, "failed": 0, "lists": 0}
+
+    totals["lists"] = _ingest_lists(source, force)
+    echo(f"📚 Listas gravadas: {totals['lists']}")
+
+    for number, batch in enumerate(_chunks(source.pokemon_keys(), batch_size), start=1):
+        batch_started = time.perf_counter()
+        todo = batch if force else catalog.stale_names(batch)
+
+        records, failed = source.load_pokemon(todo) if todo else ([], 0)
+        catalog.store_pokemon(records)
+
+        totals["seen"] += len(batch)
+        totals["stored"] += len(records)
+        totals["failed"] += failed
+
+        elapsed = time.perf_counter() - batch_started
+        echo(
+            f"lote {number}: {len(batch)} vistos, {len(records)} gravados, "
+            f"{failed} falhas — {len(records) / elapsed if elapsed else 0:.1f} Pokémon/s"
+        )
+
+    totals["seconds"] = round(time.perf_counter() - started, 2)
+    rate = totals["stored"] / totals["seconds"] if totals["seconds"] else 0
+    echo(
+        f"✅ {totals['stored']} Pokémon gravados de {totals['seen']} "
+        f"({totals['failed']} falhas) em {totals['seconds']}s — {rate:.1f} Pokémon/s"
+    )
+    return totals
+
+
+@click.command("ingest")
+@click.option("--source", "source_dir", type=click.Path(exists=True, file_okay=False),
+              help="Diretório com dumps JSON (modo offline).")
+@click.option("--batch-size", default=100, show_default=True, help="Pokémon por lote.")
+@click.option("--force", is_flag=True, help="Recarrega também o que ainda está válido.")
+@with_appcontext
+def ingest_command(source_dir, batch_size, force):
+    """Pré-carrega o catálogo local de Pokémon, gerações e tipos."""
+    source = DumpSource(source_dir) if source_dir else HttpSource()
+    ingest(source, batch_size=batch_size, force=force, echo=click.echo)
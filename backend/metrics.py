@@ -0,0 +1,213 @@
+# metrics.py
+"""
+Métricas no formato do Prometheus em GET /metrics.
+
+- http_request_duration_seconds{method,route}: latência por rota (modelo
+  da URL, não o caminho → cardinalidade fixa)
+- http_requests_total{method,route,status} e http_requests_in_progress
+- pokemon_filter_duration_seconds{shape}: latência do /pokemon/filter por
+  formato do filtro (quantas gerações/tipos, and/or), para achar quais
+  combinações consomem os workers
+- pokeapi_requests_total{endpoint,outcome} e pokeapi_request_duration_seconds
+  (cada tentativa; outcome = ok/not_found/http_error/timeout/error/
+  short_circuited/rate_limited)
+- catalog_lookups_total{kind,result}: consultas ao catálogo local
+  (hit / stale = vencido servido e renovado em segundo plano / expired =
+  vencido além da tolerância, buscado na hora / miss / negative)
+- catalog_refresh_jobs_total{kind,outcome} e catalog_refresh_queue_depth:
+  jobs do refresher (ok/not_found/skipped/error/deduplicated/dropped) e fila
+- admission_requests_total{pool,outcome} e admission_wait_seconds{pool}:
+  controle de admissão (admitted/queue_full/timeout) e espera na fila
+- db_queries_per_request{route}: consultas SQL por requisição
+
+Com vários workers do gunicorn, cada processo grava seus valores em
+arquivos de PROMETHEUS_MULTIPROC_DIR (definido em gunicorn.conf.py) e o
+/metrics soma todos os processos — qualquer worker que atender a coleta
+devolve o total. Sem a variável (python app.py), vale o processo atual.
+"""
+import os
+import time
+
+from flask import Blueprint, Response, current_app, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY,
+    generate_latest, multiprocess,
+)
+
+metrics_bp = Blueprint("metrics", __name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "Latência das requisições HTTP",
+    ["method", "route"], buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "Requisições HTTP atendidas", ["method", "route", "status"],
+)
+HTTP_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Requisições HTTP em andamento",
+    ["method", "route"], multiprocess_mode="livesum",
+)
+FILTER_LATENCY = Histogram(
+    "pokemon_filter_duration_seconds", "Latência do /pokemon/filter por formato do filtro",
+    ["shape"], buckets=LATENCY_BUCKETS,
+)
+POKEAPI_REQUESTS = Counter(
+    "pokeapi_requests_total", "Chamadas à PokéAPI (cada tentativa)", ["endpoint", "outcome"],
+)
+POKEAPI_LATENCY = Histogram(
+    "pokeapi_request_duration_seconds", "Latência das chamadas à PokéAPI",
+    ["endpoint"], buckets=LATENCY_BUCKETS,
+)
+CATALOG_LOOKUPS = Counter(
+    "catalog_lookups_total", "Consultas ao catálogo local", ["kind", "result"],
+)
+ADMISSION_REQUESTS = Counter(
+    "admission_requests_total", "Decisões do controle de admissão", ["pool", "outcome"],
+)
+ADMISSION_WAIT = Histogram(
+    "admission_wait_seconds", "Espera por uma vaga no orçamento de requisições",
+    ["pool"], buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5),
+)
+REFRESH_JOBS = Counter(
+    "catalog_refresh_jobs_total", "Jobs de renovação do catálogo em segundo plano",
+    ["kind", "outcome"],
+)
+REFRESH_QUEUE = Gauge(
+    "catalog_refresh_queue_depth", "Jobs de renovação esperando na fila",
+    multiprocess_mode="livesum",
+)
+DB_QUERIES = Histogram(
+    "db_queries_per_request", "Consultas SQL por requisição HTTP",
+    ["route"], buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+
+
+# ==========================================================
+# 🏷️ Rótulos
+# ==========================================================
+def _route():
+    rule = request.url_rule
+    return rule.rule if rule is not None else "unmatched"
+
+
+def _count_bucket(n):
+    return str(n) if n < 3 else "3+"
+
+
+def filter_shape(generations, types, type_mode):
+    """'gen1+type2:and' — só quantidades, nunca os valores (cardinalidade fixa)."""
+    shape = f"gen{_count_bucket(len(generations))}+type{_count_bucket(len(types))}"
+    if len(types) > 1:
+        shape += f":{type_mode}"
+    return shape
+
+
+def pokeapi_endpoint(url, base_url):
+    """'pokemon', 'generation', 'type'... ou o host, para URLs de fora da API."""
+    if url.startswith(base_url):
+        return url[len(base_url):].split("/", 1)[0].split("?", 1)[0] or "root"
+    return url.split("://", 1)[-1].split("/", 1)[0]
+
+
+# ==========================================================
+# 📈 Registro (chamado pelos módulos instrumentados)
+# ==========================================================
+def observe_pokeapi(endpoint, outcome, seconds=None):
+    POKEAPI_REQUESTS.labels(endpoint, outcome).inc()
+    if seconds is not None:
+        POKEAPI_LATENCY.labels(endpoint).observe(seconds)
+
+
+def catalog_lookup(kind, result, amount=1):
+    if amount:
+        CATALOG_LOOKUPS.labels(kind, result).inc(amount)
+
+
+def observe_refresh(kind, outcome):
+    REFRESH_JOBS.labels(kind, outcome).inc()
+
+
+def set_refresh_queue(depth):
+    REFRESH_QUEUE.set(depth)
+
+
+def observe_admission(pool, outcome, seconds):
+    ADMISSION_REQUESTS.labels(pool, outcome).inc()
+    ADMISSION_WAIT.labels(pool).observe(seconds)
+
+
+def tag_filter(generations, types, type_mode):
+    """Marca a requisição atual; a latência do filtro é registrada no teardown."""
+    g._metrics_filter_shape = filter_shape(generations, types, type_mode)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    # Fora de requisição (CLI, bootstrap) não há g → ignora
+    try:
+        g._metrics_queries += 1
+    except (AttributeError, RuntimeError):
+        pass
+
+
+# ==========================================================
+# 🔌 Ganchos da requisição
+# ==========================================================
+def _before_request():
+    g._metrics_started = time.perf_counter()
+    g._metrics_queries = 0
+    g._metrics_labels = (request.method, _route())
+    HTTP_IN_PROGRESS.labels(*g._metrics_labels).inc()
+
+
+def _after_request(response):
+    g._metrics_status = response.status_code
+    return response
+
+
+def _teardown_request(exc):
+    labels = g.pop("_metrics_labels", None)
+    if labels is None:
+        return
+    # Com streaming (ndjson) o teardown só roda ao fim da resposta
+    elapsed = time.perf_counter() - g._metrics_started
+    HTTP_LATENCY.labels(*labels).observe(elapsed)
+    shape = g.pop("_metrics_filter_shape", None)
+    if shape is not None:
+        FILTER_LATENCY.labels(shape).observe(elapsed)
+    HTTP_REQUESTS.labels(*labels, str(g.pop("_metrics_status", 500))).inc()
+    HTTP_IN_PROGRESS.labels(*labels).dec()
+    DB_QUERIES.labels(labels[1]).observe(g.pop("_metrics_queries", 0))
+
+
+def init_app(app):
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    app.register_blueprint(metrics_bp)
+
+
+# ==========================================================
+# 📤 GET /metrics
+# ==========================================================
+def _authorized():
+    token = current_app.config["METRICS_TOKEN"]
+    return not token or request.headers.get("Authorization") == f"Bearer {token}"
+
+
+@metrics_bp.get("/metrics")
+def get_metrics():
+    if not _authorized():
+        return Response("unauthorized\n", status=401, mimetype="text/plain")
+
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,189 @@
+# migrations.py
+"""
+Migrações de esquema/dados. Cada passo detecta pelo próprio esquema se
+já foi aplicado, então upgrade() pode rodar quantas vezes for preciso.
+"""
+import json
+
+from sqlalchemy import inspect, text
+
+import catalog
+from models import db, CatalogVersion, Favorites, Equip, PokemonAbility, User
+
+
+def _columns(table):
+    inspector = inspect(db.session.connection())
+    if not inspector.has_table(table):
+        return set()
+    return {c["name"] for c in inspector.get_columns(table)}
+
+
+def _loads(raw, default):
+    try:
+        return json.loads(raw) if raw else default
+    except (TypeError, ValueError):
+        return default
+
+
+# ==========================================================
+# 1) pokemon.abilities (JSON) → tabela pokemon_abilities
+# ==========================================================
+def _pokemon_abilities_table():
+    if "abilities" not in _columns("pokemon"):
+        return False
+
+    rows = db.session.execute(text("SELECT id, abilities FROM pokemon")).all()
+    for pokemon_id, raw in rows:
+        if PokemonAbility.query.filter_by(pokemon_id=pokemon_id).first():
+            continue
+        for slot, ability in enumerate(_loads(raw, [])):
+            db.session.add(PokemonAbility(
+                pokemon_id=pokemon_id, slot=slot,
+                name=ability["name"], is_hidden=bool(ability.get("is_hidden")),
+            ))
+    db.session.flush()
+    db.session.execute(text("ALTER TABLE pokemon DROP COLUMN abilities"))
+    return True
+
+
+# ==========================================================
+# 2) favorites/equip com o Pokémon duplicado em JSON → referência
+#    ao catálogo + índice único (user_id, pokemon_id)
+# ==========================================================
+def _normalize_user_table(model):
+    table = model.__tablename__
+    if "pokemon_name" not in _columns(table):
+        return False
+
+    legacy = db.session.execute(text(f"SELECT * FROM {table} ORDER BY id")).mappings().all()
+    for row in legacy:
+        record = catalog.record_from_payload({
+            "id": row["pokemon_id"],
+            "name": row["pokemon_name"],
+            "sprite_url": row["pokemon_image"],
+            "height": row["height"],
+            "weight": row["weight"],
+            "abilities": _loads(row["abilities"], []),
+            "stats": _loads(row["stats"], {}),
+            "types": _loads(row["types"], []),
+        })
+        if record is not None:
+            catalog.ensure_pokemon(record)
+    db.session.flush()
+
+    connection = db.session.connection()
+    connection.execute(text(f"ALTER TABLE {table} RENAME TO {table}_legacy"))
+    model.__table__.create(bind=connection)
+    # Duplicatas antigas (mesmo usuário + Pokémon) viram uma linha só; a
+    # ordem antiga (por id) vira position 0, 1, 2... dentro de cada usuário
+    connection.execute(text(
+        f"INSERT INTO {table} (id, user_id, pokemon_id, position) "
+        f"SELECT MIN(id), user_id, pokemon_id, "
+        f"ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY MIN(id)) - 1 "
+        f"FROM {table}_legacy GROUP BY user_id, pokemon_id"
+    ))
+    connection.execute(text(f"DROP TABLE {table}_legacy"))
+    _sync_id_sequence(table)
+    return True
+
+
+def _sync_id_sequence(table):
+    """
+    Postgres: IDs copiados explicitamente não avançam a sequência do SERIAL
+    (o próximo INSERT repetiria um id). No SQLite não há o que fazer.
+    """
+    connection = db.session.connection()
+    if connection.dialect.name != "postgresql":
+        return
+    connection.execute(text(
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+        f"COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) FROM {table}"
+    ))
+
+
+# ==========================================================
+# 3) favorites/equip.position (ordem definida pelo usuário)
+# ==========================================================
+def _position_column(model):
+    table = model.__tablename__
+    if "position" in _columns(table):
+        return False
+
+    connection = db.session.connection()
+    connection.execute(text(
+        f"ALTER TABLE {table} ADD COLUMN position INTEGER NOT NULL DEFAULT 0"
+    ))
+    # Ordem atual (por id) vira 0, 1, 2... dentro de cada usuário
+    connection.execute(text(
+        f"UPDATE {table} SET position = ("
+        f"SELECT COUNT(*) FROM {table} AS t WHERE t.user_id = {table}.user_id AND t.id < {table}.id)"
+    ))
+    return True
+
+
+# ==========================================================
+# 4) Índices de busca por prefixo em users (listagem do admin)
+# ==========================================================
+def _index_names(table):
+    connection = db.session.connection()
+    if connection.dialect.name == "sqlite":
+        # O inspector do SQLite não enxerga índices de expressão (lower(...))
+        rows = connection.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table"),
+            {"table": table},
+        )
+        return {name for (name,) in rows}
+    return {i["name"] for i in inspect(connection).get_indexes(table)}
+
+
+# Só lower(x): a listagem ordenava os resultados; trocados por (lower(x), id)
+_OBSOLETE_USER_INDEXES = ("ix_users_email_lower", "ix_users_nickname_lower")
+
+
+def _user_search_indexes():
+    connection = db.session.connection()
+    existing = _index_names("users")
+    missing = [i for i in User.__table__.indexes if i.name not in existing]
+    for index in missing:
+        index.create(bind=connection)
+    obsolete = [name for name in _OBSOLETE_USER_INDEXES if name in existing]
+    for name in obsolete:
+        connection.execute(text(f"DROP INDEX {name}"))
+    return bool(missing or obsolete)
+
+
+# ==========================================================
+# 5) Linha do contador do catálogo (ETags)
+# ==========================================================
+def _catalog_version_row():
+    # Criada aqui, antes dos workers: bump() vira sempre um UPDATE, sem
+    # dois workers disputando o INSERT da primeira gravação
+    if db.session.get(CatalogVersion, CatalogVersion.ROW_ID) is not None:
+        return False
+    db.session.add(CatalogVersion(id=CatalogVersion.ROW_ID, version=0))
+    return True
+
+
+STEPS = [
+    ("pokemon_abilities", _pokemon_abilities_table),
+    ("favorites_normalized", lambda: _normalize_user_table(Favorites)),
+    ("equip_normalized", lambda: _normalize_user_table(Equip)),
+    ("favorites_position", lambda: _position_column(Favorites)),
+    ("equip_position", lambda: _position_column(Equip)),
+    ("users_search_indexes", _user_search_indexes),
+    ("catalog_version_row", _catalog_version_row),
+]
+
+
+def upgrade():
+    """Aplica os passos pendentes (cada um na sua transação)."""
+    applied = []
+    for name, step in STEPS:
+        try:
+            if step():
+                applied.append(name)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+    return applied
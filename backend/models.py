@@ -1,13 +1,17 @@
 # models.py
-from flask_sqlalchemy import SQLAlchemy
-
-db = SQLAlchemy()
+from database import db
 
 # ==========================================================
 # 👤 Usuário
 # ==========================================================
 class User(db.Model):
     __tablename__ = "users"
+    __table_args__ = (
+        # Busca por prefixo (admin) sem varrer a tabela: lower(x) >= p AND < p',
+        # já na ordem (lower(x), id) do cursor → sem ordenar os resultados
+        db.Index("ix_users_email_lower_id", db.func.lower(db.text("email")), "id"),
+        db.Index("ix_users_nickname_lower_id", db.func.lower(db.text("nickname")), "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -29,22 +33,19 @@ class User(db.Model):
 # ==========================================================
 class Favorites(db.Model):
     __tablename__ = "favorites"
+    __table_args__ = (
+        db.Index("ix_favorites_user_pokemon", "user_id", "pokemon_id", unique=True),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    pokemon_id = db.Column(db.Integer, db.ForeignKey("pokemon.id"), nullable=False)
+    position = db.Column(db.Integer, nullable=False, default=0, server_default="0")   # ordem na lista
 
-    pokemon_id = db.Column(db.Integer, nullable=False)
-    pokemon_name = db.Column(db.String(120), nullable=False)
-    pokemon_image = db.Column(db.String(255))
-
-    height = db.Column(db.Float)
-    weight = db.Column(db.Float)
-    abilities = db.Column(db.Text)   # JSON string
-    stats = db.Column(db.Text)       # JSON string
-    types = db.Column(db.Text)       # JSON string
+    pokemon = db.relationship("Pokemon")
 
     def __repr__(self):
-        return f"<Favorites {self.pokemon_name} (User {self.user_id})>"
+        return f"<Favorites #{self.pokemon_id} (User {self.user_id})>"
 
 
 # ==========================================================
@@ -52,19 +53,198 @@ class Favorites(db.Model):
 # ==========================================================
 class Equip(db.Model):
     __tablename__ = "equip"
+    __table_args__ = (
+        db.Index("ix_equip_user_pokemon", "user_id", "pokemon_id", unique=True),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    pokemon_id = db.Column(db.Integer, db.ForeignKey("pokemon.id"), nullable=False)
+    position = db.Column(db.Integer, nullable=False, default=0, server_default="0")   # ordem na lista
+
+    pokemon = db.relationship("Pokemon")
+
+    def __repr__(self):
+        return f"<Equip #{self.pokemon_id} (User {self.user_id})>"
+
+
+# ==========================================================
+# 📚 Catálogo local da PokéAPI (cache persistente)
+# ==========================================================
+class Pokemon(db.Model):
+    __tablename__ = "pokemon"
+
+    id = db.Column(db.Integer, primary_key=True)   # ID da Pokédex
+    name = db.Column(db.String(120), unique=True, nullable=False, index=True)
+    sprite_url = db.Column(db.String(255))
+
+    height = db.Column(db.Float)   # metros
+    weight = db.Column(db.Float)   # quilos
+    type1 = db.Column(db.String(20))
+    type2 = db.Column(db.String(20))
+
+    hp = db.Column(db.Integer)
+    attack = db.Column(db.Integer)
+    defense = db.Column(db.Integer)
+    special_attack = db.Column(db.Integer)
+    special_defense = db.Column(db.Integer)
+    speed = db.Column(db.Integer)
+
+    fetched_at = db.Column(db.Float, nullable=False, default=0)   # epoch
+
+    ability_rows = db.relationship(
+        "PokemonAbility", order_by="PokemonAbility.slot", cascade="all, delete-orphan"
+    )
+
+    @property
+    def types(self):
+        return [t for t in (self.type1, self.type2) if t]
+
+    @property
+    def stats(self):
+        stats = {
+            "hp": self.hp,
+            "attack": self.attack,
+            "defense": self.defense,
+            "special-attack": self.special_attack,
+            "special-defense": self.special_defense,
+            "speed": self.speed,
+        }
+        return {name: value for name, value in stats.items() if value is not None}
+
+    @classmethod
+    def from_record(cls, record):
+        """Pokemon (ainda fora da sessão) a partir de um registro normalizado."""
+        pokemon = cls()
+        pokemon.apply(record)
+        return pokemon
+
+    def apply(self, record):
+        """Copia um registro normalizado (ver catalog.normalize_pokemon)."""
+        for column, value in record.items():
+            if column != "abilities":
+                setattr(self, column, value)
+
+        # Atualiza as habilidades no lugar (mesma PK = pokemon_id + slot)
+        abilities = record.get("abilities") or []
+        rows = self.ability_rows
+        for slot, ability in enumerate(abilities):
+            if slot < len(rows):
+                rows[slot].name = ability["name"]
+                rows[slot].is_hidden = bool(ability.get("is_hidden"))
+            else:
+                rows.append(PokemonAbility(
+                    slot=slot, name=ability["name"], is_hidden=bool(ability.get("is_hidden"))
+                ))
+        del rows[len(abilities):]
+
+    def to_summary(self):
+        return {
+            "id": self.id,
+            "name": self.name.capitalize(),
+            "types": [t.capitalize() for t in self.types],
+            "sprite_url": self.sprite_url,
+            "sprite": f"/sprites/{self.id}",   # proxy com cache (ver sprites.py)
+        }
+
+    def to_detail(self, abilities=True):
+        detail = {
+            "id": self.id,
+            "name": self.name.capitalize(),
+            "types": [t.capitalize() for t in self.types],
+            "height": self.height,
+            "weight": self.weight,
+            "sprite_url": self.sprite_url,
+            "sprite": f"/sprites/{self.id}",
+            "stats": self.stats,
+        }
+        # abilities=False não toca em ability_rows (nenhuma consulta extra)
+        if abilities:
+            detail["abilities"] = [
+                {"name": a.name, "is_hidden": a.is_hidden} for a in self.ability_rows
+            ]
+        return detail
+
+    def __repr__(self):
+        return f"<Pokemon #{self.id} {self.name}>"
+
+
+class PokemonAbility(db.Model):
+    __tablename__ = "pokemon_abilities"
+
+    pokemon_id = db.Column(db.Integer, db.ForeignKey("pokemon.id"), primary_key=True)
+    slot = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(80), nullable=False)
+    is_hidden = db.Column(db.Boolean, nullable=False, default=False)
+
+    def __repr__(self):
+        return f"<PokemonAbility #{self.pokemon_id} {self.name}>"
 
-    pokemon_id = db.Column(db.Integer, nullable=False)
-    pokemon_name = db.Column(db.String(120), nullable=False)
-    pokemon_image = db.Column(db.String(255))
 
-    height = db.Column(db.Float)
-    weight = db.Column(db.Float)
-    abilities = db.Column(db.Text)   # JSON string
-    stats = db.Column(db.Text)       # JSON string
-    types = db.Column(db.Text)       # JSON string
+class PokemonList(db.Model):
+    """Listas da PokéAPI (geração, tipo, página) guardadas como IDs."""
+    __tablename__ = "pokemon_lists"
+
+    key = db.Column(db.String(120), primary_key=True)   # ex.: "generation/1"
+    ids = db.Column(db.Text, nullable=False)            # JSON string (IDs ordenados)
+    fetched_at = db.Column(db.Float, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<PokemonList {self.key}>"
+
+
+class CatalogVersion(db.Model):
+    """
+    Contador do catálogo (uma linha só): sobe na mesma transação de toda
+    gravação/invalidação de Pokémon ou lista. Base dos ETags do catálogo,
+    lida com uma consulta pela chave primária.
+    """
+    __tablename__ = "catalog_version"
+
+    id = db.Column(db.Integer, primary_key=True)   # sempre ROW_ID
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    ROW_ID = 1
+
+    @classmethod
+    def current(cls):
+        row = db.session.get(cls, cls.ROW_ID)
+        return row.version if row else 0
+
+    @classmethod
+    def bump(cls):
+        """Incrementa na mesma transação da gravação (o chamador faz o commit)."""
+        updated = cls.query.filter_by(id=cls.ROW_ID).update({cls.version: cls.version + 1})
+        if not updated:
+            db.session.add(cls(id=cls.ROW_ID, version=1))
+
+    def __repr__(self):
+        return f"<CatalogVersion v{self.version}>"
+
+
+# ==========================================================
+# 🏷️ Versão das listas do usuário (ETag de favoritos/equipe)
+# ==========================================================
+class ListVersion(db.Model):
+    __tablename__ = "list_versions"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    kind = db.Column(db.String(20), primary_key=True)   # "favorites" | "equipe"
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    @classmethod
+    def current(cls, user_id, kind):
+        row = db.session.get(cls, (user_id, kind))
+        return row.version if row else 0
+
+    @classmethod
+    def bump(cls, user_id, kind):
+        """Incrementa na mesma transação da alteração (o chamador faz o commit)."""
+        updated = cls.query.filter_by(user_id=user_id, kind=kind).update(
+            {cls.version: cls.version + 1}
+        )
+        if not updated:
+            db.session.add(cls(user_id=user_id, kind=kind, version=1))
 
     def __repr__(self):
-        return f"<Equip {self.pokemon_name} (User {self.user_id})>"
+        return f"<ListVersion {self.kind} (User {self.user_id}) v{self.version}>"
@@ -0,0 +1,131 @@
+# pokeapi_async.py
+"""
+Cliente assíncrono da PokéAPI (aiohttp), para o caminho ASGI (asgi.py).
+
+Mesmo comportamento do pokeapi_client, no loop de eventos: pool de
+conexões keep-alive, retentativas com jitter, o MESMO circuit breaker e
+o MESMO teto de requisições/s do cliente síncrono (as duas rotas
+enxergam a PokéAPI do mesmo jeito) e coalescência de GETs idênticos
+simultâneos.
+
+    status, body = await pokeapi_async.get("pokemon/25")
+
+aiohttp e não httpx: com dezenas de GETs simultâneos o pool do httpx
+custa mais CPU que a espera na rede (medido com benchmarks/fakeapi.py).
+"""
+import asyncio
+import random
+import time
+
+import aiohttp
+
+import metrics
+from pokeapi_client import RETRY_STATUSES, pokeapi, response_outcome
+
+
+class AsyncPokeAPIClient:
+    def __init__(self):
+        self.pool_size = 100
+        self._session = None
+        self._flight = {}
+        self._counters = {
+            "requests": 0, "retries": 0, "failures": 0, "coalesced": 0,
+            "throttled": 0, "rate_limited": 0,
+        }
+
+    def init_app(self, app):
+        # URL, retentativas e breaker vêm do cliente síncrono (pokeapi.init_app)
+        self.pool_size = app.config["POKEAPI_ASYNC_POOL_SIZE"]
+
+    @property
+    def session(self):
+        # Criada no loop que vai usá-la (o do servidor ASGI)
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+            )
+        return self._session
+
+    async def aclose(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def get(self, path, timeout=5):
+        """
+        GET na PokéAPI → (status, corpo). Erros de rede e 429/5xx são
+        repetidos e a resposta final volta como veio. GETs simultâneos da
+        mesma URL compartilham uma única requisição.
+        """
+        url = pokeapi.url(path)
+        task = self._flight.get(url)
+        if task is None:
+            task = self._flight[url] = asyncio.ensure_future(self._get(url, timeout))
+            task.add_done_callback(lambda _: self._flight.pop(url, None))
+        else:
+            self._counters["coalesced"] += 1
+        # shield: um cliente que desiste não cancela a busca dos outros
+        return await asyncio.shield(task)
+
+    async def _get(self, url, timeout):
+        breaker = pokeapi.breaker
+        endpoint = metrics.pokeapi_endpoint(url, pokeapi.base_url)
+        if not breaker.allow():
+            metrics.observe_pokeapi(endpoint, "short_circuited")
+            raise ConnectionError("PokéAPI indisponível (circuit breaker aberto)")
+
+        try:
+            return await self._attempts(url, timeout, endpoint)
+        finally:
+            # Teto local estourado, cancelamento ou erro inesperado: o teste
+            # do meio-aberto não pode ficar pendurado (ver CircuitBreaker.release)
+            breaker.release()
+
+    async def _attempts(self, url, timeout, endpoint):
+        breaker = pokeapi.breaker
+        for attempt in range(pokeapi.retries + 1):
+            if attempt:
+                self._counters["retries"] += 1
+                await asyncio.sleep(random.uniform(0, pokeapi.backoff * (2 ** attempt)))
+
+            wait = pokeapi.rate_limit.reserve()
+            if wait is None:
+                self._counters["rate_limited"] += 1
+                metrics.observe_pokeapi(endpoint, "rate_limited")
+                raise ConnectionError("PokéAPI: teto local de requisições/s")
+            if wait:
+                self._counters["throttled"] += 1
+                await asyncio.sleep(wait)
+
+            self._counters["requests"] += 1
+            started = time.perf_counter()
+            try:
+                async with self.session.get(
+                    url, timeout=aiohttp.ClientTimeout(total=timeout)
+                ) as response:
+                    status, body = response.status, await response.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                outcome = "timeout" if isinstance(e, asyncio.TimeoutError) else "error"
+                metrics.observe_pokeapi(endpoint, outcome, time.perf_counter() - started)
+                if attempt < pokeapi.retries:
+                    continue
+                self._counters["failures"] += 1
+                breaker.record_failure()
+                raise
+
+            metrics.observe_pokeapi(endpoint, response_outcome(status), time.perf_counter() - started)
+            if status in RETRY_STATUSES and attempt < pokeapi.retries:
+                continue
+
+            if status in RETRY_STATUSES:
+                self._counters["failures"] += 1
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            return status, body
+
+    def stats(self):
+        return dict(self._counters, in_flight=len(self._flight))
+
+
+pokeapi_async = AsyncPokeAPIClient()
@@ -0,0 +1,304 @@
+# pokeapi_client.py
+"""
+Cliente único da PokéAPI: sessão keep-alive com pool de conexões por
+processo, retentativas com jitter para GETs, circuit breaker e teto de
+requisições por segundo (token bucket).
+
+    from pokeapi_client import pokeapi
+    pokeapi.init_app(app)
+    response = pokeapi.get("pokemon/25")
+"""
+import os
+import random
+import threading
+import time
+
+import metrics
+from singleflight import SingleFlight
+
+# Status que valem nova tentativa (e contam como falha no breaker)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# O requests (~100 ms de import) só é carregado na primeira chamada,
+# fora do boot do worker; CircuitOpenError é criada junto com ele.
+_circuit_open_error = None
+
+
+def _requests():
+    global _circuit_open_error
+    import requests
+
+    if _circuit_open_error is None:
+        class CircuitOpenError(requests.exceptions.ConnectionError):
+            """PokéAPI marcada como indisponível: falha rápido, sem rede."""
+
+        _circuit_open_error = CircuitOpenError
+    return requests
+
+
+def __getattr__(name):
+    # `from pokeapi_client import CircuitOpenError` continua funcionando
+    if name == "CircuitOpenError":
+        _requests()
+        return _circuit_open_error
+    raise AttributeError(name)
+
+
+def response_outcome(status):
+    if status < 400:
+        return "ok"
+    return "not_found" if status == 404 else "http_error"
+
+
+# ==========================================================
+# 🔌 Circuit breaker
+# ==========================================================
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, threshold=5, cooldown=30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = self.HALF_OPEN
+            # Meio-aberto: deixa passar uma única requisição de teste
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def release(self):
+        """
+        Fim de uma requisição liberada por allow(). Se ela não registrou
+        sucesso nem falha, o meio-aberto volta a aceitar um novo teste
+        (depois de record_*, não há mais teste pendente e nada muda).
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._probing = False
+
+
+# ==========================================================
+# 🪣 Token bucket (teto de requisições/s)
+# ==========================================================
+class TokenBucket:
+    """
+    `rate` fichas por segundo, até `burst` acumuladas. reserve() pega uma
+    ficha e diz quanto esperar por ela; None se a espera passaria de
+    `max_wait` (a ficha é devolvida). rate 0 = sem teto.
+    """
+
+    def __init__(self, rate=0.0, burst=1, max_wait=0.0):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_wait = max_wait
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Saldo negativo = fichas já prometidas a quem está esperando
+            wait = max(0.0, (1 - self.tokens) / self.rate)
+            if wait > self.max_wait:
+                return None
+            self.tokens -= 1
+            return wait
+
+
+# ==========================================================
+# 🌐 Cliente
+# ==========================================================
+class PokeAPIClient:
+    def __init__(self, app=None):
+        self.base_url = "https://pokeapi.co/api/v2/"
+        self.pool_size = 32
+        self.retries = 2
+        self.backoff = 0.2
+        self.breaker = CircuitBreaker()
+        self.rate_limit = TokenBucket()
+
+        self._flight = SingleFlight()
+        self._session = None
+        self._session_pid = None
+        self._lock = threading.Lock()
+        self._counters = {
+            "requests": 0, "retries": 0, "failures": 0, "short_circuited": 0,
+            "throttled": 0, "rate_limited": 0,
+        }
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.base_url = app.config["POKEAPI_URL"].rstrip("/") + "/"
+        self.pool_size = app.config["POKEAPI_POOL_SIZE"]
+        self.retries = app.config["POKEAPI_RETRIES"]
+        self.backoff = app.config["POKEAPI_RETRY_BACKOFF"]
+        self.breaker = CircuitBreaker(
+            threshold=app.config["POKEAPI_BREAKER_THRESHOLD"],
+            cooldown=app.config["POKEAPI_BREAKER_COOLDOWN"],
+        )
+        self.rate_limit = TokenBucket(
+            rate=app.config["POKEAPI_RATE_LIMIT"],
+            burst=app.config["POKEAPI_RATE_BURST"],
+            max_wait=app.config["POKEAPI_RATE_MAX_WAIT"],
+        )
+        app.extensions["pokeapi"] = self
+
+    @property
+    def session(self):
+        # Uma sessão por processo: conexões não sobrevivem ao fork do gunicorn
+        if self._session is None or self._session_pid != os.getpid():
+            with self._lock:
+                if self._session is None or self._session_pid != os.getpid():
+                    requests = _requests()
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=4,
+                        pool_maxsize=self.pool_size,
+                        pool_block=False,
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+                    self._session_pid = os.getpid()
+        return self._session
+
+    def url(self, path):
+        if path.startswith(("http://", "https://")):
+            return path
+        return f"{self.base_url}{path.lstrip('/')}"
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def get(self, path, timeout=5):
+        """
+        GET na PokéAPI. Erros de rede e status 429/5xx são repetidos
+        (backoff exponencial com jitter); a resposta final é devolvida
+        como veio, cabendo ao chamador tratar 404/raise_for_status.
+
+        GETs simultâneos da mesma URL (entre threads do worker) viram
+        uma única requisição e recebem a mesma resposta.
+        """
+        url = self.url(path)
+        return self._flight.do(url, lambda: self._get(url, timeout))
+
+    def _get(self, url, timeout):
+        endpoint = metrics.pokeapi_endpoint(url, self.base_url)
+        if not self.breaker.allow():
+            self._count("short_circuited")
+            metrics.observe_pokeapi(endpoint, "short_circuited")
+            raise _circuit_open_error("PokéAPI indisponível (circuit breaker aberto)")
+
+        try:
+            return self._attempts(url, timeout, endpoint)
+        finally:
+            # Qualquer outra saída (ChunkedEncodingError, InvalidURL...) não
+            # pode deixar o meio-aberto esperando o teste para sempre
+            self.breaker.release()
+
+    def _attempts(self, url, timeout, endpoint):
+        requests = _requests()
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self._count("retries")
+                time.sleep(random.uniform(0, self.backoff * (2 ** attempt)))
+
+            wait = self.rate_limit.reserve()
+            if wait is None:
+                # Teto local: melhor falhar já do que tomar 429 da PokéAPI
+                self._count("rate_limited")
+                metrics.observe_pokeapi(endpoint, "rate_limited")
+                raise requests.exceptions.ConnectionError("PokéAPI: teto local de requisições/s")
+            if wait:
+                self._count("throttled")
+                time.sleep(wait)
+
+            self._count("requests")
+            started = time.perf_counter()
+            try:
+                response = self.session.get(url, timeout=timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                outcome = "timeout" if isinstance(e, requests.exceptions.Timeout) else "error"
+                metrics.observe_pokeapi(endpoint, outcome, time.perf_counter() - started)
+                if attempt < self.retries:
+                    continue
+                self._count("failures")
+                self.breaker.record_failure()
+                raise
+
+            metrics.observe_pokeapi(
+                endpoint, response_outcome(response.status_code), time.perf_counter() - started
+            )
+            if response.status_code in RETRY_STATUSES and attempt < self.retries:
+                continue
+
+            if response.status_code in RETRY_STATUSES:
+                self._count("failures")
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            return response
+
+    def stats(self):
+        """Contadores para monitoramento (por processo)."""
+        with self._lock:
+            counters = dict(self._counters)
+
+        opened = served = 0
+        if self._session is not None:
+            # O mesmo adapter está montado em http:// e https://
+            for adapter in {id(a): a for a in self._session.adapters.values()}.values():
+                for key in adapter.poolmanager.pools.keys():
+                    pool = adapter.poolmanager.pools.get(key)
+                    if pool is not None:
+                        opened += pool.num_connections
+                        served += pool.num_requests
+
+        counters.update({
+            "connections_opened": opened,
+            "connection_reuse_rate": round(1 - opened / served, 4) if served else None,
+            "breaker_state": self.breaker.state,
+            "breaker_failures": self.breaker.failures,
+            "coalesced": self._flight.stats()["coalesced"],
+        })
+        return counters
+
+
+pokeapi = PokeAPIClient()
@@ -0,0 +1,132 @@
+# pokedex_index.py
+"""
+Índice invertido geração × tipo em memória (um por processo).
+
+Cada geração/tipo vira um bitset (int do Python, bit N = Pokédex #N),
+então qualquer combinação de filtros é só &/| entre inteiros.
+"""
+import json
+import threading
+import time
+
+from flask import current_app
+
+import catalog
+from models import PokemonList
+from refresher import refresher
+
+
+# ==========================================================
+# 🧮 Bitsets
+# ==========================================================
+def to_bitset(ids):
+    if not ids:
+        return 0
+    buf = bytearray(max(ids) // 8 + 1)
+    for i in ids:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, "little")
+
+
+def from_bitset(bits):
+    """Bitset → lista de IDs em ordem crescente."""
+    ids = []
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    for byte_index, byte in enumerate(data):
+        while byte:
+            low = byte & -byte
+            ids.append(byte_index * 8 + low.bit_length() - 1)
+            byte ^= low
+    return ids
+
+
+# ==========================================================
+# 📇 Índice
+# ==========================================================
+class PokedexIndex:
+    def __init__(self, lists, version, stale=()):
+        self.bits = {key: to_bitset(ids) for key, ids in lists.items()}
+        self.stale = set(stale)   # vencidas dentro da tolerância: renovar ao usar
+        self.version = version
+        self.built_at = time.monotonic()
+
+    def get(self, key):
+        return self.bits.get(key)
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def _build():
+    rows = PokemonList.query.filter(
+        PokemonList.key.like("generation/%") | PokemonList.key.like("type/%")
+    ).all()
+    # Listas vencidas além da tolerância ficam de fora: o read-through do
+    # catálogo busca na hora (dentro dela, o refresher renova)
+    rows = [row for row in rows if catalog.is_servable(row)]
+    lists = {row.key: json.loads(row.ids) for row in rows}
+    stale = [row.key for row in rows if not catalog.is_fresh(row)]
+    return PokedexIndex(lists, catalog.lists_version(), stale)
+
+
+def get_index():
+    """Índice atual; reconstruído quando o catálogo muda ou envelhece."""
+    global _index
+    index = _index
+    max_age = current_app.config["POKEDEX_INDEX_MAX_AGE"]
+    if (
+        index is None
+        or index.version != catalog.lists_version()
+        or time.monotonic() - index.built_at > max_age
+    ):
+        with _lock:
+            if _index is index:
+                _index = _build()
+            index = _index
+    return index
+
+
+def _bits_for(index, key, load):
+    bits = index.get(key)
+    if key in index.stale:
+        refresher.schedule("list", key)
+    if bits is None:
+        # Ainda não está no catálogo → read-through (grava e invalida o índice)
+        bits = to_bitset(load())
+    return bits
+
+
+def select_ids(generations=(), types=(), type_mode="or"):
+    """
+    IDs (ordenados) que estão em QUALQUER uma das gerações e em
+    QUALQUER (type_mode="or") ou TODOS (type_mode="and") os tipos.
+    """
+    index = get_index()
+    result = None
+
+    if generations:
+        gen_bits = 0
+        for generation_id in generations:
+            gen_bits |= _bits_for(
+                index, catalog.generation_key(generation_id),
+                lambda: catalog.generation_members(generation_id),
+            )
+        result = gen_bits
+
+    if types:
+        type_bits = None
+        for type_name in types:
+            bits = _bits_for(
+                index, catalog.type_key(type_name),
+                lambda: catalog.type_members(type_name),
+            )
+            if type_bits is None:
+                type_bits = bits
+            elif type_mode == "and":
+                type_bits &= bits
+            else:
+                type_bits |= bits
+        result = type_bits if result is None else result & type_bits
+
+    return from_bitset(result or 0)
@@ -0,0 +1,296 @@
+# profiling.py
+"""
+Perfil de uma requisição, sob demanda, com saída para flame graph.
+
+Liga por requisição:
+- header `X-Profile: 1` com token de admin, ou
+- amostragem: PROFILE_SAMPLE_RATE (fração das requisições, padrão 0)
+
+Uma thread amostra a pilha da thread da requisição (e das threads do
+fetcher que ela abrir) a cada PROFILE_INTERVAL_MS, então espera na
+PokéAPI (socket), parse de JSON e SQLAlchemy aparecem separados. O
+resultado vai para um anel em disco (PROFILE_DIR, PROFILE_RING_SIZE
+perfis, compartilhado entre os workers) e o id volta no header
+X-Profile-Id.
+
+    GET /api/profiles                       lista (admin)
+    GET /api/profiles/<id>                  pilhas colapsadas (flamegraph.pl, speedscope)
+    GET /api/profiles/<id>?format=speedscope
+
+Desligado, o custo é uma consulta de header e uma comparação por requisição.
+"""
+import itertools
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from flask import Blueprint, Response, current_app, g, jsonify, request
+from flask_jwt_extended import jwt_required, verify_jwt_in_request
+
+import identity
+
+profiling_bp = Blueprint("profiling", __name__, url_prefix="/api/profiles")
+
+# Prefixo das threads do fetcher: com perfil ativo, leva o id do perfil
+FETCH_THREAD_PREFIX = "fetch"
+
+_ids = itertools.count(1)
+
+
+# ==========================================================
+# 🧵 Amostrador
+# ==========================================================
+def _frame_name(code):
+    # Últimos dois componentes do caminho: curto, mas distingue os pacotes
+    filename = "/".join(code.co_filename.replace("\\", "/").rsplit("/", 2)[-2:])
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _collapse(frame):
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame.f_code))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class Sampler(threading.Thread):
+    """Conta pilhas colapsadas da thread alvo e das threads com `prefix`."""
+
+    def __init__(self, thread_id, prefix, interval, max_seconds):
+        super().__init__(name=f"profiler-{prefix}", daemon=True)
+        self.thread_id = thread_id
+        self.prefix = prefix
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        deadline = time.monotonic() + self.max_seconds
+        while not self._stop_event.wait(self.interval) and time.monotonic() < deadline:
+            frames = sys._current_frames()
+            targets = {self.thread_id: "request"}
+            for thread in threading.enumerate():
+                # ThreadPoolExecutor nomeia as threads "<prefixo>_<n>"
+                if thread.name.startswith(f"{self.prefix}_"):
+                    targets[thread.ident] = "fetch"
+            for thread_id, root in targets.items():
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self.stacks[f"{root};{_collapse(frame)}"] += 1
+            self.samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def fetch_thread_prefix():
+    """Nome das threads do fetcher; dentro de um perfil, amostradas junto."""
+    try:
+        return g._profile["prefix"]
+    except (AttributeError, KeyError, RuntimeError):
+        return FETCH_THREAD_PREFIX
+
+
+# ==========================================================
+# 💾 Anel em disco
+# ==========================================================
+def profile_dir():
+    return current_app.config["PROFILE_DIR"] or os.path.join(
+        current_app.instance_path, "profiles"
+    )
+
+
+def _paths(profile_id):
+    base = os.path.join(profile_dir(), profile_id)
+    return f"{base}.json", f"{base}.collapsed"
+
+
+def _save(meta, stacks):
+    folder = profile_dir()
+    os.makedirs(folder, exist_ok=True)
+    meta_path, stacks_path = _paths(meta["id"])
+    with open(stacks_path, "w", encoding="utf-8") as fp:
+        for stack, count in stacks.most_common():
+            fp.write(f"{stack} {count}\n")
+    # Metadados por último: a listagem só vê perfis completos
+    with open(meta_path, "w", encoding="utf-8") as fp:
+        json.dump(meta, fp)
+
+    # Ids começam pelo horário → ordem alfabética = ordem de criação
+    ring = sorted(name for name in os.listdir(folder) if name.endswith(".json"))
+    for name in ring[:-current_app.config["PROFILE_RING_SIZE"]]:
+        for path in _paths(name[:-len(".json")]):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def list_profiles():
+    folder = profile_dir()
+    if not os.path.isdir(folder):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(folder), reverse=True):
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(folder, name), encoding="utf-8") as fp:
+                profiles.append(json.load(fp))
+        except (OSError, ValueError):
+            continue   # removido pelo anel no meio da leitura
+    return profiles
+
+
+def to_speedscope(profile_id, collapsed, interval_ms):
+    """Pilhas colapsadas → arquivo do speedscope (perfil 'sampled')."""
+    frames, index, samples, weights = [], {}, [], []
+    for line in collapsed.splitlines():
+        stack, _, count = line.rpartition(" ")
+        ids = []
+        for name in stack.split(";"):
+            if name not in index:
+                index[name] = len(frames)
+                frames.append({"name": name})
+            ids.append(index[name])
+        samples.append(ids)
+        weights.append(int(count) * interval_ms)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": frames},
+        "profiles": [{
+            "type": "sampled", "name": profile_id, "unit": "milliseconds",
+            "startValue": 0, "endValue": sum(weights),
+            "samples": samples, "weights": weights,
+        }],
+    }
+
+
+# ==========================================================
+# 🔌 Ganchos da requisição
+# ==========================================================
+def _requested_by_admin():
+    if request.headers.get("X-Profile") not in ("1", "true"):
+        return False
+    try:
+        verify_jwt_in_request(optional=True)
+        return identity.is_admin()
+    except Exception:
+        return False   # token inválido: a rota responde o erro normalmente
+
+
+def _before_request():
+    if request.blueprint == profiling_bp.name:
+        return
+    rate = current_app.config["PROFILE_SAMPLE_RATE"]
+    if _requested_by_admin():
+        trigger = "header"
+    elif rate and random.random() < rate:
+        trigger = "sampled"
+    else:
+        return
+
+    profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{next(_ids):06d}"
+    sampler = Sampler(
+        threading.get_ident(),
+        prefix=f"{FETCH_THREAD_PREFIX}-{profile_id}",
+        interval=current_app.config["PROFILE_INTERVAL_MS"] / 1000,
+        max_seconds=current_app.config["PROFILE_MAX_SECONDS"],
+    )
+    g._profile = {
+        "id": profile_id, "prefix": sampler.prefix, "sampler": sampler,
+        "trigger": trigger, "started": time.perf_counter(), "started_at": time.time(),
+    }
+    sampler.start()
+
+
+def _after_request(response):
+    profile = g.get("_profile")
+    if profile is not None:
+        response.headers["X-Profile-Id"] = profile["id"]
+        profile["status"] = response.status_code
+    return response
+
+
+def _teardown_request(exc):
+    # Com streaming (ndjson) o teardown só roda ao fim da resposta
+    profile = g.pop("_profile", None)
+    if profile is None:
+        return
+    sampler = profile["sampler"]
+    sampler.stop()
+    duration = time.perf_counter() - profile["started"]
+    meta = {
+        "id": profile["id"],
+        "method": request.method,
+        "path": request.full_path.rstrip("?"),
+        "route": request.url_rule.rule if request.url_rule is not None else None,
+        "status": profile.get("status", 500),
+        "trigger": profile["trigger"],
+        "pid": os.getpid(),
+        "started_at": round(profile["started_at"], 3),
+        "duration_ms": round(duration * 1000, 1),
+        "interval_ms": current_app.config["PROFILE_INTERVAL_MS"],
+        "samples": sampler.samples,
+    }
+    try:
+        _save(meta, sampler.stacks)
+    except OSError as e:
+        print(f"Falha ao gravar perfil {profile['id']}: {e}")
+
+
+def init_app(app):
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    app.register_blueprint(profiling_bp)
+
+
+# ==========================================================
+# 📋 Rotas (admin)
+# ==========================================================
+@profiling_bp.get("")
+@jwt_required()
+def get_profiles():
+    if not identity.is_admin():
+        return jsonify({"error": "Acesso negado"}), 403
+    return jsonify(list_profiles()), 200
+
+
+@profiling_bp.get("/<profile_id>")
+@jwt_required()
+def get_profile(profile_id):
+    if not identity.is_admin():
+        return jsonify({"error": "Acesso negado"}), 403
+
+    # O id vira nome de arquivo → nada de separadores de caminho
+    if not profile_id.replace("-", "").isalnum():
+        return jsonify({"msg": "Perfil não encontrado"}), 404
+    meta_path, stacks_path = _paths(profile_id)
+    try:
+        with open(meta_path, encoding="utf-8") as fp:
+            meta = json.load(fp)
+        with open(stacks_path, encoding="utf-8") as fp:
+            collapsed = fp.read()
+    except (OSError, ValueError):
+        return jsonify({"msg": "Perfil não encontrado"}), 404
+
+    fmt = request.args.get("format", "collapsed")
+    if fmt == "collapsed":
+        response = Response(collapsed, mimetype="text/plain")
+        filename = f"{profile_id}.collapsed.txt"
+    elif fmt == "speedscope":
+        response = jsonify(to_speedscope(profile_id, collapsed, meta["interval_ms"]))
+        filename = f"{profile_id}.speedscope.json"
+    else:
+        return jsonify({"msg": "format deve ser 'collapsed' ou 'speedscope'"}), 400
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
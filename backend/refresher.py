@@ -0,0 +1,130 @@
+# refresher.py
+"""
+Renovação do catálogo em segundo plano (stale-while-revalidate).
+
+Quando uma leitura encontra um Pokémon/lista vencido, mas ainda dentro de
+CATALOG_STALE_GRACE, o dado velho é servido na hora e um job entra aqui:
+
+    refresher.schedule("pokemon", 25)
+    refresher.schedule("list", "type/fire")
+
+- jobs deduplicados: a mesma chave não entra duas vezes enquanto espera
+  ou roda
+- concorrência limitada: REFRESH_WORKERS threads por processo
+- fila limitada: acima de REFRESH_QUEUE_MAX o job é descartado (o dado
+  continua servível e a próxima leitura agenda de novo)
+- teto de REFRESH_RATE_LIMIT requisições/s, além do teto geral do
+  cliente da PokéAPI: a renovação nunca disputa a cota com o usuário
+
+As threads sobem no primeiro job de cada processo (nada roda no master do
+gunicorn nem no boot do worker).
+"""
+import os
+import queue
+import threading
+import time
+
+import metrics
+from pokeapi_client import TokenBucket
+
+
+class Refresher:
+    def __init__(self):
+        self.app = None
+        self.workers = 2
+        self.max_queue = 1000
+        self.rate_limit = TokenBucket()
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._running = 0
+        self._threads_pid = None
+        self._lock = threading.Lock()
+        self._counters = {
+            "scheduled": 0, "deduplicated": 0, "dropped": 0,
+            "ok": 0, "not_found": 0, "skipped": 0, "error": 0,
+        }
+
+    def init_app(self, app):
+        self.app = app
+        self.workers = app.config["REFRESH_WORKERS"]
+        self.max_queue = app.config["REFRESH_QUEUE_MAX"]
+        # Job em segundo plano pode esperar a vez: sem prazo máximo
+        self.rate_limit = TokenBucket(
+            rate=app.config["REFRESH_RATE_LIMIT"], burst=1, max_wait=float("inf"),
+        )
+        app.extensions["refresher"] = self
+
+    def _ensure_threads(self):
+        # Threads não sobrevivem ao fork: uma leva por processo
+        if self._threads_pid == os.getpid():
+            return
+        with self._lock:
+            if self._threads_pid == os.getpid():
+                return
+            self._queue = queue.Queue()
+            self._pending = set()
+            self._running = 0
+            for n in range(self.workers):
+                threading.Thread(target=self._work, name=f"refresher_{n}", daemon=True).start()
+            self._threads_pid = os.getpid()
+
+    def schedule(self, kind, key):
+        """Agenda a renovação de (kind, key). False se já estava na fila ou foi descartado."""
+        if self.app is None or self.workers <= 0:
+            return False
+        self._ensure_threads()
+        job = (kind, key)
+        with self._lock:
+            if job in self._pending:
+                self._counters["deduplicated"] += 1
+                metrics.observe_refresh(kind, "deduplicated")
+                return False
+            if len(self._pending) >= self.max_queue:
+                self._counters["dropped"] += 1
+                metrics.observe_refresh(kind, "dropped")
+                return False
+            self._pending.add(job)
+            self._counters["scheduled"] += 1
+            self._queue.put(job)
+            metrics.set_refresh_queue(len(self._pending) - self._running)
+        return True
+
+    def _work(self):
+        import catalog   # import tardio: o catálogo importa este módulo
+
+        jobs = {"pokemon": catalog.refresh_pokemon, "list": catalog.refresh_list}
+        while True:
+            job = self._queue.get()
+            kind, key = job
+            with self._lock:
+                self._running += 1
+                metrics.set_refresh_queue(len(self._pending) - self._running)
+            outcome = "error"
+            try:
+                wait = self.rate_limit.reserve()
+                if wait:
+                    time.sleep(wait)
+                with self.app.app_context():
+                    outcome = jobs[kind](key)
+            except Exception as e:
+                print(f"Renovação de {kind} {key} falhou: {e}")
+            finally:
+                with self._lock:
+                    self._pending.discard(job)
+                    self._running -= 1
+                    self._counters[outcome] += 1
+                    metrics.set_refresh_queue(len(self._pending) - self._running)
+                metrics.observe_refresh(kind, outcome)
+
+    def stats(self):
+        """Fila e contadores deste processo."""
+        with self._lock:
+            counters = dict(self._counters)
+            counters.update(
+                queued=len(self._pending) - self._running, running=self._running,
+                workers=self.workers,
+            )
+        return counters
+
+
+refresher = Refresher()
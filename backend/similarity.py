@@ -0,0 +1,165 @@
+# similarity.py
+"""
+Pokémon parecidos pelos stats base (vizinhos mais próximos).
+
+A Pokédex inteira vira uma matriz float32 contígua (n × 6, uma linha por
+Pokémon com os seis stats), em memória por processo. Uma consulta é uma
+única conta vetorizada de distância da linha de referência contra todas
+as outras, com máscara opcional por tipo/geração, e argpartition para os
+k menores.
+
+Quando catalog_version() muda, só (id, fetched_at) de cada Pokémon é
+relido e comparado com o da matriz: os stats são lidos só dos IDs novos
+ou com fetched_at diferente, e aplicados numa cópia da matriz. Nada de
+marca d'água por tempo: uma linha gravada fora de ordem (carimbada antes
+e commitada depois de outra) ou com fetched_at=0 não escapa.
+
+Importado só pela rota (/pokemon/<id>/similar): o NumPy não entra no
+boot do worker.
+"""
+import threading
+
+import numpy as np
+
+from models import Pokemon
+
+STAT_COLUMNS = [Pokemon.hp, Pokemon.attack, Pokemon.defense,
+                Pokemon.special_attack, Pokemon.special_defense, Pokemon.speed]
+METRICS = ("euclidean", "manhattan", "cosine")
+
+
+# ==========================================================
+# 🧮 Matriz de stats
+# ==========================================================
+class StatMatrix:
+    """IDs ordenados + stats (n × 6) + fetched_at de cada linha. Imutável: atualizações geram outra."""
+
+    def __init__(self, ids, stats, stamps, version):
+        self.ids = ids
+        self.stats = np.ascontiguousarray(stats, dtype=np.float32)
+        self.stamps = stamps
+        self.version = version
+
+    def row(self, pokemon_id):
+        i = np.searchsorted(self.ids, pokemon_id)
+        return i if i < len(self.ids) and self.ids[i] == pokemon_id else None
+
+    def _positions(self, ids):
+        """(posição de cada id na matriz, máscara dos que já estão nela)."""
+        positions = np.searchsorted(self.ids, ids)
+        found = positions < len(self.ids)
+        found[found] = self.ids[positions[found]] == ids[found]
+        return positions, found
+
+    def changed(self, ids, stamps):
+        """IDs de (ids, stamps) novos ou com fetched_at diferente do da matriz."""
+        positions, found = self._positions(ids)
+        same = found.copy()
+        same[found] = self.stamps[positions[found]] == stamps[found]
+        return ids[~same]
+
+    def patched(self, ids, stats, stamps, version):
+        """Nova matriz com `ids` substituídos/inseridos."""
+        if not len(ids):
+            return StatMatrix(self.ids, self.stats, self.stamps, version)
+        positions, found = self._positions(ids)
+
+        merged_ids = np.concatenate([self.ids, ids[~found]])
+        merged = np.concatenate([self.stats, stats[~found]])
+        merged[positions[found]] = stats[found]
+        merged_stamps = np.concatenate([self.stamps, stamps[~found]])
+        merged_stamps[positions[found]] = stamps[found]
+        order = np.argsort(merged_ids, kind="stable")
+        return StatMatrix(merged_ids[order], merged[order], merged_stamps[order], version)
+
+
+def _complete():
+    """Filtro: só Pokémon com os seis stats."""
+    return [column.isnot(None) for column in STAT_COLUMNS]
+
+
+def _stamps():
+    """(ids, fetched_at) de todos os Pokémon com os seis stats, em ordem de ID."""
+    rows = (
+        Pokemon.query.with_entities(Pokemon.id, Pokemon.fetched_at)
+        .filter(*_complete()).order_by(Pokemon.id).all()
+    )
+    ids = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+    stamps = np.fromiter((r[1] or 0 for r in rows), dtype=np.float64, count=len(rows))
+    return ids, stamps
+
+
+def _rows(ids=None):
+    """(ids, stats, fetched_at) dos Pokémon com os seis stats (todos, ou só `ids`)."""
+    query = Pokemon.query.with_entities(Pokemon.id, Pokemon.fetched_at, *STAT_COLUMNS)
+    query = query.filter(*_complete())
+    if ids is not None:
+        query = query.filter(Pokemon.id.in_(ids.tolist()))
+    rows = query.order_by(Pokemon.id).all()
+
+    found = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+    stats = np.array([r[2:] for r in rows], dtype=np.float32).reshape(len(rows), len(STAT_COLUMNS))
+    stamps = np.fromiter((r[1] or 0 for r in rows), dtype=np.float64, count=len(rows))
+    return found, stats, stamps
+
+
+_matrix = None
+_lock = threading.Lock()
+
+
+def get_matrix(version):
+    """Matriz atual; atualizada (só o que mudou) quando a versão do catálogo muda."""
+    global _matrix
+    matrix = _matrix
+    if matrix is not None and matrix.version == version:
+        return matrix
+    with _lock:
+        if _matrix is not None and _matrix.version != version:
+            ids, stamps = _stamps()
+            changed = _matrix.changed(ids, stamps)
+            if len(np.intersect1d(_matrix.ids, ids)) < len(_matrix.ids) or len(changed) > len(ids) // 2:
+                # Linha perdeu stats (raro) ou quase tudo mudou (invalidate geral): refaz
+                _matrix = None
+            else:
+                _matrix = _matrix.patched(*_rows(changed), version)
+        if _matrix is None:
+            ids, stats, stamps = _rows()
+            _matrix = StatMatrix(ids, stats, stamps, version)
+        return _matrix
+
+
+# ==========================================================
+# 🔎 Consulta
+# ==========================================================
+def distances(stats, reference, metric):
+    if metric == "manhattan":
+        return np.abs(stats - reference).sum(axis=1)
+    if metric == "cosine":
+        norms = np.linalg.norm(stats, axis=1) * np.linalg.norm(reference)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return 1 - (stats @ reference) / norms
+    return np.sqrt(((stats - reference) ** 2).sum(axis=1))
+
+
+def nearest(matrix, pokemon_id, k, metric="euclidean", allowed_ids=None):
+    """
+    [(id, distância)] dos k mais próximos de `pokemon_id` (ele mesmo fora),
+    só entre `allowed_ids` se vier. None se o Pokémon não tem os seis stats.
+    """
+    row = matrix.row(pokemon_id)
+    if row is None:
+        return None
+
+    mask = matrix.ids != pokemon_id
+    if allowed_ids is not None:
+        mask &= np.isin(matrix.ids, np.asarray(allowed_ids, dtype=np.int64))
+    candidates = np.flatnonzero(mask)
+    if not len(candidates) or k <= 0:
+        return []
+
+    found = distances(matrix.stats[candidates], matrix.stats[row], metric)
+    found = np.nan_to_num(found, nan=np.inf)
+    k = min(k, len(found))
+    top = np.argpartition(found, k - 1)[:k]
+    top = top[np.argsort(found[top], kind="stable")]
+    return [(int(matrix.ids[candidates[i]]), float(found[i])) for i in top]
@@ -0,0 +1,54 @@
+# singleflight.py
+"""
+Coalescência de chamadas idênticas simultâneas (single-flight).
+
+Enquanto uma chamada para `key` está em andamento, as outras threads
+que pedirem a mesma chave esperam por ela e recebem o mesmo resultado
+(ou a mesma exceção), em vez de repetir o trabalho.
+"""
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._counters = {"leaders": 0, "coalesced": 0}
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._counters["leaders"] += 1
+            else:
+                self._counters["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters, in_flight=len(self._calls))
@@ -0,0 +1,244 @@
+# sprites.py
+"""
+Proxy de sprites com cache em disco endereçado por conteúdo.
+
+    GET /sprites/25            sprite original
+    GET /sprites/25?size=48    miniatura pré-gerada (tamanhos em SPRITE_SIZES)
+
+Na primeira vez o sprite é baixado (sprite_url do catálogo) e gravado em
+objects/<sha256[:2]>/<sha256>.png; refs/<id>/<variante> aponta para o
+objeto, então sprites idênticos ocupam um arquivo só. As miniaturas são
+geradas junto com o original (requer Pillow; sem ele, serve o original).
+
+Os arquivos são servidos direto do disco (send_file → wsgi.file_wrapper /
+sendfile). A URL não muda quando o sprite muda (novo sprite_url, ref
+refeita), então o cache HTTP é curto (SPRITE_MAX_AGE) e revalidado pelo
+ETag, que é o sha256 do objeto: um 304 sem corpo enquanto nada mudou.
+O diretório tem um teto de tamanho: os objetos menos usados recentemente
+(mtime) são removidos primeiro.
+"""
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import time
+from urllib.parse import urlparse
+
+from flask import Blueprint, current_app, jsonify, redirect, request, send_file
+
+import catalog
+from pokeapi_client import pokeapi
+from singleflight import SingleFlight
+
+try:
+    from PIL import Image
+except ImportError:   # Pillow é opcional: sem ele não há miniaturas
+    Image = None
+
+sprites_bp = Blueprint("sprites", __name__, url_prefix="/sprites")
+
+ORIGINAL = "orig"
+# Só renova o mtime (LRU) de um objeto servido se ele for mais velho que isso
+_TOUCH_INTERVAL = 3600
+
+_flight = SingleFlight()
+_lock = threading.Lock()
+_disk_usage = None   # bytes em objects/ (estimativa do processo)
+
+
+# ==========================================================
+# 📁 Layout do cache
+# ==========================================================
+def cache_dir():
+    return current_app.config["SPRITE_CACHE_DIR"] or os.path.join(
+        current_app.instance_path, "sprites"
+    )
+
+
+def _object_path(digest):
+    return os.path.join(cache_dir(), "objects", digest[:2], f"{digest}.png")
+
+
+def _ref_path(pokemon_id, variant):
+    return os.path.join(cache_dir(), "refs", str(pokemon_id), variant)
+
+
+def _atomic_write(path, data, mode="wb"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, mode) as fp:
+        fp.write(data)
+    os.replace(tmp, path)
+
+
+def _store_object(data):
+    """Grava os bytes (se ainda não existem) e devolve o sha256."""
+    global _disk_usage
+    digest = hashlib.sha256(data).hexdigest()
+    path = _object_path(digest)
+    if not os.path.exists(path):
+        _atomic_write(path, data)
+        with _lock:
+            if _disk_usage is not None:
+                _disk_usage += len(data)
+    return digest
+
+
+def _resolve(pokemon_id, variant):
+    """Caminho do objeto de uma variante já em cache, ou None."""
+    try:
+        with open(_ref_path(pokemon_id, variant), encoding="ascii") as fp:
+            digest = fp.read().strip()
+    except OSError:
+        return None, None
+    path = _object_path(digest)
+    # O objeto pode ter sido removido pelo LRU → trata como falta
+    return (path, digest) if os.path.exists(path) else (None, None)
+
+
+# ==========================================================
+# 🧹 Teto de tamanho (LRU por mtime)
+# ==========================================================
+def _scan_objects():
+    entries = []
+    for root, _, files in os.walk(os.path.join(cache_dir(), "objects")):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+    return entries
+
+
+def enforce_limit():
+    """Remove os objetos mais antigos até ficar em 90% do teto."""
+    global _disk_usage
+    max_bytes = current_app.config["SPRITE_CACHE_MAX_BYTES"]
+    with _lock:
+        if _disk_usage is not None and _disk_usage <= max_bytes:
+            return 0
+
+        entries = _scan_objects()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        if total > max_bytes:
+            target = int(max_bytes * 0.9)
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+        _disk_usage = total
+        return removed
+
+
+def _touch(path):
+    try:
+        if time.time() - os.stat(path).st_mtime > _TOUCH_INTERVAL:
+            os.utime(path)
+    except OSError:
+        pass
+
+
+# ==========================================================
+# 🌐 Download + miniaturas
+# ==========================================================
+def sizes():
+    return current_app.config["SPRITE_SIZES"]
+
+
+def _allowed_source(url):
+    # sprite_url pode vir do cliente (favoritos) → só hosts conhecidos
+    host = urlparse(url or "").hostname
+    return host in current_app.config["SPRITE_SOURCE_HOSTS"]
+
+
+def _download(url):
+    max_bytes = current_app.config["SPRITE_MAX_SOURCE_BYTES"]
+    response = pokeapi.session.get(url, timeout=10, stream=True)
+    try:
+        response.raise_for_status()
+        buf = io.BytesIO()
+        for chunk in response.iter_content(64 * 1024):
+            buf.write(chunk)
+            if buf.tell() > max_bytes:
+                raise ValueError("sprite grande demais")
+        return buf.getvalue()
+    finally:
+        response.close()
+
+
+def _thumbnail(data, size):
+    with Image.open(io.BytesIO(data)) as img:
+        img = img.convert("RGBA")
+        img.thumbnail((size, size), Image.LANCZOS)
+        out = io.BytesIO()
+        img.save(out, format="PNG", optimize=True)
+        return out.getvalue()
+
+
+def _fill(pokemon_id, source_url):
+    """Baixa o original e pré-gera as miniaturas de um Pokémon."""
+    data = _download(source_url)
+    variants = {ORIGINAL: _store_object(data)}
+    if Image is not None:
+        for size in sizes():
+            variants[str(size)] = _store_object(_thumbnail(data, size))
+    # Refs por último: quem lê nunca vê uma ref sem objeto
+    for variant, digest in variants.items():
+        _atomic_write(_ref_path(pokemon_id, variant), digest, mode="w")
+    enforce_limit()
+
+
+# ==========================================================
+# 🖼️ GET /sprites/<id>
+# ==========================================================
+@sprites_bp.get("/<int:pokemon_id>")
+def get_sprite(pokemon_id):
+    size = request.args.get("size", type=int)
+    if size is not None and size not in sizes():
+        return jsonify({"msg": f"size deve ser um de {sizes()}"}), 400
+    # Sem Pillow não há miniaturas: o original atende qualquer tamanho
+    variant = str(size) if size is not None and Image is not None else ORIGINAL
+
+    path, digest = _resolve(pokemon_id, variant)
+    if path is None:
+        try:
+            pokemon = catalog.get_pokemon(pokemon_id)
+        except Exception:
+            # PokéAPI fora e Pokémon ainda fora do catálogo
+            return jsonify({"msg": "Erro ao comunicar com o serviço de Pokémon externo."}), 503
+        if pokemon is None or not _allowed_source(pokemon.sprite_url):
+            return jsonify({"msg": "Sprite não encontrado"}), 404
+
+        try:
+            _flight.do(pokemon_id, lambda: _fill(pokemon_id, pokemon.sprite_url))
+        except Exception as e:
+            # Sem cache local → o navegador busca direto na origem desta vez
+            print(f"Falha ao baixar sprite #{pokemon_id}: {e}")
+            response = redirect(pokemon.sprite_url, code=302)
+            response.headers["Cache-Control"] = "no-store"
+            return response
+
+        path, digest = _resolve(pokemon_id, variant)
+        if path is None:
+            return jsonify({"msg": "Sprite não encontrado"}), 404
+
+    _touch(path)
+    response = send_file(
+        path, mimetype="image/png", etag=digest, conditional=True,
+        max_age=current_app.config["SPRITE_MAX_AGE"],
+    )
+    # Sem immutable: /sprites/<id> não é endereçado por conteúdo
+    response.headers["Cache-Control"] = (
+        f"public, max-age={current_app.config['SPRITE_MAX_AGE']}, must-revalidate"
+    )
+    return response
+
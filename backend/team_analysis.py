@@ -0,0 +1,242 @@
+# team_analysis.py
+"""
+Análise da equipe com NumPy: tabela de tipos 18×18, fraquezas e
+resistências, cobertura ofensiva, stats e sugestão do próximo membro.
+
+Cada Pokémon vira duas linhas de 18 posições:
+- defesa: multiplicador do dano que recebe de cada tipo de ataque
+  (produto das colunas dos seus tipos na tabela)
+- ataque: melhor multiplicador dos seus tipos (STAB) contra cada tipo
+
+A equipe inteira é analisada em operações sobre a matriz (n × 18), e os
+candidatos do catálogo são avaliados de uma vez (m × 18). As matrizes do
+catálogo ficam em memória por processo, refeitas quando catalog_version()
+muda.
+
+Importado só pela rota (/api/equipe/analysis): o NumPy não entra no boot
+do worker.
+"""
+import threading
+
+import numpy as np
+
+from models import Pokemon
+
+TYPES = [
+    "normal", "fire", "water", "grass", "electric", "ice", "fighting", "poison",
+    "ground", "flying", "psychic", "bug", "rock", "ghost", "dragon", "dark",
+    "steel", "fairy",
+]
+TYPE_INDEX = {name: i for i, name in enumerate(TYPES)}
+NO_TYPE = len(TYPES)   # Pokémon de um tipo só / tipo desconhecido
+
+STATS = ["hp", "attack", "defense", "special-attack", "special-defense", "speed"]
+STAT_COLUMNS = [Pokemon.hp, Pokemon.attack, Pokemon.defense,
+                Pokemon.special_attack, Pokemon.special_defense, Pokemon.speed]
+
+# Ataque → {defesa: multiplicador}; o que não aparece vale 1 (geração 6+)
+_EFFECTIVENESS = {
+    "normal": {"rock": .5, "ghost": 0, "steel": .5},
+    "fire": {"fire": .5, "water": .5, "grass": 2, "ice": 2, "bug": 2, "rock": .5,
+             "dragon": .5, "steel": 2},
+    "water": {"fire": 2, "water": .5, "grass": .5, "ground": 2, "rock": 2, "dragon": .5},
+    "electric": {"water": 2, "electric": .5, "grass": .5, "ground": 0, "flying": 2,
+                 "dragon": .5},
+    "grass": {"fire": .5, "water": 2, "grass": .5, "poison": .5, "ground": 2, "flying": .5,
+              "bug": .5, "rock": 2, "dragon": .5, "steel": .5},
+    "ice": {"fire": .5, "water": .5, "grass": 2, "ice": .5, "ground": 2, "flying": 2,
+            "dragon": 2, "steel": .5},
+    "fighting": {"normal": 2, "ice": 2, "poison": .5, "flying": .5, "psychic": .5, "bug": .5,
+                 "rock": 2, "ghost": 0, "dark": 2, "steel": 2, "fairy": .5},
+    "poison": {"grass": 2, "poison": .5, "ground": .5, "rock": .5, "ghost": .5, "steel": 0,
+               "fairy": 2},
+    "ground": {"fire": 2, "electric": 2, "grass": .5, "poison": 2, "flying": 0, "bug": .5,
+               "rock": 2, "steel": 2},
+    "flying": {"electric": .5, "grass": 2, "fighting": 2, "bug": 2, "rock": .5, "steel": .5},
+    "psychic": {"fighting": 2, "poison": 2, "psychic": .5, "dark": 0, "steel": .5},
+    "bug": {"fire": .5, "grass": 2, "fighting": .5, "poison": .5, "flying": .5, "psychic": 2,
+            "ghost": .5, "dark": 2, "steel": .5, "fairy": .5},
+    "rock": {"fire": 2, "ice": 2, "fighting": .5, "ground": .5, "flying": 2, "bug": 2,
+             "steel": .5},
+    "ghost": {"normal": 0, "psychic": 2, "ghost": 2, "dark": .5},
+    "dragon": {"dragon": 2, "steel": .5, "fairy": 0},
+    "dark": {"fighting": .5, "psychic": 2, "ghost": 2, "dark": .5, "fairy": .5},
+    "steel": {"fire": .5, "water": .5, "electric": .5, "ice": 2, "rock": 2, "steel": .5,
+              "fairy": 2},
+    "fairy": {"fire": .5, "fighting": 2, "poison": .5, "dragon": 2, "dark": 2, "steel": .5},
+}
+
+
+def _build_chart():
+    chart = np.ones((len(TYPES), len(TYPES)), dtype=np.float32)
+    for attacker, row in _EFFECTIVENESS.items():
+        for defender, multiplier in row.items():
+            chart[TYPE_INDEX[attacker], TYPE_INDEX[defender]] = multiplier
+    return chart
+
+
+# CHART[ataque, defesa]
+CHART = _build_chart()
+# Coluna extra de 1 (defesa sem 2º tipo) e linha extra de 0 (ataque sem 2º tipo)
+_DEFENSE = np.hstack([CHART, np.ones((len(TYPES), 1), dtype=np.float32)])
+_OFFENSE = np.vstack([CHART, np.zeros((1, len(TYPES)), dtype=np.float32)])
+
+# Pesos da nota de um candidato (por tipo coberto/corrigido; stats por 100 de total)
+COVERAGE_WEIGHT = 1.0
+DEFENSE_WEIGHT = 1.0
+STATS_WEIGHT = 0.5
+
+
+# ==========================================================
+# 🧮 Matrizes
+# ==========================================================
+def _type_indexes(pairs):
+    """[(type1, type2)] → dois vetores de índices (NO_TYPE se faltar)."""
+    first = np.array([TYPE_INDEX.get(t1, NO_TYPE) for t1, _ in pairs], dtype=np.intp)
+    second = np.array([TYPE_INDEX.get(t2, NO_TYPE) for _, t2 in pairs], dtype=np.intp)
+    return first, second
+
+
+def defense_matrix(first, second):
+    """(n × 18): dano recebido de cada tipo de ataque."""
+    return (_DEFENSE[:, first] * _DEFENSE[:, second]).T
+
+
+def offense_matrix(first, second):
+    """(n × 18): melhor multiplicador dos tipos do Pokémon contra cada tipo."""
+    return np.maximum(_OFFENSE[first], _OFFENSE[second])
+
+
+class Matrices:
+    """Tipos e stats de um conjunto de Pokémon, já em arrays."""
+
+    def __init__(self, rows):
+        self.ids = np.array([r.id for r in rows], dtype=np.int64)
+        self.names = [r.name for r in rows]
+        self.types = [[t for t in (r.type1, r.type2) if t] for r in rows]
+        first, second = _type_indexes([(r.type1, r.type2) for r in rows])
+        self.defense = defense_matrix(first, second)
+        self.offense = offense_matrix(first, second)
+        self.stats = np.array(
+            [[np.nan if v is None else v for v in r[4:]] for r in rows], dtype=np.float32
+        ).reshape(len(rows), len(STATS))
+        self.totals = np.nansum(self.stats, axis=1)
+
+
+def _rows(query):
+    return query.with_entities(
+        Pokemon.id, Pokemon.name, Pokemon.type1, Pokemon.type2, *STAT_COLUMNS
+    ).all()
+
+
+def team_matrices(pokemon_ids):
+    rows = {r.id: r for r in _rows(Pokemon.query.filter(Pokemon.id.in_(pokemon_ids)))}
+    return Matrices([rows[i] for i in pokemon_ids if i in rows])
+
+
+_catalog = {"version": None, "matrices": None}
+_catalog_lock = threading.Lock()
+
+
+def catalog_matrices(version):
+    """Matrizes do catálogo inteiro, refeitas quando a versão muda."""
+    with _catalog_lock:
+        if _catalog["version"] != version:
+            _catalog["matrices"] = Matrices(_rows(Pokemon.query.order_by(Pokemon.id)))
+            _catalog["version"] = version
+        return _catalog["matrices"]
+
+
+# ==========================================================
+# 📊 Análise
+# ==========================================================
+def _by_type(values):
+    return {name: int(v) for name, v in zip(TYPES, values)}
+
+
+def _defense_balance(defense):
+    """Por tipo de ataque: quantos resistem menos quantos são fracos."""
+    return (defense < 1).sum(axis=0) - (defense > 1).sum(axis=0)
+
+
+def analyse(team):
+    defense, offense = team.defense, team.offense
+    weak = (defense > 1).sum(axis=0)
+    resist = ((defense < 1) & (defense > 0)).sum(axis=0)
+    immune = (defense == 0).sum(axis=0)
+    best = offense.max(axis=0) if len(team.ids) else np.zeros(len(TYPES))
+
+    # Média só sobre os stats conhecidos (NaN = ausente no catálogo)
+    total = np.nansum(team.stats, axis=0)
+    known = (~np.isnan(team.stats)).sum(axis=0)
+    average = np.divide(total, known, out=np.full(len(STATS), np.nan, dtype=np.float32), where=known > 0)
+
+    return {
+        "members": [
+            {"id": int(i), "name": name.capitalize(), "types": [t.capitalize() for t in types],
+             "base_stat_total": int(bst)}
+            for i, name, types, bst in zip(team.ids, team.names, team.types, team.totals)
+        ],
+        "defense": {
+            "weak": _by_type(weak),
+            "resist": _by_type(resist),
+            "immune": _by_type(immune),
+            # Tipos que acertam mais membros do que os que resistem
+            "uncovered_weaknesses": [
+                t for t, balance in zip(TYPES, _defense_balance(defense)) if balance < 0
+            ],
+        },
+        "offense": {
+            "super_effective": [t for t, m in zip(TYPES, best) if m > 1],
+            "not_covered": [t for t, m in zip(TYPES, best) if m <= 1],
+        },
+        "stats": {
+            "total": {s: int(v) for s, v in zip(STATS, total)},
+            "average": {s: None if np.isnan(v) else round(float(v), 1) for s, v in zip(STATS, average)},
+            "base_stat_total": int(team.totals.sum()),
+        },
+    }
+
+
+def suggest(team, pool, limit):
+    """
+    Nota de todos os candidatos de uma vez:
+    - cobertura: tipos que passam a ser atingidos com superefetivo
+    - defesa: tipos em que o saldo resiste − fraco da equipe melhora
+      (só conta até o saldo chegar a 0: corrigir fraqueza vale mais)
+    - stats: total base, por 100 pontos
+    """
+    candidates = ~np.isin(pool.ids, team.ids)
+    if limit <= 0 or not candidates.any():
+        return []
+    offense, defense = pool.offense[candidates], pool.defense[candidates]
+    totals = pool.totals[candidates]
+
+    covered = (team.offense > 1).any(axis=0) if len(team.ids) else np.zeros(len(TYPES), bool)
+    coverage_gain = ((offense > 1) & ~covered).sum(axis=1)
+
+    balance = _defense_balance(team.defense)
+    after = balance + (defense < 1).astype(np.int64) - (defense > 1).astype(np.int64)
+    defense_gain = (np.minimum(after, 0) - np.minimum(balance, 0)).sum(axis=1)
+
+    scores = (COVERAGE_WEIGHT * coverage_gain + DEFENSE_WEIGHT * defense_gain
+              + STATS_WEIGHT * totals / 100)
+
+    limit = min(limit, len(scores))
+    top = np.argpartition(-scores, limit - 1)[:limit]
+    top = top[np.argsort(-scores[top], kind="stable")]
+
+    index = np.flatnonzero(candidates)
+    return [
+        {
+            "id": int(pool.ids[index[i]]),
+            "name": pool.names[index[i]].capitalize(),
+            "types": [t.capitalize() for t in pool.types[index[i]]],
+            "sprite": f"/sprites/{int(pool.ids[index[i]])}",
+            "score": round(float(scores[i]), 2),
+            "coverage_gain": int(coverage_gain[i]),
+            "defense_gain": int(defense_gain[i]),
+            "base_stat_total": int(totals[i]),
+        }
+        for i in top
+    ]
@@ -0,0 +1,99 @@
+# tests/conftest.py
+"""
+Fixtures compartilhadas: PokéAPI falsa (benchmarks/fakeapi.py), o app
+servido por um servidor werkzeug com threads (app_url) e o app direto,
+sem HTTP (app), sempre num banco SQLite temporário.
+
+    cd backend
+    python -m pytest
+"""
+import os
+import sys
+import threading
+
+import pytest
+
+# Os módulos do backend são importados pelo nome (import catalog...)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.serving import make_server   # noqa: E402
+
+from benchmarks import fakeapi   # noqa: E402
+
+
+def _serve(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+@pytest.fixture(scope="module")
+def fake_api():
+    # Latência alta o bastante para as requisições simultâneas se sobreporem
+    server = fakeapi.make_server(count=60, payload_kb=0, latency_ms=300)
+    _serve(server)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _test_config(db_path, **overrides):
+    from config import Config
+
+    class TestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{db_path}"
+        SQLALCHEMY_ENGINE_OPTIONS = {}
+        # Mede coalescência, não descarte: sem controle de admissão
+        ADMISSION_UPSTREAM_LIMIT = 0
+
+    for name, value in overrides.items():
+        setattr(TestConfig, name, value)
+    return TestConfig
+
+
+@pytest.fixture(scope="module")
+def app_url(fake_api, tmp_path_factory):
+    from app import create_app
+    from bootstrap import bootstrap
+
+    app = create_app(_test_config(
+        tmp_path_factory.mktemp("db") / "test.sqlite3",
+        POKEAPI_URL=f"http://127.0.0.1:{fake_api.server_address[1]}{fakeapi.API_PREFIX}",
+        SPRITE_CACHE_DIR=str(tmp_path_factory.mktemp("sprites")),
+    ))
+    with app.app_context():
+        bootstrap(echo=lambda *args: None)
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    _serve(server)
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+@pytest.fixture(scope="module")
+def admin_headers(app_url):
+    import requests
+
+    from bootstrap import ADMIN_EMAIL
+
+    response = requests.post(
+        f"{app_url}/login", json={"email": ADMIN_EMAIL, "password": "123456"}, timeout=5
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def app(tmp_path):
+    """App num banco vazio, com app context e sem bootstrap (cada teste prepara o seu)."""
+    from app import create_app
+    from models import db
+
+    # PokéAPI inalcançável: estes testes não saem para a rede
+    app = create_app(_test_config(
+        tmp_path / "test.sqlite3",
+        POKEAPI_URL="http://127.0.0.1:9/api/v2/",
+        SPRITE_CACHE_DIR=str(tmp_path / "sprites"),
+    ))
+    with app.app_context():
+        yield app
+        db.session.remove()
@@ -0,0 +1,110 @@
+# tests/test_catalog.py
+"""
+Gravação no catálogo: conflito com outro worker, nome preso a outro ID
+(dado legado) e versão do catálogo (base dos ETags).
+"""
+import threading
+
+import pytest
+from sqlalchemy import event
+
+import catalog
+from bootstrap import bootstrap
+from models import db, Pokemon
+
+
+@pytest.fixture
+def catalog_app(app):
+    bootstrap(echo=lambda *args: None)
+    return app
+
+
+def _record(pokemon_id, name):
+    """Registro normalizado a partir de um JSON mínimo de /pokemon/<id>."""
+    return catalog.normalize_pokemon({
+        "id": pokemon_id,
+        "name": name,
+        "sprites": {"front_default": None},
+        "height": 7,
+        "weight": 69,
+        "types": [{"slot": 1, "type": {"name": "grass"}}],
+        "stats": [{"stat": {"name": stat}, "base_stat": 50} for stat in catalog.STAT_COLUMNS],
+        "abilities": [{"slot": 1, "is_hidden": False, "ability": {"name": "overgrow"}}],
+    })
+
+
+def test_store_keeps_the_row_of_a_concurrent_writer(catalog_app):
+    # Outro worker grava o mesmo Pokémon entre a leitura e o commit daqui
+    done = []
+
+    def other_worker_wins(state):
+        if done or not state.is_select:
+            return None
+        result = state.invoke_statement().freeze()
+        with db.engine.begin() as connection:
+            connection.execute(Pokemon.__table__.insert().values(
+                id=1, name="bulbasaur", fetched_at=123.0,
+            ))
+        done.append(True)
+        return result()
+
+    event.listen(db.session, "do_orm_execute", other_worker_wins)
+    try:
+        rows = catalog.store_pokemon([_record(1, "bulbasaur")])
+    finally:
+        event.remove(db.session, "do_orm_execute", other_worker_wins)
+
+    assert done
+    assert [(row.id, row.fetched_at) for row in rows] == [(1, 123.0)]
+    assert Pokemon.query.count() == 1
+
+
+def test_concurrent_stores_of_the_same_pokemon(catalog_app):
+    n = 8
+    barrier = threading.Barrier(n)
+    errors = []
+    stored = []
+
+    def worker():
+        with catalog_app.app_context():
+            barrier.wait()
+            try:
+                stored.append([row.id for row in catalog.store_pokemon([_record(25, "pikachu")])])
+            except Exception as e:
+                errors.append(e)
+            finally:
+                db.session.remove()
+
+    threads = [threading.Thread(target=worker) for _ in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert stored == [[25]] * n
+    assert Pokemon.query.count() == 1
+    assert [a.name for a in db.session.get(Pokemon, 25).ability_rows] == ["overgrow"]
+
+
+def test_store_frees_a_name_held_by_another_id(catalog_app):
+    # Linha legada: nome certo no ID errado
+    catalog.ensure_pokemon(catalog.record_from_payload({"id": 9999, "name": "bulbasaur"}))
+    db.session.commit()
+
+    [row] = catalog.store_pokemon([_record(1, "bulbasaur")])
+
+    assert (row.id, row.name) == (1, "bulbasaur")
+    legacy = db.session.get(Pokemon, 9999)
+    assert legacy.name == "bulbasaur-9999"
+    assert legacy.fetched_at == 0
+
+
+def test_invalidating_one_pokemon_changes_the_catalog_version(catalog_app):
+    catalog.store_pokemon([_record(1, "bulbasaur"), _record(4, "charmander")])
+    before = catalog.catalog_version()
+
+    catalog.invalidate(4)
+
+    assert catalog.catalog_version() != before
+    assert db.session.get(Pokemon, 4).fetched_at == 0
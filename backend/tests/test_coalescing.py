@@ -0,0 +1,58 @@
+# tests/test_coalescing.py
+"""
+N requisições simultâneas pelo mesmo recurso → uma única chamada à
+PokéAPI (singleflight nas rotas + coalescência no cliente).
+"""
+import threading
+
+import requests
+
+CONCURRENCY = 16
+
+
+def _concurrent_get(url, n=CONCURRENCY):
+    """Dispara n GETs ao mesmo tempo (barreira) e devolve as respostas."""
+    barrier = threading.Barrier(n)
+    responses = [None] * n
+
+    def worker(i):
+        with requests.Session() as session:
+            barrier.wait()
+            responses[i] = session.get(url, timeout=30)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return responses
+
+
+def _hits(fake_api):
+    """Chamadas recebidas pela PokéAPI falsa, por caminho (GET /__stats)."""
+    port = fake_api.server_address[1]
+    return requests.get(f"http://127.0.0.1:{port}/__stats", timeout=5).json()["by_path"]
+
+
+def test_concurrent_search_makes_one_upstream_call(fake_api, app_url):
+    responses = _concurrent_get(f"{app_url}/pokemon/search/7")
+
+    assert [r.status_code for r in responses] == [200] * CONCURRENCY
+    assert {r.json()["id"] for r in responses} == {7}
+    assert _hits(fake_api).get("/api/v2/pokemon/7") == 1
+
+
+def test_concurrent_filter_makes_one_upstream_call_per_resource(fake_api, app_url):
+    responses = _concurrent_get(f"{app_url}/pokemon/filter?type=fire&limit=50")
+
+    assert [r.status_code for r in responses] == [200] * CONCURRENCY
+    ids = {tuple(p["id"] for p in r.json()["results"]) for r in responses}
+    assert len(ids) == 1
+    members = ids.pop()
+    assert members
+
+    hits = _hits(fake_api)
+    assert hits.get("/api/v2/type/fire") == 1
+    # Cada Pokémon do tipo buscado uma vez só, e nenhum recurso repetido
+    assert all(hits.get(f"/api/v2/pokemon/{pokemon_id}") == 1 for pokemon_id in members)
+    assert set(hits.values()) == {1}
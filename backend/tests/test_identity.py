@@ -0,0 +1,30 @@
+# tests/test_identity.py
+"""
+Rotas de admin seguem o is_admin atual do usuário, não o do login: a
+claim do token vale por horas.
+"""
+from flask import g
+
+import identity
+from bootstrap import ADMIN_EMAIL, bootstrap
+from models import db, User
+
+
+def test_demoted_admin_loses_access_before_the_token_expires(app):
+    bootstrap(echo=lambda *args: None)
+    client = app.test_client()
+    login = client.post("/login", json={"email": ADMIN_EMAIL, "password": "123456"})
+    headers = {"Authorization": f"Bearer {login.json['access_token']}"}
+    assert client.get("/api/users", headers=headers).status_code == 200
+
+    admin = User.query.filter_by(email=ADMIN_EMAIL).one()
+    admin.is_admin = False
+    db.session.commit()
+    # Fim do IDENTITY_CACHE_TTL (ou alteração feita neste processo)
+    identity.invalidate(admin.id)
+    # O test_client reaproveita o app context do fixture (e o g.identity
+    # da requisição anterior); no servidor cada requisição tem o seu
+    g.pop("identity", None)
+
+    assert client.get("/api/users", headers=headers).status_code == 403
+    assert client.post("/api/catalog/invalidate", json={}, headers=headers).status_code == 403
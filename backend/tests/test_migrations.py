@@ -0,0 +1,117 @@
+# tests/test_migrations.py
+"""
+Favoritos/equipe do esquema antigo → esquema novo sem perder a ordem em
+que o usuário montou a lista (a ordem antiga era a dos IDs).
+"""
+import json
+
+from sqlalchemy import text
+
+import migrations
+from bootstrap import bootstrap
+from models import db, Equip, Favorites, Pokemon, User
+
+# Como as tabelas eram antes da normalização (cópia do Pokémon em JSON)
+LEGACY_DDL = """
+CREATE TABLE {table} (
+    id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    pokemon_id INTEGER NOT NULL,
+    pokemon_name VARCHAR(120) NOT NULL,
+    pokemon_image VARCHAR(255),
+    height FLOAT,
+    weight FLOAT,
+    abilities TEXT,
+    stats TEXT,
+    types TEXT,
+    PRIMARY KEY (id),
+    FOREIGN KEY(user_id) REFERENCES users (id)
+)
+"""
+
+# (id, user_id, pokemon_id, nome) na ordem em que foram gravados
+LEGACY_ROWS = [
+    (1, 1, 25, "pikachu"),
+    (2, 2, 150, "mewtwo"),
+    (3, 1, 4, "charmander"),
+    (4, 1, 1, "bulbasaur"),
+    (5, 1, 4, "charmander"),   # duplicata antiga
+    (6, 2, 1, "bulbasaur"),
+    (7, 1, 7, "squirtle"),
+]
+
+
+def _create_users():
+    User.__table__.create(bind=db.session.connection())
+    for user_id in (1, 2):
+        db.session.add(User(
+            id=user_id, name=f"user{user_id}", nickname=f"user{user_id}",
+            email=f"user{user_id}@teste.com", password="x",
+        ))
+    db.session.commit()
+
+
+def _insert_legacy(table):
+    db.session.execute(text(LEGACY_DDL.format(table=table)))
+    for row_id, user_id, pokemon_id, name in LEGACY_ROWS:
+        db.session.execute(
+            text(
+                f"INSERT INTO {table} (id, user_id, pokemon_id, pokemon_name, pokemon_image,"
+                f" height, weight, abilities, stats, types) VALUES"
+                f" (:id, :user_id, :pokemon_id, :name, NULL, 4, 60, :abilities, :stats, :types)"
+            ),
+            {
+                "id": row_id, "user_id": user_id, "pokemon_id": pokemon_id, "name": name,
+                "abilities": json.dumps([{"name": "static", "is_hidden": False}]),
+                "stats": json.dumps({"hp": 35}),
+                "types": json.dumps(["electric"]),
+            },
+        )
+    db.session.commit()
+
+
+def _saved(model, user_id):
+    rows = model.query.filter_by(user_id=user_id).order_by(model.position, model.id).all()
+    return [(row.id, row.pokemon_id, row.position) for row in rows]
+
+
+def test_legacy_lists_keep_their_order(app):
+    _create_users()
+    _insert_legacy("favorites")
+    _insert_legacy("equip")
+
+    bootstrap(echo=lambda *args: None)
+
+    for model in (Favorites, Equip):
+        # Ordem antiga (por id) → position 0, 1, 2...; duplicata vira uma linha
+        # só, com o id da primeira
+        assert _saved(model, 1) == [(1, 25, 0), (3, 4, 1), (4, 1, 2), (7, 7, 3)]
+        assert _saved(model, 2) == [(2, 150, 0), (6, 1, 1)]
+
+    # A cópia antiga entra no catálogo já vencida, para a PokéAPI confirmar
+    pikachu = db.session.get(Pokemon, 25)
+    assert pikachu.name == "pikachu"
+    assert pikachu.fetched_at == 0
+    assert [a.name for a in pikachu.ability_rows] == ["static"]
+
+    assert migrations.upgrade() == []
+
+
+def test_position_column_follows_the_id_order(app):
+    _create_users()
+    db.session.execute(text(
+        "CREATE TABLE favorites (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL,"
+        " pokemon_id INTEGER NOT NULL)"
+    ))
+    for row_id, user_id, pokemon_id in [(1, 1, 9), (2, 2, 3), (3, 1, 2), (4, 1, 5)]:
+        db.session.execute(
+            text("INSERT INTO favorites (id, user_id, pokemon_id)"
+                 " VALUES (:id, :user_id, :pokemon_id)"),
+            {"id": row_id, "user_id": user_id, "pokemon_id": pokemon_id},
+        )
+    db.session.commit()
+
+    bootstrap(echo=lambda *args: None)
+
+    assert _saved(Favorites, 1) == [(1, 9, 0), (3, 2, 1), (4, 5, 2)]
+    assert _saved(Favorites, 2) == [(2, 3, 0)]
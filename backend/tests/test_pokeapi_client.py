@@ -0,0 +1,92 @@
+# tests/test_pokeapi_client.py
+"""
+Circuit breaker e token bucket do cliente da PokéAPI (sem rede: a
+sessão HTTP é substituída por uma que falha do jeito pedido).
+"""
+import os
+import time
+
+import pytest
+import requests
+
+from pokeapi_client import CircuitBreaker, PokeAPIClient, TokenBucket
+
+
+class FailingSession:
+    def __init__(self, error):
+        self.error = error
+        self.calls = 0
+
+    def get(self, url, timeout=None):
+        self.calls += 1
+        raise self.error
+
+
+def _half_open_client(error):
+    """Cliente com o breaker pronto para deixar passar um único teste."""
+    client = PokeAPIClient()
+    client.retries = 0
+    client.breaker = CircuitBreaker(threshold=1, cooldown=0)
+    client.breaker.record_failure()   # aberto; cooldown 0 → próximo allow() testa
+    client._session = FailingSession(error)
+    client._session_pid = os.getpid()
+    return client
+
+
+def test_half_open_allows_a_single_probe():
+    breaker = CircuitBreaker(threshold=1, cooldown=0)
+    breaker.record_failure()
+
+    assert breaker.allow()
+    assert not breaker.allow()   # teste em andamento
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+def test_probe_that_fails_outside_the_retry_path_is_released():
+    # ChunkedEncodingError não é falha de rede tratada: sai sem record_*
+    client = _half_open_client(requests.exceptions.ChunkedEncodingError("corpo cortado"))
+
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        client.get("pokemon/1")
+
+    assert client.breaker.state == CircuitBreaker.HALF_OPEN
+    assert client.breaker.allow()   # sem release, ficaria recusando para sempre
+
+
+def test_probe_refused_by_the_local_rate_limit_is_released():
+    client = _half_open_client(AssertionError("não deveria chegar à rede"))
+    client.rate_limit = TokenBucket(rate=0.01, burst=1, max_wait=0)
+    assert client.rate_limit.reserve() == 0   # gasta a única ficha
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.get("pokemon/1")
+
+    assert client._session.calls == 0
+    assert client.breaker.allow()
+
+
+def test_token_bucket_spends_the_burst_then_makes_callers_wait():
+    bucket = TokenBucket(rate=10, burst=2, max_wait=1)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+    # A ficha seguinte já está prometida: espera acumula
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.02)
+
+
+def test_token_bucket_refuses_waits_above_the_limit():
+    bucket = TokenBucket(rate=1, burst=1, max_wait=0.5)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() is None
+    # Recusa não consome ficha: depois de 1 s há uma inteira de novo
+    time.sleep(1.05)
+    assert bucket.reserve() == 0
+
+
+def test_token_bucket_without_rate_never_waits():
+    bucket = TokenBucket()
+    assert all(bucket.reserve() == 0 for _ in range(100))
@@ -0,0 +1,128 @@
+# tests/test_user_lists.py
+"""
+Comportamento das rotas pelo HTTP: lote da equipe (tudo ou nada, limite
+de 6), ETag/304 e paginação por cursor da listagem de usuários.
+"""
+import requests
+
+TIMEOUT = 30
+
+
+def _batch(app_url, headers, *ops):
+    return requests.post(
+        f"{app_url}/api/equipe/batch", json={"ops": list(ops)}, headers=headers, timeout=TIMEOUT
+    )
+
+
+def _equipe(app_url, headers):
+    response = requests.get(
+        f"{app_url}/api/equipe/", params={"fields": "id"}, headers=headers, timeout=TIMEOUT
+    )
+    assert response.status_code == 200
+    return [p["id"] for p in response.json()]
+
+
+def test_batch_is_all_or_nothing_and_keeps_the_limit(app_url, admin_headers):
+    added = _batch(app_url, admin_headers, *({"op": "add", "pokemon_id": i} for i in range(1, 7)))
+    assert added.status_code == 200
+    assert _equipe(app_url, admin_headers) == [1, 2, 3, 4, 5, 6]
+
+    # 7º Pokémon: recusado, e a remoção do mesmo lote não é aplicada
+    refused = _batch(
+        app_url, admin_headers,
+        {"op": "remove", "pokemon_id": 1},
+        {"op": "add", "pokemon_id": 7},
+        {"op": "add", "pokemon_id": 8},
+    )
+    assert refused.status_code == 400
+    assert refused.json()["applied"] is False
+    assert [r["status"] for r in refused.json()["results"]] == ["ok", "ok", "error"]
+    assert _equipe(app_url, admin_headers) == [1, 2, 3, 4, 5, 6]
+
+    reordered = _batch(
+        app_url, admin_headers,
+        {"op": "remove", "pokemon_id": 2},
+        {"op": "reorder", "order": [6, 5]},
+    )
+    assert reordered.status_code == 200
+    assert _equipe(app_url, admin_headers) == [6, 5, 1, 3, 4]
+
+
+def test_equipe_etag_changes_with_the_list(app_url, admin_headers):
+    url = f"{app_url}/api/equipe/"
+    etag = requests.get(url, headers=admin_headers, timeout=TIMEOUT).headers["ETag"]
+    conditional = dict(admin_headers, **{"If-None-Match": etag})
+
+    assert requests.get(url, headers=conditional, timeout=TIMEOUT).status_code == 304
+
+    assert _batch(app_url, admin_headers, {"op": "add", "pokemon_id": 10}).status_code == 200
+    changed = requests.get(url, headers=conditional, timeout=TIMEOUT)
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_search_etag_changes_when_the_pokemon_is_invalidated(app_url, admin_headers):
+    url = f"{app_url}/pokemon/search/9"
+    etag = requests.get(url, timeout=TIMEOUT).headers["ETag"]
+    assert requests.get(url, headers={"If-None-Match": etag}, timeout=TIMEOUT).status_code == 304
+
+    invalidated = requests.post(
+        f"{app_url}/api/catalog/invalidate", json={"pokemon": 9},
+        headers=admin_headers, timeout=TIMEOUT,
+    )
+    assert invalidated.status_code == 200
+
+    fresh = requests.get(url, headers={"If-None-Match": etag}, timeout=TIMEOUT)
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] != etag
+
+
+def _users(app_url, headers, **params):
+    return requests.get(f"{app_url}/api/users", params=params, headers=headers, timeout=TIMEOUT)
+
+
+def _walk_users(app_url, headers, **params):
+    ids = []
+    cursor = None
+    while True:
+        query = dict(params, limit=3)
+        if cursor:
+            query["cursor"] = cursor
+        response = _users(app_url, headers, **query)
+        assert response.status_code == 200
+        ids += [u["id"] for u in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return ids
+
+
+def test_users_cursor_walks_every_match_once(app_url, admin_headers):
+    for i, (nickname, email) in enumerate([
+        ("Ash", "ash@x.com"), ("misty", "ASHLEY@x.com"), ("ashe", "brock@x.com"),
+        ("gary", "gary@x.com"), ("ASHURA", "zed@x.com"), ("ash2", "ash2@x.com"),
+        ("tracey", "tracey@x.com"),
+    ]):
+        response = requests.post(f"{app_url}/register", json={
+            "name": f"user{i}", "nickname": nickname, "email": email,
+            "password": "123456", "confirmPassword": "123456",
+        }, timeout=TIMEOUT)
+        assert response.status_code == 200
+
+    by_id = {u["id"]: u for u in _users(app_url, admin_headers, limit=500).json()}
+
+    def matching(predicate):
+        return {i for i, u in by_id.items() if predicate(u["email"].lower(), u["nickname"].lower())}
+
+    walked = _walk_users(app_url, admin_headers)
+    assert walked == sorted(by_id)
+
+    for params, predicate in [
+        ({"q": "ash"}, lambda e, n: e.startswith("ash") or n.startswith("ash")),
+        ({"email": "ASH"}, lambda e, n: e.startswith("ash")),
+        ({"nickname": "ash"}, lambda e, n: n.startswith("ash")),
+    ]:
+        walked = _walk_users(app_url, admin_headers, **params)
+        assert len(walked) == len(set(walked))
+        assert set(walked) == matching(predicate)
+
+    assert _users(app_url, admin_headers, q="ash", cursor="nada").status_code == 400
@@ -0,0 +1,161 @@
+# user_lists.py
+"""
+Operações em lote nas listas do usuário (favoritos e equipe).
+
+    POST /api/equipe/batch
+    {"ops": [
+        {"op": "remove", "pokemon_id": 4},
+        {"op": "add", "pokemon_id": 25},
+        {"op": "reorder", "order": [25, 1, 7]}
+    ]}
+
+As operações são aplicadas em ordem sobre o estado atual da lista, numa
+única transação: se qualquer uma falhar, nada é gravado. A resposta traz
+o resultado de cada item.
+
+Só o ID do Pokémon vale: o resto do corpo (nome, tipos, stats...) é
+ignorado e o Pokémon vem do catálogo (read-through na PokéAPI), nunca do
+cliente.
+"""
+from flask import jsonify
+from sqlalchemy import func
+
+import catalog
+from models import db, ListVersion
+
+
+def next_position(model, user_id):
+    """Posição para um item novo (fim da lista)."""
+    last = db.session.query(func.max(model.position)).filter(model.user_id == user_id).scalar()
+    return 0 if last is None else last + 1
+
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def payload_id(data):
+    """ID do Pokémon no corpo ({"pokemon_id": 25} ou {"id": 25}); None se faltar."""
+    pokemon_id = _int(data.get("pokemon_id") or data.get("id"))
+    return pokemon_id if pokemon_id and pokemon_id > 0 else None
+
+
+def lookup_pokemon(pokemon_id):
+    """(Pokemon do catálogo, None) ou (None, resposta de erro)."""
+    import requests   # import tardio: só quando a PokéAPI é chamada
+
+    try:
+        pokemon = catalog.get_pokemon(pokemon_id)
+    except requests.exceptions.Timeout:
+        return None, (jsonify({"msg": "PokéAPI demorou demais para responder. Tente novamente."}), 504)
+    except requests.exceptions.RequestException:
+        return None, (jsonify({"msg": "Erro ao comunicar com o serviço de Pokémon externo."}), 503)
+    except catalog.StoreError:
+        return None, (jsonify({"msg": "Resposta da PokéAPI não pôde ser gravada no catálogo."}), 502)
+    if pokemon is None:
+        return None, (jsonify({"msg": f"Pokémon '{pokemon_id}' não encontrado."}), 404)
+    return pokemon, None
+
+
+def apply_batch(model, user_id, kind, operations, where, limit=None, limit_msg=None):
+    """
+    Aplica `operations` na lista `model` do usuário (sem commit parcial).
+
+    `where` completa as mensagens ("na equipe", "nos favoritos").
+    Retorna (resultados por item, True se tudo foi gravado).
+    """
+    # Pokémon adicionados: resolvidos pelo catálogo de uma vez (os que
+    # faltam vêm da PokéAPI em paralelo) antes de carregar a lista, porque
+    # a gravação no catálogo faz commit
+    add_ids = {payload_id(op) for op in operations
+               if isinstance(op, dict) and op.get("op") == "add"} - {None}
+    known, partial = catalog.get_many(add_ids) if add_ids else ([], False)
+    known = {pokemon.id for pokemon in known}
+
+    rows = {
+        row.pokemon_id: row
+        for row in model.query.filter_by(user_id=user_id).order_by(model.position, model.id)
+    }
+    order = list(rows)   # já na ordem (position, id)
+
+    results = []
+    ok = True
+    for index, op in enumerate(operations):
+        action = op.get("op") if isinstance(op, dict) else None
+        result = {"index": index, "op": action}
+        error = None
+
+        if action == "add":
+            pokemon_id = payload_id(op)
+            if pokemon_id is None:
+                error = "ID do Pokémon é obrigatório"
+            else:
+                result["pokemon_id"] = pokemon_id
+                if pokemon_id in order:
+                    error = f"Pokémon já está {where}"
+                elif pokemon_id not in known:
+                    error = (
+                        "Erro ao comunicar com o serviço de Pokémon externo" if partial
+                        else "Pokémon não encontrado"
+                    )
+                elif limit is not None and len(order) >= limit:
+                    error = limit_msg
+                else:
+                    order.append(pokemon_id)
+
+        elif action == "remove":
+            pokemon_id = result["pokemon_id"] = _int(op.get("pokemon_id") or op.get("id"))
+            if pokemon_id not in order:
+                error = f"Pokémon não encontrado {where}"
+            else:
+                order.remove(pokemon_id)
+
+        elif action == "reorder":
+            wanted = op.get("order")
+            wanted = [_int(i) for i in wanted] if isinstance(wanted, list) else None
+            if wanted is None or None in wanted or len(set(wanted)) != len(wanted):
+                error = "'order' deve ser uma lista de IDs sem repetição"
+            elif not set(wanted) <= set(order):
+                error = f"Pokémon não encontrado {where}"
+            else:
+                # Os IDs citados vão para o começo; os demais mantêm a ordem
+                listed = set(wanted)
+                order = wanted + [i for i in order if i not in listed]
+
+        else:
+            error = "Operação inválida (use 'add', 'remove' ou 'reorder')"
+
+        if error:
+            ok = False
+            result.update(status="error", msg=error)
+        else:
+            result["status"] = "ok"
+        results.append(result)
+
+    if not ok:
+        db.session.rollback()
+        return results, False
+
+    # 💾 Estado final → diferenças em uma única transação
+    changed = False
+    for pokemon_id, row in rows.items():
+        if pokemon_id not in order:
+            db.session.delete(row)
+            changed = True
+    for position, pokemon_id in enumerate(order):
+        row = rows.get(pokemon_id)
+        if row is None:
+            row = model(user_id=user_id, pokemon_id=pokemon_id, position=position)
+            db.session.add(row)
+            changed = True
+        elif row.position != position:
+            row.position = position
+            changed = True
+
+    if changed:
+        ListVersion.bump(user_id, kind)
+    db.session.commit()
+    return results, True
@@ -6,3 +6,9 @@ export const API_URL = 'https://pokeapi-fullstack.onrender.com';
 // Troque esta URL dependendo do ambiente (local ou produção)
 //export const API_URL = 'http://127.0.0.1:5000';  
 
+
+// 🖼️ Sprite pelo proxy do backend (cache em disco); sem ele, usa o sprite_url original
+export function spriteSrc(pokemon: any, size?: number): string {
+  if (!pokemon?.sprite) return pokemon?.sprite_url;
+  return `${API_URL}${pokemon.sprite}${size ? `?size=${size}` : ''}`;
+}
@@ -3,7 +3,7 @@ import { HttpClient, HttpHeaders } from '@angular/common/http';
 import { CommonModule } from '@angular/common';
 import { Router } from '@angular/router';
 import { FormsModule } from '@angular/forms';
-import { API_URL } from '../../api';
+import { API_URL, spriteSrc } from '../../api';
 
 @Component({
   selector: 'app-favorites',
@@ -20,6 +20,9 @@ export class Favorites implements OnInit {
   message = '';
   loadingDetails = false; // 🆕 controla o carregamento do modal
 
+  // 🖼️ Usado nos templates (helper compartilhado em api.ts)
+  readonly spriteSrc = spriteSrc;
+
   constructor(private http: HttpClient, private router: Router) {}
 
   ngOnInit(): void {
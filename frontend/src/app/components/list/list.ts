@@ -3,7 +3,10 @@ import { HttpClient, HttpClientModule, HttpHeaders } from '@angular/common/http'
 import { CommonModule, DecimalPipe } from '@angular/common';
 import { FormsModule } from '@angular/forms';
 import { Router } from '@angular/router';
-import { API_URL } from '../../api';
+import { API_URL, spriteSrc } from '../../api';
+
+// Campos que os cards usam (id, nome, tipos e sprite) → resposta menor
+const LIST_FIELDS = 'id,name,types,sprite_url,sprite';
 
 @Component({
   selector: 'app-pokemon-list',
@@ -24,6 +27,8 @@ export class List implements OnInit {
   generation = '';
   type = '';
   manualSearchTerm = '';
+  suggestions: any[] = [];
+  private suggestTimer: any = null;
 
   typesList = [
     'Normal', 'Fire', 'Water', 'Grass', 'Electric', 'Ice', 'Fighting',
@@ -51,6 +56,9 @@ export class List implements OnInit {
 
   activeCategory: 'todos' | 'favoritos' | 'equipe' = 'todos';
 
+  // 🖼️ Usado nos templates (helper compartilhado em api.ts)
+  readonly spriteSrc = spriteSrc;
+
   constructor(private http: HttpClient, private router: Router) {}
 
   // ==========================================================
@@ -73,6 +81,22 @@ export class List implements OnInit {
   // ==========================================================
   // 🔍 BUSCA E FILTROS
   // ==========================================================
+  // Sugestões enquanto digita (só memória no backend, sem PokéAPI)
+  onSearchInput(): void {
+    clearTimeout(this.suggestTimer);
+    const term = this.manualSearchTerm.trim();
+    if (!term) {
+      this.suggestions = [];
+      return;
+    }
+    this.suggestTimer = setTimeout(() => {
+      this.http.get(`${API_URL}/pokemon/autocomplete`, { params: { q: term } }).subscribe({
+        next: (data: any) => this.suggestions = data.results,
+        error: () => this.suggestions = []
+      });
+    }, 150);
+  }
+
   searchManual(): void {
     const term = this.manualSearchTerm.trim().toLowerCase();
     if (!term) {
@@ -91,7 +115,10 @@ export class List implements OnInit {
       error: (err: any) => {
         this.pokemons = [];
         this.totalCount = 0;
-        this.message = err.error?.msg || `Pokémon '${term}' não encontrado.`;
+        const guess = err.status === 404 && this.suggestions.length ? this.suggestions[0].name : null;
+        this.message = guess
+          ? `Pokémon '${term}' não encontrado. Você quis dizer ${guess}?`
+          : err.error?.msg || `Pokémon '${term}' não encontrado.`;
         this.loading = false;
       }
     });
@@ -206,7 +233,7 @@ export class List implements OnInit {
 
   loadFavorites(): void {
     const headers = this.getAuthHeaders();
-    this.http.get(`${API_URL}/api/favorites/`, { headers }).subscribe({
+    this.http.get(`${API_URL}/api/favorites/`, { headers, params: { fields: LIST_FIELDS } }).subscribe({
       next: (data: any) => this.favorites = data,
       error: (err: any) => console.error('Erro ao carregar favoritos:', err)
     });
@@ -247,7 +274,7 @@ export class List implements OnInit {
   // ==========================================================
   loadEquipe(): void {
     const headers = this.getAuthHeaders();
-    this.http.get(`${API_URL}/api/equipe/`, { headers }).subscribe({
+    this.http.get(`${API_URL}/api/equipe/`, { headers, params: { fields: LIST_FIELDS } }).subscribe({
       next: (data: any) => this.equipe = data,
       error: (err) => console.error('Erro ao carregar equipe:', err)
     });